@@ -0,0 +1,27 @@
+"""
+Serve Shorty with the threaded `werkzeug` server, without debug mode or reloader, for benchmarking.
+"""
+import argparse
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from shorty.app import create_app
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    # Per request access log lines would be a noticeable part of the measured work.
+    def log_request(self, *_) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Shorty benchmark server.')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+
+    make_server(args.host, args.port, create_app(), threaded=True, request_handler=QuietRequestHandler).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
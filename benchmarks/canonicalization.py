@@ -0,0 +1,37 @@
+"""
+Microbenchmark of `UrlCanonicalizer.canonicalize` CPU cost per url.
+
+Measures the default (equivalence keeping) rules and all rules on urls which are already canonical and ones which
+need every rule applied.
+
+    python -m benchmarks.canonicalization --number 100000
+"""
+import argparse
+
+from benchmarks.validation import measure
+from shorty.shortlink.canonicalization import UrlCanonicalizer
+
+URLS = {
+    'canonical': 'https://example.com/some/long/path?other=1&query=value#fragment',
+    'non-canonical': 'HTTPS://Example.COM:443/some/%7elong/path?query=%2fvalue&utm_source=news&other=1#fragment',
+}
+CANONICALIZERS = {
+    'default rules': UrlCanonicalizer(),
+    'all rules': UrlCanonicalizer(sort_query=True, strip_tracking=True),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Url canonicalization microbenchmark.')
+    parser.add_argument('--number', type=int, default=100_000, help='Calls per run.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs; the best one is reported.')
+    args = parser.parse_args()
+
+    for canonicalizer_name, canonicalizer in CANONICALIZERS.items():
+        for url_name, url in URLS.items():
+            cost = measure(lambda: canonicalizer.canonicalize(url), args.number, args.repeat)
+            print(f'{canonicalizer_name + ", " + url_name + " url:":40} {cost:6.2f} us/url')
+
+
+if __name__ == '__main__':
+    main()
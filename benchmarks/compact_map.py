@@ -0,0 +1,93 @@
+"""
+Benchmark of `CompactShortlinkMap` memory per entry and lookup latency against a `dict` baseline.
+
+Both maps are filled with the same synthetic `(provider, long url) -> short link` entries: urls of a few thousand
+hosts with article-like paths and queries, and Bitly-like short links. `dict` memory includes the key tuples, long
+url and short link strings it keeps; provider name strings are shared, so they aren't counted.
+
+    python -m benchmarks.compact_map --entries 1000000
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from typing import Callable, Iterator
+
+from shorty.shortlink.compact_map import CompactShortlinkMap
+
+PROVIDERS = ('bitly', 'tinyurl')
+SHORT_LINK_DOMAINS = {'bitly': 'https://bit.ly/', 'tinyurl': 'https://tinyurl.com/'}
+SECTIONS = ('news', 'blog', 'products', 'docs', 'articles')
+ALPHABET = string.ascii_letters + string.digits
+
+
+def entries(number: int, hosts: int, seed: int = 0) -> Iterator[tuple[tuple[str, str], str]]:
+    """
+    Generate `number` distinct synthetic entries, the same ones for the same arguments.
+    """
+    random_ = random.Random(seed)
+    for i in range(number):
+        provider = PROVIDERS[i % len(PROVIDERS)]
+        host = f'www.site{random_.randrange(hosts)}.com'
+        section = SECTIONS[random_.randrange(len(SECTIONS))]
+        long_url = f'https://{host}/{section}/{2000 + i % 25}/{i}-some-article-title'
+        if i % 3 == 0:
+            long_url += f'?utm_source=feed&id={i}'
+        code = ''.join(random_.choices(ALPHABET, k=7))
+        yield (provider, long_url), SHORT_LINK_DOMAINS[provider] + code
+
+
+def dict_nbytes(baseline: dict[tuple[str, str], str]) -> int:
+    return sys.getsizeof(baseline) + sum(
+        sys.getsizeof(key) + sys.getsizeof(key[1]) + sys.getsizeof(short_link) for key, short_link in baseline.items()
+    )
+
+
+def measure_lookups(get: Callable[[tuple[str, str]], str | None], keys: list[tuple[str, str]]) -> float:
+    """
+    Return the mean lookup latency in microseconds.
+    """
+    started = time.perf_counter()
+    for key in keys:
+        get(key)
+    return (time.perf_counter() - started) / len(keys) * 1_000_000
+
+
+def build_compact(number: int, hosts: int) -> CompactShortlinkMap:
+    compact = CompactShortlinkMap(max_entries=number)
+    for key, short_link in entries(number, hosts):
+        compact.set(key, short_link)
+    return compact
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compact shortlink map benchmark.')
+    parser.add_argument('--entries', type=int, default=1_000_000, help='Number of entries.')
+    parser.add_argument('--hosts', type=int, default=5_000, help='Number of distinct long url hosts.')
+    parser.add_argument('--lookups', type=int, default=200_000, help='Number of lookups, half of them misses.')
+    args = parser.parse_args()
+
+    baseline = dict(entries(args.entries, args.hosts))
+    baseline_bytes = dict_nbytes(baseline)
+    compact = build_compact(args.entries, args.hosts)
+    compact_bytes = compact.nbytes()
+
+    random_ = random.Random(1)
+    hits = random_.sample(list(baseline), args.lookups // 2)
+    misses = [(provider, long_url + 'x') for provider, long_url in hits]
+    keys = hits + misses
+    random_.shuffle(keys)
+    assert all(compact.get(key) == baseline.get(key) for key in keys[:1000])
+
+    baseline_latency = measure_lookups(baseline.get, keys)
+    compact_latency = measure_lookups(compact.get, keys)
+
+    print(f'entries:       {args.entries}')
+    print(f'dict:          {baseline_bytes / args.entries:8.1f} bytes/entry {baseline_latency:6.2f} us/lookup')
+    print(f'compact map:   {compact_bytes / args.entries:8.1f} bytes/entry {compact_latency:6.2f} us/lookup')
+    print(f'memory saving: {1 - compact_bytes / baseline_bytes:8.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Closed-loop HTTP load driver: every worker sends its next request as soon as the previous one completes.
+"""
+import math
+import threading
+import time
+from collections import Counter
+from typing import Callable
+
+import requests
+
+__all__ = (
+    'LoadResult',
+    'percentile',
+    'run_load',
+)
+
+PERCENTILES = {'p50': 50.0, 'p95': 95.0, 'p99': 99.0, 'p999': 99.9}
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """
+    Return the nearest-rank `percent` percentile of already sorted values.
+    """
+    if not sorted_values:
+        return math.nan
+
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class LoadResult:
+    def __init__(self, latencies: list[float], status_codes: Counter, errors: Counter, duration: float):
+        """
+        Initialize `LoadResult`.
+
+        :param latencies: Latency of every completed request, in seconds.
+        :param status_codes: Number of responses by HTTP status code.
+        :param errors: Number of requests failed without a response, by exception name.
+        :param duration: Measurement duration, in seconds.
+        """
+        self.latencies = sorted(latencies)
+        self.status_codes = status_codes
+        self.errors = errors
+        self.duration = duration
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def latency_ms(self) -> dict[str, float]:
+        if not self.latencies:
+            return {}
+
+        stats = {'mean': sum(self.latencies) / len(self.latencies)}
+        stats.update({name: percentile(self.latencies, percent) for name, percent in PERCENTILES.items()})
+        stats['max'] = self.latencies[-1]
+        return {name: round(value * 1000, 3) for name, value in stats.items()}
+
+    def as_dict(self) -> dict:
+        return {
+            'requests': self.requests,
+            'duration_seconds': round(self.duration, 3),
+            'rps': round(self.rps, 2),
+            'status_codes': {str(status): count for status, count in sorted(self.status_codes.items())},
+            'errors': dict(self.errors),
+            'latency_ms': self.latency_ms(),
+        }
+
+
+def run_load(url: str, make_payload: Callable[[int], dict], concurrency: int, duration: float,
+             warmup: float = 0.0, timeout: float = 10.0) -> LoadResult:
+    """
+    Send `POST url` requests with JSON payloads from `concurrency` workers for `duration` seconds.
+
+    :param url: URL to send requests to.
+    :param make_payload: Returns a JSON payload for a given request sequence number.
+    :param concurrency: Number of concurrent workers, each with its own keep-alive connection.
+    :param duration: Measurement duration, in seconds.
+    :param warmup: Seconds to send requests for before the measurement, whose results are discarded.
+    :param timeout: Request timeout, in seconds.
+    """
+    sequence = iter(range(1 << 62))
+    sequence_lock = threading.Lock()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    measure_until = measure_from + duration
+    results: list[tuple[list[float], Counter, Counter]] = []
+
+    def worker() -> None:
+        latencies, status_codes, errors = [], Counter(), Counter()
+        results.append((latencies, status_codes, errors))
+        with requests.Session() as session:
+            while (request_started := time.perf_counter()) < measure_until:
+                with sequence_lock:
+                    number = next(sequence)
+
+                try:
+                    response = session.post(url, json=make_payload(number), timeout=timeout)
+                except requests.RequestException as e:
+                    status, error = None, e.__class__.__name__
+                else:
+                    status, error = response.status_code, None
+
+                if request_started >= measure_from:
+                    latencies.append(time.perf_counter() - request_started)
+                    if error:
+                        errors[error] += 1
+                    else:
+                        status_codes[status] += 1
+
+    workers = [threading.Thread(target=worker, name=f'load-{index}') for index in range(concurrency)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    # Requests started before the deadline may complete after it, so measure until the last one has completed.
+    measured = time.perf_counter() - measure_from
+    return LoadResult(
+        latencies=[latency for latencies, *_ in results for latency in latencies],
+        status_codes=sum((status_codes for _, status_codes, _ in results), Counter()),
+        errors=sum((errors for *_, errors in results), Counter()),
+        duration=measured,
+    )
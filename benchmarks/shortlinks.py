@@ -0,0 +1,172 @@
+"""
+End-to-end `POST /shortlinks` load benchmark against local stub Bitly/TinyURL providers.
+
+Starts the stub providers and a Shorty server (unless `--target` points to an already running one), drives it
+with a closed-loop load, prints RPS and latency percentiles and writes them to a JSON result file.
+
+    python -m benchmarks.shortlinks --concurrency 32 --duration 30 --bitly-latency lognormal:80:0.4
+    python -m benchmarks.shortlinks --compare benchmarks/results/<previous result>.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+from benchmarks.load import LoadResult, run_load
+from benchmarks.stub_providers import LatencyDistribution, start_stub_server
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Shorty end-to-end load benchmark.')
+    parser.add_argument('--target', type=str, default=None,
+                        help='Base URL of an already running Shorty. By default a local one is started.')
+    parser.add_argument('--concurrency', type=int, default=16, help='Number of concurrent clients.')
+    parser.add_argument('--duration', type=float, default=10.0, help='Measurement duration, in seconds.')
+    parser.add_argument('--warmup', type=float, default=2.0, help='Warmup duration, in seconds.')
+    parser.add_argument('--provider', type=str, default=None, help='Requested provider. Any one by default.')
+    parser.add_argument('--url-pool', type=int, default=0,
+                        help='Number of distinct URLs to cycle through (exercises caches). Unique URLs by default.')
+    for provider, latency in ('bitly', 'lognormal:50:0.5'), ('tinyurl', 'lognormal:80:0.5'):
+        parser.add_argument(f'--{provider}-latency', type=LatencyDistribution.parse, default=latency,
+                            help='Stub provider latency, e.g. constant:50, uniform:20:80, exponential:50, '
+                                 'lognormal:<median>:<sigma>. In milliseconds.')
+        parser.add_argument(f'--{provider}-error-rate', type=float, default=0.0,
+                            help='Share of stub provider requests failing with HTTP 500.')
+    parser.add_argument('--seed', type=int, default=0, help='Stub providers random seed.')
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help='Extra environment variable for the started Shorty. Can be repeated.')
+    parser.add_argument('--output', type=Path, default=None, help='Result file path.')
+    parser.add_argument('--compare', type=Path, default=None, help='Previous result file to compare with.')
+    return parser.parse_args()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Shorty server exited with code {process.returncode}')
+        try:
+            requests.get(f'{base_url}/shortlinks/stats', timeout=1.0)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    raise TimeoutError(f'Shorty server is not ready after {timeout} seconds')
+
+
+def start_shorty(bitly_url: str, tinyurl_url: str, extra_env: list[str]) -> tuple[str, subprocess.Popen]:
+    port = free_port()
+    env = {
+        **os.environ,
+        'SHORTY_BITLY_URL': bitly_url,
+        'SHORTY_BITLY_API_KEY': 'benchmark',
+        'SHORTY_BITLY_GROUP_GUID': 'benchmark',
+        'SHORTY_TINYURL_URL': tinyurl_url,
+        'SHORTY_LOGGING_LEVEL': 'WARNING',
+        **dict(variable.split('=', 1) for variable in extra_env),
+    }
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.app_server', '--port', str(port)], cwd=ROOT_DIR, env=env,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_ready(base_url, process)
+    except Exception:
+        process.kill()
+        raise
+
+    return base_url, process
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, text=True, stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result: LoadResult, baseline: dict | None) -> None:
+    print(f'requests: {result.requests}, rps: {result.rps:.1f}')
+    print(f'status codes: {dict(result.status_codes)}, errors: {dict(result.errors)}')
+    for name, value in result.latency_ms().items():
+        line = f'{name:>5}: {value:9.2f} ms'
+        if baseline and (previous := baseline['result']['latency_ms'].get(name)):
+            line += f'  ({(value - previous) / previous:+.1%} vs {previous:.2f} ms)'
+        print(line)
+
+    if baseline:
+        previous_rps = baseline['result']['rps']
+        print(f'  rps: {(result.rps - previous_rps) / previous_rps:+.1%} vs {previous_rps:.1f}')
+
+
+def main() -> None:
+    args = parse_args()
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    stubs = []
+    process = None
+    base_url = args.target
+    try:
+        if base_url is None:
+            stubs = [
+                start_stub_server(args.bitly_latency, error_rate=args.bitly_error_rate, seed=args.seed),
+                start_stub_server(args.tinyurl_latency, error_rate=args.tinyurl_error_rate, seed=args.seed + 1),
+            ]
+            base_url, process = start_shorty(stubs[0].url, stubs[1].url, args.env)
+
+        def make_payload(number: int) -> dict:
+            url_number = number % args.url_pool if args.url_pool else number
+            payload = {'url': f'https://example.com/benchmark/{url_number}'}
+            if args.provider:
+                payload['provider'] = args.provider
+            return payload
+
+        result = run_load(
+            f'{base_url.rstrip("/")}/shortlinks', make_payload,
+            concurrency=args.concurrency, duration=args.duration, warmup=args.warmup,
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        for stub in stubs:
+            stub.shutdown()
+
+    print_result(result, baseline)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    output = args.output or RESULTS_DIR / f'shortlinks-{now:%Y%m%dT%H%M%SZ}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'benchmark': 'shortlinks',
+        'timestamp': now.isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {name: str(value) if value is not None else None for name, value in vars(args).items()},
+        'result': result.as_dict(),
+    }, indent=2))
+    print(f'Result written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Worker startup time and memory footprint measurement.
+
+Starts fresh interpreters which import Shorty, create the app and serve the first `POST /shortlinks` request
+(against a local stub provider), and reports timings and RSS for each startup mode. Fails if the `--max-*` limits
+are exceeded, so it can guard against regressions.
+
+    python -m benchmarks.startup --runs 5 --max-startup-ms 800 --max-rss-mb 80
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.stub_providers import LatencyDistribution, start_stub_server
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+ROOT_DIR = Path(__file__).parent.parent
+
+MODES = {
+    'default': {},
+    'production': {
+        'SHORTY_OPENAPI_MODE': 'lazy',
+        'SHORTY_LAZY_SHORTENERS': 'True',
+    },
+}
+
+
+def _rss_mb() -> float:
+    """
+    Return the current resident set size of this process, in MiB.
+    """
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def probe() -> None:
+    """
+    Measure startup of the current interpreter and print the measurements as JSON.
+    """
+    started = time.perf_counter()
+    from shorty.app import create_app
+    imported = time.perf_counter()
+    app = create_app()
+    created = time.perf_counter()
+    rss_created = _rss_mb()
+    response = app.test_client().post('/shortlinks', json={'url': 'https://example.com', 'provider': 'bitly'})
+    served = time.perf_counter()
+
+    print(json.dumps({
+        'status': response.status_code,
+        'import_ms': (imported - started) * 1000,
+        'create_app_ms': (created - imported) * 1000,
+        'first_request_ms': (served - created) * 1000,
+        'startup_ms': (served - started) * 1000,
+        'rss_after_create_app_mb': rss_created,
+        'rss_after_first_request_mb': _rss_mb(),
+        'modules': len(sys.modules),
+    }))
+
+
+def run_probe(env: dict[str, str]) -> dict:
+    started = time.perf_counter()
+    output = subprocess.check_output(
+        [sys.executable, '-m', 'benchmarks.startup', '--probe'], cwd=ROOT_DIR, env={**os.environ, **env}, text=True,
+    )
+    measurements = json.loads(output.strip().splitlines()[-1])
+    measurements['process_ms'] = (time.perf_counter() - started) * 1000
+    return measurements
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Shorty startup time and memory measurement.')
+    parser.add_argument('--probe', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--runs', type=int, default=5, help='Startups per mode. Medians are reported.')
+    parser.add_argument('--mode', choices=MODES, action='append', help='Startup mode to measure. All by default.')
+    parser.add_argument('--max-startup-ms', type=float, default=None, help='Fail if a median startup is slower.')
+    parser.add_argument('--max-rss-mb', type=float, default=None, help='Fail if a median RSS is larger.')
+    parser.add_argument('--output', type=Path, default=None, help='Result file path.')
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.probe:
+        return probe()
+
+    stub = start_stub_server(LatencyDistribution('constant', 0))
+    env = {
+        'SHORTY_BITLY_URL': stub.url,
+        'SHORTY_BITLY_API_KEY': 'benchmark',
+        'SHORTY_BITLY_GROUP_GUID': 'benchmark',
+        'SHORTY_TINYURL_URL': stub.url,
+        'SHORTY_LOGGING_LEVEL': 'WARNING',
+    }
+
+    results = {}
+    failures = []
+    try:
+        for mode in args.mode or MODES:
+            runs = [run_probe({**env, **MODES[mode]}) for _ in range(args.runs)]
+            results[mode] = {
+                name: round(statistics.median(run[name] for run in runs), 2)
+                for name in runs[0] if name != 'status'
+            }
+            results[mode]['statuses'] = sorted({run['status'] for run in runs})
+
+            print(f'{mode}:')
+            for name, value in results[mode].items():
+                print(f'  {name:>28}: {value}')
+
+            if args.max_startup_ms is not None and results[mode]['startup_ms'] > args.max_startup_ms:
+                failures.append(f'{mode} startup {results[mode]["startup_ms"]} ms > {args.max_startup_ms} ms')
+            if args.max_rss_mb is not None and results[mode]['rss_after_first_request_mb'] > args.max_rss_mb:
+                failures.append(
+                    f'{mode} RSS {results[mode]["rss_after_first_request_mb"]} MiB > {args.max_rss_mb} MiB',
+                )
+    finally:
+        stub.shutdown()
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    output = args.output or RESULTS_DIR / f'startup-{now:%Y%m%dT%H%M%SZ}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({'benchmark': 'startup', 'timestamp': now.isoformat(), 'results': results}, indent=2))
+    print(f'Result written to {output}')
+
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
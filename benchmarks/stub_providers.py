@@ -0,0 +1,181 @@
+"""
+Local stand-ins for the Bitly and TinyURL APIs with configurable latency and error rate.
+
+Run standalone with `python -m benchmarks.stub_providers --help`.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from shorty import utils
+
+__all__ = (
+    'LatencyDistribution',
+    'StubProviderServer',
+    'start_stub_server',
+)
+
+DISTRIBUTIONS = ('constant', 'uniform', 'exponential', 'lognormal')
+
+
+class LatencyDistribution:
+    """
+    Random response latency. Parsed from `<kind>:<params>` specs with values in milliseconds:
+
+    - `constant:<ms>`
+    - `uniform:<min ms>:<max ms>`
+    - `exponential:<mean ms>`
+    - `lognormal:<median ms>:<sigma>`
+    """
+
+    def __init__(self, kind: str, *params: float):
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f'Unknown latency distribution: {kind}. Expected one of {DISTRIBUTIONS}')
+
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: str) -> 'LatencyDistribution':
+        kind, *params = spec.split(':')
+        return cls(kind, *map(float, params))
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        Return a random latency in seconds.
+        """
+        if self.kind == 'constant':
+            milliseconds = self.params[0]
+        elif self.kind == 'uniform':
+            milliseconds = rng.uniform(*self.params)
+        elif self.kind == 'exponential':
+            milliseconds = rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        else:
+            median, sigma = self.params
+            milliseconds = median * rng.lognormvariate(0, sigma)
+
+        return max(milliseconds, 0.0) / 1000
+
+    def __str__(self) -> str:
+        return ':'.join((self.kind, *(f'{param:g}' for param in self.params)))
+
+
+class StubProviderServer(ThreadingHTTPServer):
+    """
+    HTTP server answering Bitly `POST /shorten` and TinyURL `GET /api-create.php` requests.
+    """
+    daemon_threads = True
+    # Load drivers open many connections at once, so don't let the default backlog of 5 drop them.
+    request_queue_size = 1024
+
+    def __init__(self, address: tuple[str, int], latency: LatencyDistribution, error_rate: float = 0.0,
+                 seed: int | None = None):
+        """
+        Initialize `StubProviderServer`.
+
+        :param address: Host and port to listen on. Port 0 picks a free one.
+        :param latency: Distribution of response latency.
+        :param error_rate: Share of requests answered with HTTP 500.
+        :param seed: Random seed, for reproducible runs.
+        """
+        super().__init__(address, _StubProviderHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def draw(self) -> tuple[float, bool]:
+        """
+        Return latency in seconds and whether to fail for the next request.
+        """
+        with self._rng_lock:
+            return self.latency.sample(self._rng), self._rng.random() < self.error_rate
+
+
+class _StubProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, so Nagle's algorithm would delay responses by a delayed ACK.
+    disable_nagle_algorithm = True
+    server: StubProviderServer
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path.rstrip('/') != '/shorten':
+            return self._respond(404, b'')
+
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        long_url = body.get('long_url', '')
+        self._respond_shortened(
+            json.dumps({'long_url': long_url, 'link': f'https://bit.ly/{_code(long_url)}'}).encode(),
+            content_type='application/json',
+        )
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') != '/api-create.php':
+            return self._respond(404, b'')
+
+        long_url = parse_qs(url.query).get('url', [''])[0]
+        self._respond_shortened(f'https://tinyurl.com/{_code(long_url)}'.encode(), content_type='text/plain')
+
+    def _respond_shortened(self, body: bytes, content_type: str) -> None:
+        latency, fail = self.server.draw()
+        time.sleep(latency)
+        if fail:
+            self._respond(500, b'Stub provider error')
+        else:
+            self._respond(200, body, content_type=content_type)
+
+    def _respond(self, status: int, body: bytes, content_type: str = 'text/plain') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+def _code(long_url: str) -> str:
+    return utils.base62_encode(int.from_bytes(hashlib.blake2b(long_url.encode(), digest_size=6).digest(), 'big'))
+
+
+def start_stub_server(latency: LatencyDistribution, error_rate: float = 0.0, seed: int | None = None,
+                      host: str = '127.0.0.1', port: int = 0) -> StubProviderServer:
+    """
+    Start a `StubProviderServer` serving in a background daemon thread. Stop it with `shutdown()`.
+    """
+    server = StubProviderServer((host, port), latency=latency, error_rate=error_rate, seed=seed)
+    threading.Thread(target=server.serve_forever, name=f'stub-provider-{server.server_address[1]}', daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Stub Bitly/TinyURL provider.')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--latency', type=LatencyDistribution.parse, default='constant:50',
+                        help='Latency distribution, e.g. constant:50, uniform:20:80, exponential:50, lognormal:50:0.5')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests failing with HTTP 500.')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server = StubProviderServer(
+        (args.host, args.port), latency=args.latency, error_rate=args.error_rate, seed=args.seed,
+    )
+    print(f'Serving stub provider at {server.url} (latency {args.latency}, error rate {args.error_rate})')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
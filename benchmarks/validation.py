@@ -0,0 +1,54 @@
+"""
+Microbenchmark of `POST /shortlinks` request validation and response serialization CPU cost per request.
+
+Compares the full `pydantic` path (`ShortlinksRequest(**json)`, `ShortlinksResponse(...).dict()` and `jsonify`)
+with the fast path (`parse_shortlinks_request` and `dump_shortlinks_response`).
+
+    python -m benchmarks.validation --number 20000
+"""
+import argparse
+import timeit
+
+from flask import Flask, Response, jsonify
+
+from shorty.shortlink import schemas
+
+PAYLOAD = {'url': 'https://example.com/some/long/path?query=value&other=1#fragment', 'provider': 'bitly'}
+SHORT_LINK = 'https://bit.ly/3xAmPlE'
+
+
+def full_path() -> Response:
+    request = schemas.ShortlinksRequest(**PAYLOAD)
+    return jsonify(schemas.ShortlinksResponse(url=request.url, link=SHORT_LINK).dict())
+
+
+def fast_path() -> Response:
+    request = schemas.parse_shortlinks_request(PAYLOAD)
+    return Response(schemas.dump_shortlinks_response(request.url, SHORT_LINK), mimetype='application/json')
+
+
+def measure(func, number: int, repeat: int) -> float:
+    """
+    Return the best of `repeat` runs of `func` in microseconds per call.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Shortlinks validation and serialization microbenchmark.')
+    parser.add_argument('--number', type=int, default=20_000, help='Calls per run.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs; the best one is reported.')
+    args = parser.parse_args()
+
+    schemas.init_schemas(('bitly', 'tinyurl'))
+    with Flask(__name__).app_context():
+        full = measure(full_path, args.number, args.repeat)
+        fast = measure(fast_path, args.number, args.repeat)
+
+    print(f'full pydantic path: {full:8.2f} us/request')
+    print(f'fast path:          {fast:8.2f} us/request')
+    print(f'saving:             {full - fast:8.2f} us/request ({1 - fast / full:.0%})')
+
+
+if __name__ == '__main__':
+    main()
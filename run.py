@@ -1,13 +1,32 @@
 import argparse
 
-from shorty.app import create_app
+from shorty.serving import load_config, serve
 
-app = create_app()
 
-if __name__ == '__main__':
+def main() -> None:
+    config = load_config()
+
     parser = argparse.ArgumentParser(description='Shorty service.')
-    parser.add_argument('--port', type=int, action='store', default=app.config['DEFAULT_PORT'])
-    parser.add_argument('--host', type=str, action='store', default=app.config['DEFAULT_HOST'])
+    parser.add_argument('--port', type=int, action='store', default=config['DEFAULT_PORT'])
+    parser.add_argument('--host', type=str, action='store', default=config['DEFAULT_HOST'])
+    commands = parser.add_subparsers(dest='command')
+
+    serve_parser = commands.add_parser('serve', help='Run the production multi-process server.')
+    # Suppressed defaults keep the values given before the command (e.g. `--port 9000 serve`).
+    serve_parser.add_argument('--port', type=int, action='store', default=argparse.SUPPRESS)
+    serve_parser.add_argument('--host', type=str, action='store', default=argparse.SUPPRESS)
+    for name, default in config['SERVING'].items():
+        serve_parser.add_argument(f'--{name.replace("_", "-")}', type=int, action='store', default=default)
+
     args = parser.parse_args()
 
-    app.run(host=args.host, port=args.port)
+    if args.command == 'serve':
+        serve(**{name: value for name, value in vars(args).items() if name != 'command'})
+    else:
+        from shorty.app import create_app
+
+        create_app().run(host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,13 @@
+import atexit
 import logging
 from typing import Any, Mapping
 
 from dotenv import load_dotenv
-from flasgger import Swagger
 from flask import Flask
 
+from shorty import log, metrics, openapi, server_timing, tracing
 from shorty.error_handlers import error_handlers
-from shorty.shortlink.views import blueprint as shortlink_bp
+from shorty.shortlink.views import blueprint as shortlink_bp, close_shorteners
 
 __all__ = (
     'create_app',
@@ -27,16 +28,27 @@ def create_app(settings_overrides: Mapping[str, Any] | None = None) -> Flask:
     configure_settings(app, settings_overrides=settings_overrides)
     configure_logging(app)
     configure_blueprints(app)
+    configure_metrics(app)
+    configure_server_timing(app)
+    configure_tracing(app)
     configure_error_handlers(app)
-    Swagger(app)
+    configure_teardown(app)
+    configure_openapi(app)
 
     return app
 
 
 def configure_logging(app: Flask) -> None:
     level = logging.getLevelName(app.config.get('LOGGING_LEVEL'))
+    pipeline_config = dict(app.config['LOGGING_PIPELINE'])
+    if pipeline_config.pop('enabled'):
+        log.configure_pipeline(level=level, **pipeline_config)
+        atexit.unregister(log.stop_pipeline)
+        atexit.register(log.stop_pipeline)
+    else:
+        logging.basicConfig(level=level)
+
     app.logger.setLevel(level)
-    logging.basicConfig(level=level)
 
 
 def configure_settings(app: Flask, settings_overrides: Mapping[str, Any] | None) -> None:
@@ -50,6 +62,33 @@ def configure_blueprints(app: Flask) -> None:
     app.register_blueprint(shortlink_bp)
 
 
+def configure_metrics(app: Flask) -> None:
+    if app.config.get('METRICS_ENABLED'):
+        metrics.init_app(app)
+
+
+def configure_server_timing(app: Flask) -> None:
+    server_timing.init_app(app)
+
+
+def configure_tracing(app: Flask) -> None:
+    tracing.init_app(app)
+    # Queued traces are written out on interpreter shutdown.
+    atexit.unregister(tracing.stop)
+    atexit.register(tracing.stop)
+
+
+def configure_openapi(app: Flask) -> None:
+    openapi.init_app(app)
+
+
 def configure_error_handlers(app: Flask) -> None:
     for exception_type, error_handler in error_handlers.items():
         app.register_error_handler(exception_type, error_handler)
+
+
+def configure_teardown(app: Flask) -> None:
+    # Shorteners live for the whole process, so their resources are released on interpreter shutdown (and on worker
+    # exit, see `shorty.serving`). Shorteners of an application are also closed once another one replaces them.
+    atexit.unregister(close_shorteners)
+    atexit.register(close_shorteners)
@@ -1,29 +1,266 @@
+import os
+
 from flask import Config
 
-from shorty.utils import get_env
+from shorty.shortlink.canonicalization import DEFAULT_TRACKING_PARAMS
+from shorty.shortlink.shorteners.request_based_shortener import DEFAULT_POOL_SIZE, DEFAULT_RETRY_BACKOFF_SECONDS
+from shorty.utils import get_env, str_to_bool, str_to_tuple
 
 DEFAULT_TIMEOUT_SECONDS = 1.0
+DEFAULT_POOL_IDLE_TIMEOUT_SECONDS = 60.0
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_DEADLINE_SECONDS = 3.0
+DEFAULT_MAX_DEADLINE_SECONDS = 30.0
+DEFAULT_CACHE_MAX_ENTRIES = 100_000
+DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60.0
+DEFAULT_BATCH_MAX_ITEMS = 1000
+DEFAULT_BATCH_MAX_WORKERS = 16
+DEFAULT_HEDGE_DELAY_SECONDS = 0.2
+DEFAULT_HEDGE_MAX_WORKERS = 32
+DEFAULT_RATE_LIMIT_PER_SECOND = 10.0
+DEFAULT_RATE_LIMIT_MAX_WAIT_SECONDS = 0.1
+DEFAULT_SERVING_WORKERS = os.cpu_count() or 1
+DEFAULT_SERVING_THREADS = 8
 
 
 class AppConfig(Config):
     SHORTENERS = {
         'bitly': {
             'class_path': 'shorty.shortlink.shorteners.bitly_shortener.BitlyShortener',
+            'async_class_path': 'shorty.shortlink.shorteners.async_bitly_shortener.AsyncBitlyShortener',
             'kwargs': {
                 'provider_url': get_env('SHORTY_BITLY_URL', 'https://api-ssl.bitly.com/v4'),
                 'api_key': get_env('SHORTY_BITLY_API_KEY'),
                 'domain': get_env('SHORTY_BITLY_DOMAIN', None),
                 'group_guid': get_env('SHORTY_BITLY_GROUP_GUID'),
                 'timeout': get_env('SHORTY_BITLY_REQUEST_TIMEOUT_SECONDS', DEFAULT_TIMEOUT_SECONDS, converter=float),
-            }
+                'pool_size': get_env('SHORTY_BITLY_POOL_SIZE', DEFAULT_POOL_SIZE, converter=int),
+                'keep_alive': get_env('SHORTY_BITLY_KEEP_ALIVE', True, converter=str_to_bool),
+                'idle_timeout': get_env(
+                    'SHORTY_BITLY_POOL_IDLE_TIMEOUT_SECONDS', DEFAULT_POOL_IDLE_TIMEOUT_SECONDS, converter=float,
+                ),
+                'max_retries': get_env('SHORTY_BITLY_MAX_RETRIES', DEFAULT_MAX_RETRIES, converter=int),
+                'retry_backoff': get_env(
+                    'SHORTY_BITLY_RETRY_BACKOFF_SECONDS', DEFAULT_RETRY_BACKOFF_SECONDS, converter=float,
+                ),
+            },
+            # Overrides of `SHORTLINKS_RATE_LIMIT` for this provider. Unset (`None`) values aren't overridden.
+            'rate_limit': {
+                'enabled': get_env('SHORTY_BITLY_RATE_LIMIT_ENABLED', None, converter=str_to_bool),
+                'rate': get_env('SHORTY_BITLY_RATE_LIMIT_PER_SECOND', None, converter=float),
+                'burst': get_env('SHORTY_BITLY_RATE_LIMIT_BURST', None, converter=int),
+            },
         },
         'tinyurl': {
             'class_path': 'shorty.shortlink.shorteners.tinyurl_shortener.TinyurlShortener',
+            'async_class_path': 'shorty.shortlink.shorteners.async_tinyurl_shortener.AsyncTinyurlShortener',
             'kwargs': {
                 'provider_url': get_env('SHORTY_TINYURL_URL', 'https://tinyurl.com'),
                 'timeout': get_env('SHORTY_TINYURL_REQUEST_TIMEOUT_SECONDS', DEFAULT_TIMEOUT_SECONDS, converter=float),
+                'pool_size': get_env('SHORTY_TINYURL_POOL_SIZE', DEFAULT_POOL_SIZE, converter=int),
+                'keep_alive': get_env('SHORTY_TINYURL_KEEP_ALIVE', True, converter=str_to_bool),
+                'idle_timeout': get_env(
+                    'SHORTY_TINYURL_POOL_IDLE_TIMEOUT_SECONDS', DEFAULT_POOL_IDLE_TIMEOUT_SECONDS, converter=float,
+                ),
+                'max_retries': get_env('SHORTY_TINYURL_MAX_RETRIES', DEFAULT_MAX_RETRIES, converter=int),
+                'retry_backoff': get_env(
+                    'SHORTY_TINYURL_RETRY_BACKOFF_SECONDS', DEFAULT_RETRY_BACKOFF_SECONDS, converter=float,
+                ),
+            },
+            # Overrides of `SHORTLINKS_RATE_LIMIT` for this provider. Unset (`None`) values aren't overridden.
+            'rate_limit': {
+                'enabled': get_env('SHORTY_TINYURL_RATE_LIMIT_ENABLED', None, converter=str_to_bool),
+                'rate': get_env('SHORTY_TINYURL_RATE_LIMIT_PER_SECOND', None, converter=float),
+                'burst': get_env('SHORTY_TINYURL_RATE_LIMIT_BURST', None, converter=int),
+            },
+        }
+    }
+    # Built-in `local` provider. Its links must be redirected by any worker process, before and after restarts, so it
+    # can't be enabled without a database shared by all of them.
+    if get_env('SHORTY_LOCAL_SHORTENER_ENABLED', False, converter=str_to_bool):
+        SHORTENERS['local'] = {
+            'class_path': 'shorty.shortlink.shorteners.local_shortener.LocalShortener',
+            'kwargs': {
+                'base_url': get_env('SHORTY_LOCAL_BASE_URL', 'http://localhost:8080'),
+                'database_path': get_env('SHORTY_LOCAL_DATABASE_PATH'),
+                'code_key': get_env('SHORTY_LOCAL_CODE_KEY'),
+                'max_cached': get_env('SHORTY_LOCAL_CACHE_MAX_ENTRIES', 10_000, converter=int),
             }
         }
+
+    # Shortlinks result cache. Keyed by (provider, long url) and consulted before reaching shortening providers.
+    # A `compact` cache keeps up to `max_entries` short links resident at a fraction of the memory of the LRU one,
+    # but never evicts or expires them (`ttl` is ignored). See `shorty.shortlink.compact_map.CompactShortlinkMap`.
+    SHORTLINKS_CACHE = {
+        'enabled': get_env('SHORTY_CACHE_ENABLED', True, converter=str_to_bool),
+        'max_entries': get_env('SHORTY_CACHE_MAX_ENTRIES', DEFAULT_CACHE_MAX_ENTRIES, converter=int),
+        'ttl': get_env('SHORTY_CACHE_TTL_SECONDS', DEFAULT_CACHE_TTL_SECONDS, converter=float),
+        'compact': get_env('SHORTY_CACHE_COMPACT', False, converter=str_to_bool),
+    }
+
+    # HTTP caching of `GET /shortlinks` responses by CDNs and reverse proxies: `Cache-Control` lifetime and
+    # `stale-while-revalidate` window in seconds. Responses have strong `ETag`s to revalidate them with.
+    SHORTLINKS_HTTP_CACHE = {
+        'max_age': get_env('SHORTY_HTTP_CACHE_MAX_AGE_SECONDS', 24 * 60 * 60, converter=int),
+        'stale_while_revalidate': get_env('SHORTY_HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS', 60 * 60, converter=int),
+    }
+
+    # Batch shortening (`POST /shortlinks/batch`).
+    SHORTLINKS_BATCH = {
+        'max_items': get_env('SHORTY_BATCH_MAX_ITEMS', DEFAULT_BATCH_MAX_ITEMS, converter=int),
+        'max_workers': get_env('SHORTY_BATCH_MAX_WORKERS', DEFAULT_BATCH_MAX_WORKERS, converter=int),
+    }
+
+    # Streaming shortening (`POST /shortlinks/stream`). Items are shortened on the batch worker pool.
+    SHORTLINKS_STREAM = {
+        'max_in_flight': get_env('SHORTY_STREAM_MAX_IN_FLIGHT', 64, converter=int),
+        'max_line_size': get_env('SHORTY_STREAM_MAX_LINE_BYTES', 16 * 1024, converter=int),
+    }
+
+    # Asynchronous shortening jobs (`POST /shortlinks/jobs`). Job items are shortened by `max_workers` background
+    # threads, and jobs are rejected while `max_queued_items` items are waiting. Finished jobs are kept for `ttl`
+    # seconds, and unfinished ones (e.g. orphaned by an exited worker process) for `pending_ttl` seconds since their
+    # creation. With `path` set, jobs are stored in an SQLite database, so that any worker process can report them.
+    SHORTLINKS_JOBS = {
+        'max_workers': get_env('SHORTY_JOBS_MAX_WORKERS', 4, converter=int),
+        'max_queued_items': get_env('SHORTY_JOBS_MAX_QUEUED_ITEMS', 10_000, converter=int),
+        'ttl': get_env('SHORTY_JOBS_TTL_SECONDS', 60 * 60.0, converter=float),
+        'pending_ttl': get_env('SHORTY_JOBS_PENDING_TTL_SECONDS', 24 * 60 * 60.0, converter=float),
+        'path': get_env('SHORTY_JOBS_PATH', None),
+    }
+
+    # Fallback strategy for requests without `provider`:
+    # - `sequential`: try the next provider only after the previous one has failed;
+    # - `hedged`: also try the next provider if the previous one hasn't responded within `hedge_delay` seconds;
+    # - `race`: try all providers at once.
+    # In all modes the first valid short link wins.
+    SHORTLINKS_FALLBACK = {
+        'mode': get_env('SHORTY_FALLBACK_MODE', 'sequential'),
+        'hedge_delay': get_env('SHORTY_HEDGE_DELAY_SECONDS', DEFAULT_HEDGE_DELAY_SECONDS, converter=float),
+        'max_workers': get_env('SHORTY_HEDGE_MAX_WORKERS', DEFAULT_HEDGE_MAX_WORKERS, converter=int),
+    }
+
+    # Persistent short links store shared by all worker processes. Consulted after the in-memory cache.
+    SHORTLINKS_STORE = {
+        'enabled': get_env('SHORTY_STORE_ENABLED', False, converter=str_to_bool),
+        'path': get_env('SHORTY_STORE_PATH', 'shortlinks.sqlite3'),
+        'bloom_capacity': get_env('SHORTY_STORE_BLOOM_CAPACITY', 1_000_000, converter=int),
+        'bloom_error_rate': get_env('SHORTY_STORE_BLOOM_ERROR_RATE', 0.01, converter=float),
+        'refresh_interval': get_env('SHORTY_STORE_REFRESH_INTERVAL_SECONDS', 5.0, converter=float),
+    }
+
+    # Canonicalize urls before shortening, so that equivalent urls share cache entries and provider calls.
+    # See `shorty.shortlink.canonicalization.UrlCanonicalizer` for the rules.
+    # Can be overridden for a specific provider with `canonicalization` key of its `SHORTENERS` config.
+    SHORTLINKS_CANONICALIZATION = {
+        'enabled': get_env('SHORTY_CANONICALIZATION_ENABLED', True, converter=str_to_bool),
+        'lowercase': get_env('SHORTY_CANONICALIZATION_LOWERCASE', True, converter=str_to_bool),
+        'default_port': get_env('SHORTY_CANONICALIZATION_DEFAULT_PORT', True, converter=str_to_bool),
+        'percent_encoding': get_env('SHORTY_CANONICALIZATION_PERCENT_ENCODING', True, converter=str_to_bool),
+        'sort_query': get_env('SHORTY_CANONICALIZATION_SORT_QUERY', False, converter=str_to_bool),
+        'strip_tracking': get_env('SHORTY_CANONICALIZATION_STRIP_TRACKING', False, converter=str_to_bool),
+        'tracking_params': get_env(
+            'SHORTY_CANONICALIZATION_TRACKING_PARAMS', DEFAULT_TRACKING_PARAMS, converter=str_to_tuple,
+        ),
+    }
+
+    # Coalesce concurrent identical requests, so only one of them reaches the shortening provider.
+    SHORTLINKS_SINGLE_FLIGHT = {
+        'enabled': get_env('SHORTY_SINGLE_FLIGHT_ENABLED', True, converter=str_to_bool),
+    }
+
+    # Per provider circuit breaker. See `shorty.shortlink.circuit_breaker.CircuitBreaker` for details.
+    # Can be overridden for a specific provider with `circuit_breaker` key of its `SHORTENERS` config.
+    SHORTLINKS_CIRCUIT_BREAKER = {
+        'enabled': get_env('SHORTY_CIRCUIT_BREAKER_ENABLED', True, converter=str_to_bool),
+        'failure_rate_threshold': get_env('SHORTY_CIRCUIT_BREAKER_FAILURE_RATE', 0.5, converter=float),
+        'window': get_env('SHORTY_CIRCUIT_BREAKER_WINDOW_SECONDS', 30.0, converter=float),
+        'min_calls': get_env('SHORTY_CIRCUIT_BREAKER_MIN_CALLS', 10, converter=int),
+        'open_duration': get_env('SHORTY_CIRCUIT_BREAKER_OPEN_SECONDS', 15.0, converter=float),
+        'half_open_max_calls': get_env('SHORTY_CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS', 1, converter=int),
+    }
+
+    # Time budget of a shortening request across all providers it falls back between. Each provider call gets no more
+    # than the time left, and transient 5xx responses are retried only while the budget allows. Clients may set their
+    # own budget in seconds with the `header` request header, up to `max`. Zero `default` means no default budget.
+    SHORTLINKS_DEADLINE = {
+        'default': get_env('SHORTY_REQUEST_DEADLINE_SECONDS', DEFAULT_DEADLINE_SECONDS, converter=float),
+        'max': get_env('SHORTY_REQUEST_DEADLINE_MAX_SECONDS', DEFAULT_MAX_DEADLINE_SECONDS, converter=float),
+        'header': get_env('SHORTY_REQUEST_DEADLINE_HEADER', 'X-Request-Timeout'),
+    }
+
+    # Per provider outbound token bucket rate limit. Calls wait for up to `max_wait` seconds for the limit to allow
+    # them, and fall through to the next provider otherwise. With `path` set, the limit is shared by all worker
+    # processes through an SQLite database, otherwise each process has its own limit.
+    # Can be overridden for a specific provider with `rate_limit` key of its `SHORTENERS` config.
+    SHORTLINKS_RATE_LIMIT = {
+        'enabled': get_env('SHORTY_RATE_LIMIT_ENABLED', False, converter=str_to_bool),
+        'rate': get_env('SHORTY_RATE_LIMIT_PER_SECOND', DEFAULT_RATE_LIMIT_PER_SECOND, converter=float),
+        'burst': get_env('SHORTY_RATE_LIMIT_BURST', None, converter=int),
+        'max_wait': get_env('SHORTY_RATE_LIMIT_MAX_WAIT_SECONDS', DEFAULT_RATE_LIMIT_MAX_WAIT_SECONDS, converter=float),
+        'path': get_env('SHORTY_RATE_LIMIT_PATH', None),
+    }
+
+    # Order providers for requests without `provider` by their EWMA latency and success rate, instead of
+    # the `SHORTENERS` order. `exploration_rate` is a chance of trying a random non-best provider first.
+    SHORTLINKS_ADAPTIVE_ORDERING = {
+        'enabled': get_env('SHORTY_ADAPTIVE_ORDERING_ENABLED', False, converter=str_to_bool),
+        'alpha': get_env('SHORTY_ADAPTIVE_ORDERING_ALPHA', 0.2, converter=float),
+        'exploration_rate': get_env('SHORTY_ADAPTIVE_ORDERING_EXPLORATION_RATE', 0.05, converter=float),
+        'min_success_rate': get_env('SHORTY_ADAPTIVE_ORDERING_MIN_SUCCESS_RATE', 0.5, converter=float),
+    }
+
+    # Build shorteners on their first use instead of on startup, for faster worker startup.
+    SHORTLINKS_LAZY_SHORTENERS = get_env('SHORTY_LAZY_SHORTENERS', False, converter=str_to_bool)
+
+    # Prometheus metrics exposed on `GET /metrics`. Set `PROMETHEUS_MULTIPROC_DIR` when running multiple workers.
+    METRICS_ENABLED = get_env('SHORTY_METRICS_ENABLED', True, converter=str_to_bool)
+
+    # Per request phase durations reported in `Server-Timing` response header and, optionally, logged.
+    SERVER_TIMING = {
+        'enabled': get_env('SHORTY_SERVER_TIMING_ENABLED', False, converter=str_to_bool),
+        'log': get_env('SHORTY_SERVER_TIMING_LOG', False, converter=str_to_bool),
+    }
+
+    # Request tracing: spans of requests, their validation, shortening provider attempts and outbound provider calls,
+    # with W3C `traceparent` propagation. Traces are kept with `sample_rate` probability, unless the incoming
+    # `traceparent` decides, and always if the request takes at least `slow_threshold` seconds. Kept traces are
+    # appended to a JSONL file at `path` by a background thread in batches of up to `batch_size` traces.
+    TRACING = {
+        'enabled': get_env('SHORTY_TRACING_ENABLED', False, converter=str_to_bool),
+        'path': get_env('SHORTY_TRACING_PATH', 'traces.jsonl'),
+        'sample_rate': get_env('SHORTY_TRACING_SAMPLE_RATE', 0.01, converter=float),
+        'slow_threshold': get_env('SHORTY_TRACING_SLOW_THRESHOLD_SECONDS', 0.5, converter=float),
+        'batch_size': get_env('SHORTY_TRACING_BATCH_SIZE', 256, converter=int),
+        'flush_interval': get_env('SHORTY_TRACING_FLUSH_INTERVAL_SECONDS', 1.0, converter=float),
+        'queue_size': get_env('SHORTY_TRACING_QUEUE_SIZE', 10_000, converter=int),
+    }
+
+    # Log records are written by a background thread. Records below WARNING level are sampled with `sample_rate`,
+    # and identical errors are logged once per `error_interval` seconds along with the number of the suppressed ones.
+    # Zero `error_interval` turns the aggregation off.
+    LOGGING_PIPELINE = {
+        'enabled': get_env('SHORTY_LOG_PIPELINE_ENABLED', True, converter=str_to_bool),
+        'sample_rate': get_env('SHORTY_LOG_SAMPLE_RATE', 1.0, converter=float),
+        'error_interval': get_env('SHORTY_LOG_ERROR_INTERVAL_SECONDS', 10.0, converter=float),
+        'queue_size': get_env('SHORTY_LOG_QUEUE_SIZE', 10_000, converter=int),
+    }
+
+    # OpenAPI spec serving, see `shorty.openapi.OPENAPI_MODES`. Use `lazy` or `prebuilt` for faster worker startup.
+    OPENAPI = {
+        'mode': get_env('SHORTY_OPENAPI_MODE', 'eager'),
+        'path': get_env('SHORTY_OPENAPI_SPEC_PATH', 'openapi.json'),
+    }
+
+    # `python run.py serve` production server settings. See `shorty.serving` for details.
+    SERVING = {
+        'workers': get_env('SHORTY_WORKERS', DEFAULT_SERVING_WORKERS, converter=int),
+        'threads': get_env('SHORTY_THREADS', DEFAULT_SERVING_THREADS, converter=int),
+        'timeout': get_env('SHORTY_WORKER_TIMEOUT_SECONDS', 30, converter=int),
+        'graceful_timeout': get_env('SHORTY_GRACEFUL_TIMEOUT_SECONDS', 30, converter=int),
+        'keepalive': get_env('SHORTY_KEEP_ALIVE_SECONDS', 5, converter=int),
+        'max_requests': get_env('SHORTY_MAX_REQUESTS', 10_000, converter=int),
+        'max_requests_jitter': get_env('SHORTY_MAX_REQUESTS_JITTER', 1000, converter=int),
     }
 
     # App config
@@ -6,6 +6,7 @@ from werkzeug.exceptions import HTTPException, InternalServerError
 
 __all__ = (
     'error_handlers',
+    'error_payload',
     'http_error_handler',
     'generic_error_handler',
 )
@@ -40,14 +41,26 @@ def generic_error_handler(exception: Exception) -> tuple[Response, int]:
     return http_error_handler(http_exception)
 
 
-@add_error_handler(HTTPException)
-def http_error_handler(exception: HTTPException) -> tuple[Response, int]:
-    error_payload = {
+def error_payload(exception: HTTPException) -> dict:
+    """
+    Build JSON error payload describing a given `exception`.
+    """
+    payload = {
         'name': exception.name,
         'description': exception.description,
     }
 
     if hasattr(exception, 'errors'):
-        error_payload['errors'] = exception.errors
+        payload['errors'] = exception.errors
+
+    return payload
 
-    return jsonify(error_payload), exception.code
+
+@add_error_handler(HTTPException)
+def http_error_handler(exception: HTTPException) -> tuple[Response, int]:
+    response = jsonify(error_payload(exception))
+    # Keep headers such as `Retry-After` or `Allow`, but not the HTML content type of the default error page.
+    response.headers.extend(
+        (name, value) for name, value in exception.get_headers() if name.lower() != 'content-type'
+    )
+    return response, exception.code
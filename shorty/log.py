@@ -0,0 +1,241 @@
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+__all__ = (
+    'configure_pipeline',
+    'stop_pipeline',
+    'ErrorAggregationFilter',
+    'LogPipeline',
+    'NonBlockingQueueHandler',
+    'SamplingFilter',
+)
+
+FORMAT = logging.BASIC_FORMAT
+
+_pipeline: 'LogPipeline | None' = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Pass only `sample_rate` share of records below WARNING level. WARNING and above always pass.
+    """
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or self.sample_rate >= 1 or random.random() < self.sample_rate
+
+
+class _ErrorWindow:
+    __slots__ = ('started', 'suppressed', 'record')
+
+    def __init__(self, started: float):
+        self.started = started
+        self.suppressed = 0
+        self.record: logging.LogRecord | None = None
+
+
+class ErrorAggregationFilter(logging.Filter):
+    """
+    Rate limit identical error records: the first one within `interval` seconds passes, the rest are only counted.
+    Counts are reported by `flush` as "N identical errors in the last interval" records.
+
+    Records are identical if they are logged from the same place with the same exception type.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Initialize `ErrorAggregationFilter`.
+
+        :param interval: Seconds to aggregate identical error records over. Non-positive means no aggregation.
+        """
+        super().__init__()
+        self.interval = interval
+        self._windows: dict[tuple, _ErrorWindow] = {}
+        self._summaries: list[logging.LogRecord] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    @staticmethod
+    def _key(record: logging.LogRecord) -> tuple:
+        exception_type = record.exc_info[0] if record.exc_info else None
+        return record.name, record.pathname, record.lineno, exception_type
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.ERROR or not self.enabled:
+            return True
+
+        key = self._key(record)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window.started >= self.interval:
+                if window is not None and window.suppressed:
+                    self._summaries.append(self._summary(window, now))
+                self._windows[key] = _ErrorWindow(now)
+                return True
+
+            window.suppressed += 1
+            window.record = record
+            return False
+
+    def flush(self, force: bool = False) -> list[logging.LogRecord]:
+        """
+        Return summary records of identical errors suppressed within finished intervals.
+
+        :param force: Summarize unfinished intervals as well, e.g. on shutdown.
+        """
+        now = time.monotonic()
+        with self._lock:
+            summaries, self._summaries = self._summaries, []
+            for key, window in list(self._windows.items()):
+                if force or now - window.started >= self.interval:
+                    del self._windows[key]
+                    if window.suppressed:
+                        summaries.append(self._summary(window, now))
+
+        return summaries
+
+    @staticmethod
+    def _summary(window: _ErrorWindow, now: float) -> logging.LogRecord:
+        record = window.record
+        exception_type = record.exc_info[0] if record.exc_info and record.exc_info[0] else None
+        return logging.makeLogRecord({
+            **record.__dict__,
+            'msg': '%s identical errors in the last %.1fs%s: %s',
+            'args': (
+                window.suppressed,
+                now - window.started,
+                f' ({exception_type.__name__})' if exception_type else '',
+                record.getMessage(),
+            ),
+            'exc_info': None,
+            'exc_text': None,
+        })
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    `QueueHandler` which never blocks a logging thread: records are dropped if the queue is full,
+    and formatting is left to the writer thread.
+    """
+
+    def __init__(self, queue_: queue.Queue):
+        super().__init__(queue_)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records don't leave the process, so there is no need to format them on the logging thread.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline(QueueListener):
+    """
+    Background thread writing queued log records to `handlers` and periodically reporting aggregated errors.
+    """
+
+    def __init__(self, queue_handler: NonBlockingQueueHandler, error_aggregation: ErrorAggregationFilter,
+                 *handlers: logging.Handler):
+        """
+        Initialize `LogPipeline`.
+
+        :param queue_handler: Handler putting records to the queue to read from.
+        :param error_aggregation: Filter of `queue_handler` to report aggregated errors of.
+        :param handlers: Handlers to write records with.
+        """
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.error_aggregation = error_aggregation
+        self._summaries_written_at = time.monotonic()
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if not block or not self.error_aggregation.enabled:
+            return self.queue.get(block)
+
+        while True:
+            # Summaries are due once per interval, whether the queue runs empty or records keep coming.
+            wait = self._summaries_written_at + self.error_aggregation.interval - time.monotonic()
+            if wait <= 0:
+                self._write_error_summaries()
+                continue
+
+            try:
+                return self.queue.get(timeout=wait)
+            except queue.Empty:
+                pass
+
+    def _write_error_summaries(self, force: bool = False) -> None:
+        self._summaries_written_at = time.monotonic()
+        for record in self.error_aggregation.flush(force=force):
+            self.handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        # Unlike records, the stop signal must not be dropped when the queue is full.
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        super().stop()
+        self._write_error_summaries(force=True)
+
+
+def configure_pipeline(level: int | str, sample_rate: float = 1.0, error_interval: float = 10.0,
+                       queue_size: int = 10_000) -> LogPipeline:
+    """
+    Route root logger records through a bounded queue to a background writer thread.
+    Replaces the previously configured pipeline, if any.
+
+    :param level: Root logger level.
+    :param sample_rate: Share of records below WARNING level to keep.
+    :param error_interval: Seconds to aggregate identical error records over. Non-positive means no aggregation.
+    :param queue_size: Max number of records waiting to be written. Records are dropped when the queue is full.
+    """
+    global _pipeline
+
+    stop_pipeline()
+
+    records: queue.Queue = queue.Queue(maxsize=queue_size)
+    error_aggregation = ErrorAggregationFilter(interval=error_interval)
+    queue_handler = NonBlockingQueueHandler(records)
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+    queue_handler.addFilter(error_aggregation)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(FORMAT))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    _pipeline = LogPipeline(queue_handler, error_aggregation, stream_handler)
+    _pipeline.start()
+    return _pipeline
+
+
+def stop_pipeline() -> None:
+    """
+    Write out queued records and detach the configured pipeline, if any, from the root logger.
+    """
+    global _pipeline
+
+    if _pipeline is None:
+        return
+
+    logging.getLogger().removeHandler(_pipeline.queue_handler)
+    _pipeline.stop()
+    _pipeline = None
@@ -0,0 +1,137 @@
+import os
+import time
+
+from flask import Flask, Response, blueprints, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from shorty.shortlink.shorteners import exceptions as shortener_exceptions
+
+__all__ = (
+    'blueprint',
+    'init_app',
+    'observe_provider_call',
+    'provider_outcome',
+    'FALLBACKS',
+    'PROVIDER_IN_FLIGHT',
+)
+
+# Multi-process mode of `prometheus_client` is enabled by `PROMETHEUS_MULTIPROC_DIR` environment variable.
+MULTIPROC_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    'shorty_http_requests_total', 'HTTP requests handled.', ('endpoint', 'method', 'status'),
+)
+REQUEST_LATENCY = Histogram(
+    'shorty_http_request_duration_seconds', 'HTTP request handling latency.', ('endpoint', 'method'),
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'shorty_http_requests_in_flight', 'HTTP requests being handled.', ('endpoint',), multiprocess_mode='livesum',
+)
+PROVIDER_REQUESTS = Counter(
+    'shorty_provider_requests_total', 'Shortening provider calls by outcome.', ('provider', 'outcome'),
+)
+PROVIDER_LATENCY = Histogram(
+    'shorty_provider_request_duration_seconds', 'Shortening provider call latency.', ('provider',),
+    buckets=LATENCY_BUCKETS,
+)
+PROVIDER_IN_FLIGHT = Gauge(
+    'shorty_provider_requests_in_flight', 'Shortening provider calls in progress.', ('provider',),
+    multiprocess_mode='livesum',
+)
+FALLBACKS = Counter(
+    'shorty_fallbacks_total', 'Falls back to the next provider after a provider has failed.', ('provider',),
+)
+
+# Most specific exceptions go first.
+_OUTCOMES = (
+    (shortener_exceptions.DeadlineExceeded, 'deadline_exceeded'),
+    (shortener_exceptions.ShorteningProviderRateLimited, 'rate_limited'),
+    (shortener_exceptions.ShorteningProviderUnavailable, 'unavailable'),
+    (shortener_exceptions.ShorteningProviderTimeout, 'timeout'),
+    (shortener_exceptions.InvalidShorteningProviderResponse, 'invalid_response'),
+    (shortener_exceptions.ShorteningProviderRequestException, 'http_error'),
+)
+
+blueprint = blueprints.Blueprint('metrics', __name__)
+
+
+def provider_outcome(exception: BaseException | None) -> str:
+    """
+    Classify a shortening provider call outcome by the exception it has raised (following `shorteners.exceptions`).
+    """
+    if exception is None:
+        return 'success'
+
+    for exception_type, outcome in _OUTCOMES:
+        if isinstance(exception, exception_type):
+            return outcome
+
+    return 'error'
+
+
+def observe_provider_call(provider: str, duration: float, exception: BaseException | None) -> None:
+    PROVIDER_REQUESTS.labels(provider, provider_outcome(exception)).inc()
+    PROVIDER_LATENCY.labels(provider).observe(duration)
+
+
+def _endpoint() -> str:
+    return request.url_rule.rule if request.url_rule is not None else 'unknown'
+
+
+def _before_request() -> None:
+    if request.blueprint == blueprint.name:
+        return
+
+    g.metrics_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.labels(_endpoint()).inc()
+
+
+def _after_request(response: Response) -> Response:
+    started = g.pop('metrics_started', None)
+    if started is not None:
+        endpoint = _endpoint()
+        REQUESTS_IN_FLIGHT.labels(endpoint).dec()
+        REQUESTS.labels(endpoint, request.method, response.status_code).inc()
+        REQUEST_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - started)
+
+    return response
+
+
+def init_app(app: Flask) -> None:
+    """
+    Register `/metrics` endpoint and HTTP request metrics hooks.
+    """
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.register_blueprint(blueprint)
+
+
+@blueprint.route('/metrics')
+def metrics() -> Response:
+    """
+    Service metrics in Prometheus text format.
+    ---
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Metrics in Prometheus text exposition format.
+    """
+    registry = REGISTRY
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,116 @@
+"""
+OpenAPI spec of the service. `flasgger` (with `jsonschema`, `PyYAML` and `mistune`) is imported only when the spec
+is actually set up or built, so workers which don't serve it don't pay for it.
+
+Build a spec file for the `prebuilt` mode with `python -m shorty.openapi <path>`.
+"""
+import json
+import os
+import sys
+import threading
+from typing import Callable, TypeVar
+
+from flask import Flask, Response, blueprints, current_app
+
+__all__ = (
+    'blueprint',
+    'build_spec',
+    'init_app',
+    'spec_from_file',
+    'OPENAPI_MODES',
+)
+
+T = TypeVar('T', bound=Callable)
+
+# `eager`: Swagger UI at `/apidocs/` and the spec, set up on startup.
+# `lazy`: only the spec, built on its first request. `prebuilt`: only the spec, served from a file. `off`: none.
+OPENAPI_MODES = ('eager', 'lazy', 'prebuilt', 'off')
+SPEC_ENDPOINT = 'apispec_1'
+
+blueprint = blueprints.Blueprint('openapi', __name__)
+
+_spec: bytes | None = None
+_spec_lock = threading.Lock()
+
+
+def spec_from_file(filename: str) -> Callable[[T], T]:
+    """
+    Attach a YAML spec file, relative to the module of a decorated view, to it.
+    The same as `flasgger.swag_from(filename)`, without importing `flasgger`.
+    """
+    def decorator(view: T) -> T:
+        view.root_path = os.path.dirname(os.path.abspath(sys.modules[view.__module__].__file__))
+        view.swag_path = os.path.join(view.root_path, filename)
+        view.swag_type = filename.rsplit('.', 1)[-1]
+        return view
+
+    return decorator
+
+
+def build_spec(app: Flask) -> dict:
+    """
+    Build the OpenAPI spec of a given `app`, the same as served in the `eager` mode.
+    """
+    from flasgger import Swagger
+
+    swagger = Swagger()
+    swagger.app = app
+    swagger.load_config(app)
+    return swagger.get_apispecs(SPEC_ENDPOINT)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Set up the OpenAPI spec serving according to `OPENAPI['mode']` of the app config.
+    """
+    global _spec
+
+    mode = app.config['OPENAPI']['mode']
+    if mode not in OPENAPI_MODES:
+        raise ValueError(f'Unknown OpenAPI mode: {mode}. Expected one of {OPENAPI_MODES}')
+
+    _spec = None
+    if mode == 'eager':
+        from flasgger import Swagger
+        Swagger(app)
+    elif mode in ('lazy', 'prebuilt'):
+        app.register_blueprint(blueprint)
+
+
+def _load_spec() -> bytes:
+    config = current_app.config['OPENAPI']
+    if config['mode'] == 'prebuilt':
+        with open(config['path'], 'rb') as spec_file:
+            return spec_file.read()
+
+    return json.dumps(build_spec(current_app._get_current_object())).encode()
+
+
+@blueprint.route(f'/{SPEC_ENDPOINT}.json')
+def spec() -> Response:
+    global _spec
+
+    if _spec is None:
+        with _spec_lock:
+            if _spec is None:
+                _spec = _load_spec()
+
+    return Response(_spec, mimetype='application/json')
+
+
+def main() -> None:
+    from shorty.app import create_app
+
+    if len(sys.argv) != 2:
+        sys.exit('Usage: python -m shorty.openapi <spec path>')
+
+    app = create_app({'OPENAPI': {'mode': 'off'}})
+    with app.app_context():
+        spec_data = build_spec(app)
+
+    with open(sys.argv[1], 'w') as spec_file:
+        json.dump(spec_data, spec_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
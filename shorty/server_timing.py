@@ -0,0 +1,134 @@
+import contextvars
+import json
+import logging
+import time
+from contextlib import nullcontext
+
+from flask import Flask, Response, current_app, g, request
+
+__all__ = (
+    'init_app',
+    'timed',
+    'ServerTiming',
+)
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'Server-Timing'
+
+_current_timing: contextvars.ContextVar['ServerTiming | None'] = contextvars.ContextVar(
+    'server_timing', default=None,
+)
+# Shared no-op context manager returned by `timed` while timing is off, so that it costs a single lookup.
+_NOT_TIMED = nullcontext()
+
+
+class ServerTiming:
+    """
+    Durations of the phases of a single request, rendered as a `Server-Timing` header value.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.entries: list[tuple[str, float]] = []
+
+    def add(self, name: str, duration: float) -> None:
+        """
+        Record a phase duration.
+
+        :param name: Phase name. Must be a valid HTTP token (no spaces, commas, semicolons, etc.).
+        :param duration: Phase duration in seconds.
+        """
+        # `list.append` is atomic, so phases may be recorded by several threads at once.
+        self.entries.append((name, duration))
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def _aggregate(self) -> dict[str, tuple[float, int]]:
+        # Total duration in seconds and count of each phase, in the order phases were first recorded.
+        aggregated = {}
+        for name, duration in self.entries:
+            total, count = aggregated.get(name, (0.0, 0))
+            aggregated[name] = total + duration, count + 1
+
+        aggregated['total'] = self.total(), 1
+        return aggregated
+
+    def header_value(self) -> str:
+        """
+        Return `Server-Timing` header value with durations in milliseconds, including the `total` one. Repeated
+        phases (e.g. retried provider calls) are reported once, with their total duration and count.
+        """
+        return ', '.join(
+            f'{name};dur={duration * 1000:.2f}' + (f';desc="{count} calls"' if count > 1 else '')
+            for name, (duration, count) in self._aggregate().items()
+        )
+
+    def as_dict(self) -> dict[str, float]:
+        """
+        Return durations in milliseconds by phase name. Durations of repeated phases are summed up.
+        """
+        return {name: round(duration * 1000, 2) for name, (duration, _) in self._aggregate().items()}
+
+
+class _Timer:
+    __slots__ = ('timing', 'name', 'started')
+
+    def __init__(self, timing: ServerTiming, name: str):
+        self.timing = timing
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *_) -> None:
+        self.timing.add(self.name, time.perf_counter() - self.started)
+
+
+def timed(name: str) -> _Timer | nullcontext:
+    """
+    Return a context manager timing its block as a `name` phase of the current request.
+    It does nothing if timing is off or there is no request being timed.
+    """
+    timing = _current_timing.get()
+    if timing is None:
+        return _NOT_TIMED
+
+    return _Timer(timing, name)
+
+
+def _before_request() -> None:
+    if current_app.config['SERVER_TIMING']['enabled']:
+        g.server_timing_token = _current_timing.set(ServerTiming())
+
+
+def _after_request(response: Response) -> Response:
+    timing = _current_timing.get()
+    if timing is None:
+        return response
+
+    response.headers[HEADER] = timing.header_value()
+    if current_app.config['SERVER_TIMING']['log']:
+        logger.info('Request timing: %s', json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'timings': timing.as_dict(),
+        }))
+
+    return response
+
+
+def _teardown_request(_: BaseException | None) -> None:
+    if (token := g.pop('server_timing_token', None)) is not None:
+        _current_timing.reset(token)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Register hooks timing requests while `SERVER_TIMING` is enabled in the app config.
+    """
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
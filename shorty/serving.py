@@ -0,0 +1,101 @@
+"""
+Production server: a `gunicorn` master process with preforked worker processes, each serving requests with
+a pool of threads.
+
+- `SIGTERM`/`SIGINT`: graceful shutdown. Workers stop accepting connections and complete in-flight requests and
+  shortening provider calls within `graceful_timeout`.
+- `SIGHUP`: graceful restart of all workers, e.g. to apply a new configuration.
+- `SIGTTIN`/`SIGTTOU`: add/remove a worker.
+
+Workers are recycled after `max_requests` (plus up to `max_requests_jitter`) requests, to bound memory growth.
+"""
+import os
+from typing import Any, Mapping
+
+from dotenv import load_dotenv
+from flask import Config, Flask
+from gunicorn.app.base import BaseApplication
+
+from shorty import log, tracing
+from shorty.app import DEFAULT_CONFIG, DOTENV_PATH, create_app
+from shorty.metrics import MULTIPROC_DIR_ENV
+from shorty.shortlink.views import close_shorteners, shutdown_executors
+
+__all__ = (
+    'load_config',
+    'serve',
+    'ShortyApplication',
+)
+
+
+def load_config() -> Config:
+    """
+    Load the application config without creating the application.
+    """
+    load_dotenv(DOTENV_PATH)
+    config = Config(os.getcwd())
+    config.from_object(DEFAULT_CONFIG)
+    return config
+
+
+def worker_exit(_, __) -> None:
+    # Requests are completed by now, but hedged and batch provider calls may still be running.
+    shutdown_executors(wait=True)
+    close_shorteners()
+    tracing.stop()
+    log.stop_pipeline()
+
+
+def child_exit(_, worker) -> None:
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+class ShortyApplication(BaseApplication):
+    def __init__(self, options: Mapping[str, Any]):
+        """
+        Initialize `ShortyApplication`.
+
+        :param options: `gunicorn` settings. See https://docs.gunicorn.org/en/stable/settings.html for details.
+        """
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for name, value in {'worker_exit': worker_exit, 'child_exit': child_exit, **self.options}.items():
+            self.cfg.set(name, value)
+
+    def load(self) -> Flask:
+        # Called in each worker, so that no threads or connections are shared between processes.
+        return create_app()
+
+
+def serve(host: str, port: int, workers: int, threads: int, timeout: int, graceful_timeout: int, keepalive: int,
+          max_requests: int, max_requests_jitter: int) -> None:
+    """
+    Run the production server until it's stopped. See `AppConfig.SERVING` for the default settings.
+
+    :param host: Host to listen on.
+    :param port: Port to listen on.
+    :param workers: Number of worker processes.
+    :param threads: Number of request handling threads per worker.
+    :param timeout: Seconds after which a stuck worker is killed and restarted.
+    :param graceful_timeout: Seconds to complete in-flight requests for on shutdown or restart.
+    :param keepalive: Seconds to wait for the next request on a keep-alive connection.
+    :param max_requests: Number of requests after which a worker is restarted. Zero disables recycling.
+    :param max_requests_jitter: Max random number of requests added to `max_requests`, so that workers don't
+        restart all at once.
+    """
+    ShortyApplication({
+        'bind': f'{host}:{port}',
+        'worker_class': 'gthread',
+        'workers': workers,
+        'threads': threads,
+        'timeout': timeout,
+        'graceful_timeout': graceful_timeout,
+        'keepalive': keepalive,
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests_jitter,
+    }).run()
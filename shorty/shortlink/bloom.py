@@ -0,0 +1,46 @@
+import hashlib
+import math
+
+__all__ = (
+    'BloomFilter',
+)
+
+
+class BloomFilter:
+    """
+    Bloom filter of strings. May answer that a missing key is present (with `error_rate` probability
+    at `capacity` keys), but never answers that a present key is missing.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize `BloomFilter`.
+
+        :param capacity: Expected number of keys.
+        :param error_rate: Desired false positive rate at `capacity` keys.
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError('Bloom filter `capacity` must be positive and `error_rate` must be in (0, 1) range.')
+
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing: k positions from two independent 64-bit hashes.
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self._size for i in range(self._hash_count)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
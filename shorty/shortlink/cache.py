@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+__all__ = (
+    'ShortlinkCache',
+)
+
+
+class ShortlinkCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl: float | None = None):
+        """
+        Initialize `ShortlinkCache`.
+
+        :param max_entries: Max number of entries to keep. The least recently used entry is evicted on overflow.
+        :param ttl: Seconds after which an entry expires. `None` means entries never expire.
+        """
+        if max_entries <= 0:
+            raise ValueError('Cache `max_entries` must be positive.')
+
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[str, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, record_stats: bool = True) -> str | None:
+        """
+        Get a cached value by `key`.
+
+        :param key: Cache key.
+        :param record_stats: Whether to count this lookup in hit/miss counters.
+        :return: Cached value or `None` if there is no (fresh) value.
+        """
+        with self._lock:
+            try:
+                value, expires_at = self._entries[key]
+            except KeyError:
+                self.misses += record_stats
+                return None
+
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += record_stats
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += record_stats
+            return value
+
+    def set(self, key: Hashable, value: str) -> None:
+        expires_at = time.monotonic() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int | float | None]:
+        return {
+            'size': len(self._entries),
+            'max_entries': self._max_entries,
+            'ttl': self._ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
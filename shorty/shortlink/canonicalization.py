@@ -0,0 +1,96 @@
+import re
+from typing import Iterable
+from urllib.parse import urlsplit, urlunsplit
+
+__all__ = (
+    'DEFAULT_TRACKING_PARAMS',
+    'UrlCanonicalizer',
+)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# Query parameters which only tell where a visitor came from. Names ending with `*` are prefixes.
+DEFAULT_TRACKING_PARAMS = (
+    'utm_*', 'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', '_ga', '_hsenc', '_hsmi',
+)
+
+_PERCENT_ENCODED_RE = re.compile('%([0-9A-Fa-f]{2})')
+_UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+
+def _normalize_percent_encoded(match: re.Match) -> str:
+    char = chr(int(match.group(1), 16))
+    return char if char in _UNRESERVED else f'%{match.group(1).upper()}'
+
+
+class UrlCanonicalizer:
+    """
+    Rewrite urls pointing to the same resource to the same string, so that they share cache entries and provider calls.
+
+    `lowercase`, `default_port` and `percent_encoding` rules keep urls equivalent (see RFC 3986, section 6.2.2).
+    `sort_query` and `strip_tracking` don't, strictly speaking: they assume the target site doesn't depend on
+    the query parameters order and the tracking parameters.
+    """
+
+    def __init__(self, lowercase: bool = True, default_port: bool = True, percent_encoding: bool = True,
+                 sort_query: bool = False, strip_tracking: bool = False,
+                 tracking_params: Iterable[str] = DEFAULT_TRACKING_PARAMS):
+        """
+        Initialize `UrlCanonicalizer`.
+
+        :param lowercase: Lowercase scheme and host.
+        :param default_port: Remove the default port of the scheme (`80` for `http`, `443` for `https`).
+        :param percent_encoding: Uppercase percent-encoded octets and decode the ones of unreserved characters.
+        :param sort_query: Sort query parameters by name. The order of parameters with the same name is kept.
+        :param strip_tracking: Remove `tracking_params` query parameters.
+        :param tracking_params: Names of tracking query parameters. Names ending with `*` are prefixes.
+        """
+        self.lowercase = lowercase
+        self.default_port = default_port
+        self.percent_encoding = percent_encoding
+        self.sort_query = sort_query
+        self.strip_tracking = strip_tracking
+        self._tracking_names = frozenset(name for name in tracking_params if not name.endswith('*'))
+        self._tracking_prefixes = tuple(name[:-1] for name in tracking_params if name.endswith('*'))
+
+    def _is_tracking(self, param: str) -> bool:
+        name = param.split('=', 1)[0]
+        return name in self._tracking_names or name.startswith(self._tracking_prefixes)
+
+    def _canonical_netloc(self, scheme: str, netloc: str) -> str:
+        userinfo, at, hostport = netloc.rpartition('@')
+        host, colon, port = hostport.rpartition(':')
+        # A colon within brackets belongs to an IPv6 address rather than separates a port.
+        if not colon or ']' in port:
+            host, port = hostport, ''
+
+        if self.lowercase:
+            host = host.lower()
+        if self.default_port and port and port.isdigit() and int(port) == DEFAULT_PORTS.get(scheme.lower()):
+            port = ''
+
+        return f'{userinfo}{at}{host}{":" if port else ""}{port}'
+
+    def _canonical_query(self, query: str) -> str:
+        params = [param for param in query.split('&') if param]
+        if self.strip_tracking:
+            params = [param for param in params if not self._is_tracking(param)]
+        if self.sort_query:
+            params.sort(key=lambda param: param.split('=', 1)[0])
+
+        return '&'.join(params)
+
+    def canonicalize(self, url: str) -> str:
+        """
+        Return the canonical form of a given absolute `url`.
+        """
+        if self.percent_encoding and '%' in url:
+            url = _PERCENT_ENCODED_RE.sub(_normalize_percent_encoded, url)
+
+        scheme, netloc, path, query, fragment = urlsplit(url)
+        if self.lowercase:
+            scheme = scheme.lower()
+        netloc = self._canonical_netloc(scheme, netloc)
+        if query and (self.sort_query or self.strip_tracking):
+            query = self._canonical_query(query)
+
+        return urlunsplit((scheme, netloc, path, query, fragment))
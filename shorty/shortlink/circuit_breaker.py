@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+__all__ = (
+    'CircuitBreaker',
+    'CircuitState',
+)
+
+
+class CircuitState(str, Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker based on a failure rate within a sliding time window.
+
+    The circuit is `CLOSED` while calls succeed. Once at least `min_calls` calls were made within the last `window`
+    seconds and the rate of failed ones reaches `failure_rate_threshold`, the circuit becomes `OPEN` and no calls
+    are allowed for `open_duration` seconds. After that the circuit becomes `HALF_OPEN` and lets through up to
+    `half_open_max_calls` concurrent probe calls: a successful probe closes the circuit, a failed one opens it again.
+    """
+
+    def __init__(self, failure_rate_threshold: float = 0.5, window: float = 30.0, min_calls: int = 10,
+                 open_duration: float = 15.0, half_open_max_calls: int = 1):
+        """
+        Initialize `CircuitBreaker`.
+
+        :param failure_rate_threshold: Rate of failed calls (0..1] to open the circuit at.
+        :param window: Seconds of call history to compute the failure rate over.
+        :param min_calls: Min number of calls within the `window` to compute the failure rate.
+        :param open_duration: Seconds to keep the circuit open before probing.
+        :param half_open_max_calls: Max number of concurrent probe calls in the half-open state.
+        """
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError('Circuit breaker `failure_rate_threshold` must be in (0, 1] range.')
+
+        self._failure_rate_threshold = failure_rate_threshold
+        self._window = window
+        self._min_calls = max(min_calls, 1)
+        self._open_duration = open_duration
+        self._half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._calls: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> CircuitState:
+        if self._state is CircuitState.OPEN and now - self._opened_at >= self._open_duration:
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+
+        return self._state
+
+    def _prune(self, now: float) -> None:
+        while self._calls and self._calls[0][0] <= now - self._window:
+            _, succeeded = self._calls.popleft()
+            self._failures -= not succeeded
+
+    def _open(self, now: float) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._calls.clear()
+        self._failures = 0
+        self.times_opened += 1
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call is allowed now. Must be followed by `record_success`, `record_failure` or `release`
+        if allowed.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state is CircuitState.CLOSED:
+                return True
+            if state is CircuitState.HALF_OPEN and self._probes_in_flight < self._half_open_max_calls:
+                self._probes_in_flight += 1
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._current_state(now) is CircuitState.HALF_OPEN:
+                self._state = CircuitState.CLOSED
+                self._calls.clear()
+                self._failures = 0
+                return
+
+            self._calls.append((now, True))
+            self._prune(now)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state is CircuitState.HALF_OPEN:
+                self._open(now)
+                return
+            if state is CircuitState.OPEN:
+                return
+
+            self._calls.append((now, False))
+            self._failures += 1
+            self._prune(now)
+            calls = len(self._calls)
+            if calls >= self._min_calls and self._failures / calls >= self._failure_rate_threshold:
+                self._open(now)
+
+    def release(self) -> None:
+        """
+        Give back an allowed call whose outcome tells nothing about the provider health, e.g. cut by a deadline.
+        """
+        with self._lock:
+            if self._current_state(time.monotonic()) is CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+    def reset(self) -> None:
+        """
+        Close the circuit and forget the call history.
+        """
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._calls.clear()
+            self._failures = 0
+            self._probes_in_flight = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            return {
+                'state': self._current_state(now).value,
+                'calls_in_window': len(self._calls),
+                'failures_in_window': self._failures,
+                'rejected': self.rejected,
+                'times_opened': self.times_opened,
+            }
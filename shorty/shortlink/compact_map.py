@@ -0,0 +1,241 @@
+import struct
+import sys
+import threading
+from array import array
+
+__all__ = (
+    'CompactShortlinkMap',
+)
+
+# Provider id, long url origin id and directory id heading a key of `CompactShortlinkMap`.
+_KEY_HEAD = struct.Struct('<HII')
+
+
+def _split(url: bytes) -> tuple[bytes, bytes, bytes]:
+    """
+    Split `url` into the origin (scheme and host), the path directory (up to the last `/`) and the rest.
+    """
+    end = len(url)
+    for separator in b'?', b'#':
+        position = url.find(separator, 0, end)
+        if position >= 0:
+            end = position
+
+    scheme_end = url.find(b'://', 0, end)
+    path_start = url.find(b'/', scheme_end + 3 if scheme_end >= 0 else 0, end)
+    if path_start < 0:
+        return url[:end], b'', url[end:]
+
+    directory_end = url.rfind(b'/', path_start, end) + 1
+    return url[:path_start], url[path_start:directory_end], url[directory_end:]
+
+
+class _BytesTable:
+    """
+    Append-only set of byte strings numbered in the insertion order.
+
+    Strings are stored back to back in a single `bytearray` and indexed by an open addressing hash table of ids,
+    so that a string costs its length plus about 20 bytes instead of a Python object and a dict slot.
+    """
+
+    def __init__(self):
+        self._data = bytearray()
+        # End offset of each string; it starts at the end of the previous one.
+        self._ends = array('Q')
+        # Low 32 bits of string hashes, to skip comparing strings of other hashes.
+        self._hashes = array('I')
+        # Ids by `hash & mask` with linear probing, `-1` marks a free slot. Kept at most 2/3 full.
+        self._index = array('i', [-1]) * 8
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def _probe(self, value: bytes, hash_: int) -> tuple[int, int]:
+        """
+        Return the slot of `value` and its id, or the free slot to put it in and `-1`.
+        """
+        index, hashes, ends, mask = self._index, self._hashes, self._ends, len(self._index) - 1
+        short_hash = hash_ & 0xFFFFFFFF
+        slot = hash_ & mask
+        while (id_ := index[slot]) >= 0:
+            if hashes[id_] == short_hash and self._data[ends[id_ - 1] if id_ else 0:ends[id_]] == value:
+                return slot, id_
+            slot = (slot + 1) & mask
+
+        return slot, -1
+
+    def _grow(self) -> None:
+        index = array('i', [-1]) * (len(self._index) * 2)
+        mask = len(index) - 1
+        for id_, hash_ in enumerate(self._hashes):
+            # Enough bits of the hash for any index size below 2 ** 32 slots.
+            slot = hash_ & mask
+            while index[slot] >= 0:
+                slot = (slot + 1) & mask
+            index[slot] = id_
+
+        self._index = index
+
+    def find(self, value: bytes) -> int:
+        """
+        Return the id of `value`, `-1` if there is no such string.
+        """
+        return self._probe(value, hash(value))[1]
+
+    def add(self, value: bytes) -> int:
+        """
+        Add `value` unless it's already there and return its id.
+        """
+        hash_ = hash(value)
+        slot, id_ = self._probe(value, hash_)
+        if id_ >= 0:
+            return id_
+
+        id_ = len(self._ends)
+        self._data += value
+        self._ends.append(len(self._data))
+        self._hashes.append(hash_ & 0xFFFFFFFF)
+        self._index[slot] = id_
+        if 3 * len(self._ends) > 2 * len(self._index):
+            self._grow()
+
+        return id_
+
+    def get(self, id_: int) -> bytes:
+        return bytes(self._data[self._ends[id_ - 1] if id_ else 0:self._ends[id_]])
+
+    def nbytes(self) -> int:
+        return sum(sys.getsizeof(part) for part in (self._data, self._ends, self._hashes, self._index))
+
+
+class CompactShortlinkMap:
+    """
+    Thread-safe in-memory `(provider, long url) -> short link` map for tens of millions of entries.
+
+    Entries are packed into a few `array`s and `bytearray`s instead of Python objects: long urls share interned
+    origins and path directories, and short links share interned domains (e.g. `https://bit.ly/`). This takes
+    several times less memory than a `dict`, but entries can't be removed one by one: once `max_entries` are kept,
+    new ones are rejected. Has the `ShortlinkCache` interface, so it can be used by `CachingShortener`.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize `CompactShortlinkMap`.
+
+        :param max_entries: Max number of entries to keep. Entries beyond it are not stored.
+        """
+        if max_entries <= 0:
+            raise ValueError('Map `max_entries` must be positive.')
+
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._providers: dict[str, int] = {}
+        self._origins = _BytesTable()
+        self._directories = _BytesTable()
+        # Entry keys: `_KEY_HEAD` followed by the rest of the long url. Key ids are entry ids.
+        self._keys = _BytesTable()
+        self._domains = _BytesTable()
+        # Short link of each entry: domain id and the rest of the link, stored back to back in `_links`.
+        self._link_domains = array('I')
+        self._link_ends = array('Q')
+        self._links = bytearray()
+        # Links which have replaced the stored ones. Links of an entry are hardly ever replaced.
+        self._replaced_links: dict[int, str] = {}
+
+    def _find(self, provider: str, long_url: bytes) -> int:
+        provider_id = self._providers.get(provider)
+        if provider_id is None:
+            return -1
+
+        origin, directory, rest = _split(long_url)
+        origin_id = self._origins.find(origin)
+        directory_id = self._directories.find(directory)
+        if origin_id < 0 or directory_id < 0:
+            return -1
+
+        return self._keys.find(_KEY_HEAD.pack(provider_id, origin_id, directory_id) + rest)
+
+    def _link(self, id_: int) -> str:
+        if self._replaced_links and id_ in self._replaced_links:
+            return self._replaced_links[id_]
+
+        ends = self._link_ends
+        rest = self._links[ends[id_ - 1] if id_ else 0:ends[id_]]
+        return (self._domains.get(self._link_domains[id_]) + rest).decode()
+
+    def _add_link(self, short_link: str) -> None:
+        link = short_link.encode()
+        position = link.rfind(b'/') + 1
+        self._link_domains.append(self._domains.add(link[:position]))
+        self._links += link[position:]
+        self._link_ends.append(len(self._links))
+
+    def get(self, key: tuple[str, str], record_stats: bool = True) -> str | None:
+        """
+        Get a short link by `(provider, long url)` key.
+
+        :param key: Shortening provider name and long url.
+        :param record_stats: Whether to count this lookup in hit/miss counters.
+        :return: Short link or `None` if there is no entry.
+        """
+        provider, long_url = key
+        with self._lock:
+            id_ = self._find(provider, long_url.encode())
+            if id_ < 0:
+                self.misses += record_stats
+                return None
+
+            self.hits += record_stats
+            return self._link(id_)
+
+    def set(self, key: tuple[str, str], value: str) -> None:
+        provider, long_url = key
+        long_url = long_url.encode()
+        with self._lock:
+            id_ = self._find(provider, long_url)
+            if id_ >= 0:
+                if self._link(id_) != value:
+                    self._replaced_links[id_] = value
+                return
+
+            if len(self._keys) >= self._max_entries:
+                self.rejected += 1
+                return
+
+            provider_id = self._providers.setdefault(provider, len(self._providers))
+            origin, directory, rest = _split(long_url)
+            self._keys.add(
+                _KEY_HEAD.pack(provider_id, self._origins.add(origin), self._directories.add(directory)) + rest,
+            )
+            self._add_link(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def __len__(self) -> int:
+        return len(self._link_ends)
+
+    def nbytes(self) -> int:
+        """
+        Return the number of bytes allocated for the entries.
+        """
+        arrays = (self._link_domains, self._link_ends, self._links, self._replaced_links)
+        tables = (self._origins, self._directories, self._keys, self._domains)
+        return sum(sys.getsizeof(part) for part in arrays) + sum(table.nbytes() for table in tables)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'size': len(self),
+            'max_entries': self._max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'rejected': self.rejected,
+            'bytes': self.nbytes(),
+        }
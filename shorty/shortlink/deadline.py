@@ -0,0 +1,62 @@
+import contextlib
+import contextvars
+import time
+from typing import Iterator
+
+__all__ = (
+    'clamp',
+    'expired',
+    'remaining',
+    'scope',
+)
+
+# `time.monotonic` value by which the current request must be done, if any.
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar('deadline', default=None)
+
+
+def remaining() -> float | None:
+    """
+    Return seconds left until the current deadline, `None` if there is no deadline. Negative once it's passed.
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def clamp(timeout: float | None) -> float | None:
+    """
+    Limit a given `timeout` by the time left until the current deadline.
+
+    :param timeout: Timeout in seconds. `None` means no timeout.
+    """
+    budget = remaining()
+    if budget is None:
+        return timeout
+
+    budget = max(budget, 0.0)
+    return budget if timeout is None else min(timeout, budget)
+
+
+@contextlib.contextmanager
+def scope(seconds: float | None) -> Iterator[None]:
+    """
+    Set a deadline `seconds` from now for the enclosed block. An enclosing earlier deadline is kept.
+    Code run on other threads sees the deadline only if it's run in a copy of the current context.
+
+    :param seconds: Time budget of the block. `None` means no budget of its own.
+    """
+    if seconds is None:
+        yield
+        return
+
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
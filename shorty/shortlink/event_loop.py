@@ -0,0 +1,62 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, TypeVar
+
+__all__ = (
+    'EventLoopThread',
+)
+
+T = TypeVar('T')
+
+
+async def _run_in_context(coroutine: Coroutine[None, None, T], context: contextvars.Context) -> T:
+    # Tasks run in a copy of the loop thread context, so the submitter's variables (e.g. the deadline) are set on it.
+    for variable, value in context.items():
+        variable.set(value)
+
+    return await coroutine
+
+
+class EventLoopThread:
+    """
+    Long-lived event loop running in a daemon thread of its own. Coroutines are submitted to it by other threads,
+    so that resources bound to the loop (e.g. `httpx.AsyncClient` connection pools) outlive a single request.
+    """
+
+    def __init__(self, name: str = 'event-loop'):
+        """
+        Initialize `EventLoopThread` and start its thread.
+
+        :param name: Thread name.
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, coroutine: Coroutine[None, None, T]) -> Future[T]:
+        """
+        Schedule `coroutine` to run on the loop in a copy of the current context.
+
+        :return: Future of the `coroutine` outcome. Coroutines may await it with `asyncio.wrap_future`.
+        """
+        return asyncio.run_coroutine_threadsafe(_run_in_context(coroutine, contextvars.copy_context()), self._loop)
+
+    def run(self, coroutine: Coroutine[None, None, T]) -> T:
+        """
+        Run `coroutine` on the loop in a copy of the current context and wait for its outcome.
+        """
+        return self.submit(coroutine).result()
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """
+        Stop the loop and its thread. Coroutines still running on the loop are abandoned.
+        """
+        if self._loop.is_closed():
+            return
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
@@ -0,0 +1,67 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Callable, Iterable, TypeVar
+
+__all__ = (
+    'hedged_call',
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def hedged_call(executor: Executor, calls: Iterable[Callable[[], T]], hedge_delay: float) -> T:
+    """
+    Run `calls` on `executor` and return the result of the first call that succeeds.
+
+    The first call starts immediately. Every next call starts once `hedge_delay` seconds pass without any result,
+    or as soon as a running call fails. Calls left pending after a result is obtained are cancelled if not yet
+    started, and ignored otherwise. With `hedge_delay` of zero all calls are raced at once.
+
+    :param executor: Executor to run calls on.
+    :param calls: Calls to try, in preference order.
+    :param hedge_delay: Seconds to wait for a result before starting the next call.
+    :raises: Exception: The exception of the last failed call if all of them failed.
+    :return: The result of the first successful call.
+    """
+    calls = list(calls)
+    pending: set[Future] = set()
+    started = 0
+    last_exception: Exception | None = None
+
+    def start_next() -> bool:
+        nonlocal started
+        if started == len(calls):
+            return False
+
+        pending.add(executor.submit(calls[started]))
+        started += 1
+        return True
+
+    start_next()
+    if hedge_delay <= 0:
+        while start_next():
+            pass
+
+    while pending:
+        has_next = started < len(calls)
+        done, _ = wait(pending, timeout=hedge_delay if has_next else None, return_when=FIRST_COMPLETED)
+        pending.difference_update(done)
+
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                last_exception = e
+            else:
+                for loser in pending:
+                    loser.cancel()
+                return result
+
+        # Either nothing has completed within the hedge delay or a call has failed, so hedge with the next one.
+        if has_next:
+            logger.debug('Starting hedged call %s of %s', started + 1, len(calls))
+            start_next()
+
+    raise last_exception
@@ -0,0 +1,316 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Mapping, Sequence
+
+__all__ = (
+    'JobQueue',
+    'JobQueueFull',
+    'MemoryJobStore',
+    'SqliteJobStore',
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+DONE = 'done'
+DEFAULT_PENDING_TTL_SECONDS = 24 * 60 * 60.0
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at);
+CREATE INDEX IF NOT EXISTS jobs_pending_created_at ON jobs (created_at) WHERE finished_at IS NULL;
+'''
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+def _job(job_id: str, total: int, completed: int, items: list[dict]) -> dict:
+    return {
+        'id': job_id,
+        'status': DONE if completed == total else PENDING,
+        'total': total,
+        'completed': completed,
+        'items': items,
+    }
+
+
+class _Job:
+    __slots__ = ('items', 'completed', 'created_at', 'finished_at')
+
+    def __init__(self, items: list[dict], pending: int):
+        self.items = items
+        self.completed = len(items) - pending
+        self.created_at = time.monotonic()
+        self.finished_at = None if pending else self.created_at
+
+
+class MemoryJobStore:
+    """
+    Thread-safe in-memory job store. Jobs are visible only to the process which has submitted them.
+    """
+
+    def __init__(self, ttl: float = 3600.0, pending_ttl: float = DEFAULT_PENDING_TTL_SECONDS):
+        """
+        Initialize `MemoryJobStore`.
+
+        :param ttl: Seconds to keep finished jobs for.
+        :param pending_ttl: Seconds to keep unfinished jobs for since their creation.
+        """
+        self._ttl = ttl
+        self._pending_ttl = pending_ttl
+        self._jobs: dict[str, _Job] = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, job: _Job, now: float) -> bool:
+        if job.finished_at is None:
+            return now - job.created_at >= self._pending_ttl
+
+        return now - job.finished_at >= self._ttl
+
+    def _purge(self, now: float) -> None:
+        expired = [job_id for job_id, job in self._jobs.items() if self._expired(job, now)]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def create(self, job_id: str, items: Sequence[dict], pending: int) -> None:
+        """
+        Store a new job.
+
+        :param job_id: Job id.
+        :param items: Initial item records, in order.
+        :param pending: Number of items which records are yet to be set with `set_item`.
+        """
+        with self._lock:
+            self._purge(time.monotonic())
+            self._jobs[job_id] = _Job(list(items), pending)
+
+    def set_item(self, job_id: str, position: int, item: dict) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                # The job has expired before its items have been shortened.
+                return
+
+            job.items[position] = item
+            job.completed += 1
+            if job.completed == len(job.items):
+                job.finished_at = time.monotonic()
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or self._expired(job, time.monotonic()):
+                return None
+
+            return _job(job_id, len(job.items), job.completed, list(job.items))
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteJobStore:
+    """
+    Job store on top of SQLite. The database may be shared by several processes, so that any of them can report
+    jobs submitted to another one.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0, pending_ttl: float = DEFAULT_PENDING_TTL_SECONDS,
+                 busy_timeout: float = 5.0):
+        """
+        Initialize `SqliteJobStore`.
+
+        :param path: SQLite database file path.
+        :param ttl: Seconds to keep finished jobs for.
+        :param pending_ttl: Seconds to keep unfinished jobs for since their creation, e.g. jobs orphaned by a process
+            which has exited before shortening their items.
+        :param busy_timeout: Seconds to wait for a database lock held by another process.
+        """
+        self._path = path
+        self._ttl = ttl
+        self._pending_ttl = pending_ttl
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        self._connection.executescript(SCHEMA)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections can't be used concurrently, so there is a connection per thread.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._busy_timeout, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('PRAGMA foreign_keys=ON')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection
+
+    def create(self, job_id: str, items: Sequence[dict], pending: int) -> None:
+        """
+        Store a new job. See `MemoryJobStore.create`.
+        """
+        # Wall clock time, as monotonic clocks of different processes aren't guaranteed to match.
+        now = time.time()
+        with self._connection as connection:
+            connection.execute('DELETE FROM jobs WHERE finished_at <= ?', (now - self._ttl,))
+            connection.execute(
+                'DELETE FROM jobs WHERE finished_at IS NULL AND created_at <= ?', (now - self._pending_ttl,),
+            )
+            connection.execute(
+                'INSERT INTO jobs (id, created_at, finished_at, total, completed) VALUES (?, ?, ?, ?, ?)',
+                (job_id, now, None if pending else now, len(items), len(items) - pending),
+            )
+            connection.executemany(
+                'INSERT INTO job_items (job_id, position, item) VALUES (?, ?, ?)',
+                ((job_id, position, json.dumps(item)) for position, item in enumerate(items)),
+            )
+
+    def set_item(self, job_id: str, position: int, item: dict) -> None:
+        with self._connection as connection:
+            connection.execute(
+                'UPDATE job_items SET item = ? WHERE job_id = ? AND position = ?', (json.dumps(item), job_id, position),
+            )
+            connection.execute(
+                'UPDATE jobs SET completed = completed + 1, '
+                'finished_at = CASE WHEN completed + 1 = total THEN ? END WHERE id = ?',
+                (time.time(), job_id),
+            )
+
+    def get(self, job_id: str) -> dict | None:
+        connection = self._connection
+        row = connection.execute(
+            'SELECT total, completed, created_at, finished_at FROM jobs WHERE id = ?', (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        total, completed, created_at, finished_at = row
+        now = time.time()
+        if now - created_at >= self._pending_ttl if finished_at is None else now - finished_at >= self._ttl:
+            return None
+
+        items = connection.execute(
+            'SELECT item FROM job_items WHERE job_id = ? ORDER BY position', (job_id,),
+        ).fetchall()
+        return _job(job_id, total, completed, [json.loads(item) for item, in items])
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class JobQueue:
+    """
+    Bounded queue of shortening jobs drained by a background worker pool.
+    """
+
+    def __init__(self, store: MemoryJobStore | SqliteJobStore, max_workers: int = 4, max_queued_items: int = 10_000):
+        """
+        Initialize `JobQueue`.
+
+        :param store: Store to keep jobs and their results in.
+        :param max_workers: Number of worker threads. Limits the number of concurrent provider calls of jobs.
+        :param max_queued_items: Max number of job items waiting for or being processed by the workers.
+        """
+        self.store = store
+        self._max_queued_items = max_queued_items
+        # Worker threads are started on demand, so that there are none unless jobs are submitted.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='shortlinks-jobs')
+        self._lock = threading.Lock()
+        self._queued = 0
+        self.submitted = 0
+        self.rejected = 0
+
+    def submit(self, items: Sequence[dict], tasks: Mapping[int, Callable[[], dict]]) -> str:
+        """
+        Submit a job.
+
+        :param items: Initial item records of the job, in order.
+        :param tasks: Functions computing records of items by their positions. They are run by the workers.
+        :raises: JobQueueFull: If there is no room for all `tasks` in the queue.
+        :return: Job id.
+        """
+        with self._lock:
+            if self._queued + len(tasks) > self._max_queued_items:
+                self.rejected += 1
+                raise JobQueueFull(f'No room for {len(tasks)} more items in the job queue')
+            self._queued += len(tasks)
+            self.submitted += 1
+
+        job_id = uuid.uuid4().hex
+        try:
+            self.store.create(job_id, items, pending=len(tasks))
+        except Exception:
+            with self._lock:
+                self._queued -= len(tasks)
+            raise
+
+        for position, task in tasks.items():
+            self._executor.submit(self._run, job_id, position, task)
+
+        return job_id
+
+    def _run(self, job_id: str, position: int, task: Callable[[], dict]) -> None:
+        try:
+            item = task()
+        except Exception:
+            logger.exception('An error occurred during job %s item %s processing', job_id, position)
+            item = {'error': {'name': 'Internal Server Error', 'description': None}}
+
+        try:
+            self.store.set_item(job_id, position, item)
+        finally:
+            with self._lock:
+                self._queued -= 1
+
+    def get(self, job_id: str) -> dict | None:
+        """
+        Return a job with its item records, `None` if there is no such job or it has expired.
+        """
+        return self.store.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers.
+
+        :param wait: Whether to wait for the queued items to be processed.
+        """
+        self._executor.shutdown(wait=wait)
+
+    def close(self) -> None:
+        self.store.close()
+
+    def stats(self) -> dict:
+        return {
+            'queued_items': self._queued,
+            'max_queued_items': self._max_queued_items,
+            'submitted': self.submitted,
+            'rejected': self.rejected,
+        }
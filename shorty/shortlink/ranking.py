@@ -0,0 +1,92 @@
+import random
+import threading
+from dataclasses import dataclass
+from typing import Hashable, Iterable, TypeVar
+
+__all__ = (
+    'ProviderRanking',
+)
+
+K = TypeVar('K', bound=Hashable)
+
+# Lower bound of success rate used for scoring, so failing providers still get a finite score.
+MIN_SUCCESS_RATE = 0.01
+
+
+@dataclass
+class ProviderStats:
+    latency: float = 0.0  # EWMA of call latency in seconds
+    success_rate: float = 1.0  # EWMA of call success (1 - succeeded, 0 - failed)
+    calls: int = 0
+
+    @property
+    def score(self) -> float:
+        """
+        Expected time to get a short link from the provider. The lower, the better.
+        """
+        return self.latency / max(self.success_rate, MIN_SUCCESS_RATE)
+
+
+class ProviderRanking:
+    """
+    Thread-safe ranking of shortening providers by EWMA latency and success rate of their calls.
+    """
+
+    def __init__(self, alpha: float = 0.2, exploration_rate: float = 0.05, min_success_rate: float = 0.5):
+        """
+        Initialize `ProviderRanking`.
+
+        :param alpha: EWMA smoothing factor in (0, 1]. The higher, the faster old calls are forgotten.
+        :param min_success_rate: Success rate below which a provider is unhealthy and goes after all healthy ones,
+            however fast it fails.
+        :param exploration_rate: Probability of moving a random non-best provider to the front of the order,
+            so a recovered provider gets a chance to win back the first place.
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError('Ranking `alpha` must be in (0, 1] range.')
+
+        self._alpha = alpha
+        self._exploration_rate = exploration_rate
+        self._min_success_rate = min_success_rate
+        self._stats: dict[Hashable, ProviderStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: Hashable, latency: float, succeeded: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(provider)
+            if stats is None:
+                self._stats[provider] = ProviderStats(latency=latency, success_rate=float(succeeded), calls=1)
+                return
+
+            stats.latency += self._alpha * (latency - stats.latency)
+            stats.success_rate += self._alpha * (succeeded - stats.success_rate)
+            stats.calls += 1
+
+    def _sort_key(self, provider: Hashable) -> tuple[bool, float]:
+        stats = self._stats.get(provider)
+        if stats is None:
+            return False, 0.0
+
+        return stats.success_rate < self._min_success_rate, stats.score
+
+    def order(self, providers: Iterable[K]) -> list[K]:
+        """
+        Order `providers` from the best to the worst one. Providers without calls keep their relative order
+        and go first, so they get measured. Unhealthy providers go last.
+        """
+        with self._lock:
+            ordered = sorted(providers, key=self._sort_key)
+
+        if len(ordered) > 1 and random.random() < self._exploration_rate:
+            ordered.insert(0, ordered.pop(random.randrange(1, len(ordered))))
+
+        return ordered
+
+    def stats(self, provider: Hashable) -> dict:
+        with self._lock:
+            stats = self._stats.get(provider, ProviderStats())
+            return {
+                'latency': stats.latency,
+                'success_rate': stats.success_rate,
+                'calls': stats.calls,
+            }
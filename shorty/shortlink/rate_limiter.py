@@ -0,0 +1,167 @@
+import sqlite3
+import threading
+import time
+
+__all__ = (
+    'SqliteTokenBucket',
+    'TokenBucket',
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS token_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+'''
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    The bucket holds up to `burst` tokens and is refilled with `rate` tokens per second. Every call takes a token,
+    waiting for one to be refilled for up to a given timeout.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        """
+        Initialize `TokenBucket`.
+
+        :param rate: Tokens refilled per second, i.e. the sustained number of calls per second.
+        :param burst: Bucket capacity, i.e. the max number of calls at once after a quiet period. Defaults to `rate`.
+        """
+        if rate <= 0:
+            raise ValueError('Token bucket `rate` must be positive.')
+
+        self._rate = rate
+        self._burst = max(burst if burst is not None else int(rate), 1)
+        self._tokens = float(self._burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.delayed = 0
+        self.rejected = 0
+
+    def _take(self) -> float:
+        """
+        Take a token if there is one.
+
+        :return: Zero if a token has been taken, otherwise seconds until the next token is refilled.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self._rate
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """
+        Take a token, waiting for it for up to `timeout` seconds.
+
+        :return: Whether a token has been taken. Gives up without waiting if no token is due within `timeout`.
+        """
+        deadline = time.monotonic() + timeout
+        delayed = False
+        while wait := self._take():
+            if wait > deadline - time.monotonic():
+                self.rejected += 1
+                return False
+
+            delayed = True
+            time.sleep(wait)
+
+        self.acquired += 1
+        self.delayed += delayed
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {
+            'rate': self._rate,
+            'burst': self._burst,
+            'acquired': self.acquired,
+            'delayed': self.delayed,
+            'rejected': self.rejected,
+        }
+
+
+class SqliteTokenBucket(TokenBucket):
+    """
+    `TokenBucket` which state is stored in SQLite, so that the `rate` is shared by all processes using
+    the same database file and `key`.
+    """
+
+    def __init__(self, path: str, key: str, rate: float, burst: int | None = None, busy_timeout: float = 5.0):
+        """
+        Initialize `SqliteTokenBucket`.
+
+        :param path: SQLite database file path.
+        :param key: Bucket name, e.g. a shortening provider name.
+        :param rate: Tokens refilled per second, i.e. the sustained number of calls per second.
+        :param burst: Bucket capacity, i.e. the max number of calls at once after a quiet period. Defaults to `rate`.
+        :param busy_timeout: Seconds to wait for a database lock held by another process.
+        """
+        super().__init__(rate, burst)
+        self._path = path
+        self._key = key
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+
+        self._connection.execute(SCHEMA)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections can't be used concurrently, so there is a connection per thread.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Transactions are managed explicitly to take the write lock before reading the bucket state.
+            connection = sqlite3.connect(
+                self._path, timeout=self._busy_timeout, isolation_level=None, check_same_thread=False,
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection
+
+    def _take(self) -> float:
+        connection = self._connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            # Wall clock time, as monotonic clocks of different processes aren't guaranteed to match.
+            now = time.time()
+            row = connection.execute(
+                'SELECT tokens, updated_at FROM token_buckets WHERE key = ?', (self._key,),
+            ).fetchone()
+            tokens = self._burst if row is None else min(self._burst, row[0] + max(now - row[1], 0) * self._rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self._rate
+            if not wait:
+                tokens -= 1
+
+            connection.execute(
+                'INSERT OR REPLACE INTO token_buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                (self._key, tokens, now),
+            )
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+        connection.execute('COMMIT')
+        return wait
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -1,11 +1,24 @@
-from typing import Iterable
+import json
+import re
+from typing import Any, Iterable, Mapping
 
-from pydantic import BaseModel, HttpUrl, validator, errors
+from pydantic import AnyHttpUrl, BaseModel, HttpUrl, validator, errors
 
 __all__ = (
     'ShortlinksRequest',
     'ShortlinksResponse',
+    'dump_shortlinks_response',
     'init_schemas',
+    'is_plain_http_url',
+    'parse_shortlinks_request',
+)
+
+# A subset of urls `HttpUrl` accepts as is: lower case http(s) scheme, ASCII domain name host with a top level domain,
+# no credentials and no port. Anything else may still be valid, but has to be validated by `pydantic`.
+_PLAIN_HTTP_URL_RE = re.compile(
+    r'https?://'
+    r'(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,63}'
+    r'(?:/[^\s?#]*)?(?:\?[^\s#]*)?(?:#[^\s#]*)?'
 )
 
 
@@ -39,7 +52,37 @@ class ShortlinksRequest(BaseModel):
 
 class ShortlinksResponse(BaseModel):
     url: HttpUrl  # Original long url
-    link: HttpUrl  # Short link
+    link: AnyHttpUrl  # Short link. Top level domain isn't required, e.g. for `local` provider links
+
+
+def is_plain_http_url(value: Any) -> bool:
+    """
+    Check whether a given `value` is an url `HttpUrl` would accept unchanged, without running `pydantic` validation.
+    `False` doesn't mean the url is invalid, only that it needs the full validation.
+    """
+    return type(value) is str and len(value) <= HttpUrl.max_length and _PLAIN_HTTP_URL_RE.fullmatch(value) is not None
+
+
+def parse_shortlinks_request(data: Mapping) -> ShortlinksRequest:
+    """
+    The same as `ShortlinksRequest(**data)`, but requests with plain urls and allowed providers skip
+    `pydantic` validation. Any other request, including invalid ones, is validated by `pydantic` as usual,
+    so validation errors are the same.
+    """
+    allowed_providers = ShortlinksRequest.__allowed_providers__
+    url, provider = data.get('url'), data.get('provider')
+    if allowed_providers and (provider is None or provider in allowed_providers) and is_plain_http_url(url):
+        return ShortlinksRequest.construct(url=url, provider=provider)
+
+    return ShortlinksRequest(**data)
+
+
+def dump_shortlinks_response(url: str, link: str) -> bytes:
+    """
+    Serialize `ShortlinksResponse` JSON directly, for already validated `url` and a `link` made by a trusted
+    shortening provider.
+    """
+    return json.dumps({'url': url, 'link': link}, separators=(',', ':')).encode()
 
 
 def init_schemas(provider_names: Iterable[str]) -> None:
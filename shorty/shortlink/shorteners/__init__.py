@@ -1,4 +1,31 @@
+from .async_shortener import AsyncShortener
 from .bitly_shortener import BitlyShortener
+from .caching_shortener import CachingShortener
+from .canonicalizing_shortener import CanonicalizingShortener
+from .circuit_breaker_shortener import CircuitBreakerShortener
+from .event_loop_shortener import EventLoopShortener
+from .lazy_shortener import LazyShortener
+from .local_shortener import LocalShortener
+from .metrics_shortener import MetricsShortener
+from .persistent_shortener import PersistentShortener
+from .rate_limited_shortener import RateLimitedShortener
 from .request_based_shortener import RequestBasedShortener
 from .shortener import Shortener
+from .single_flight_shortener import SingleFlightShortener
 from .tinyurl_shortener import TinyurlShortener
+from .wrapped_shortener import WrappedShortener, iter_layers
+
+# `httpx` based shorteners are imported on first access, so that `httpx` isn't imported unless it's used.
+_LAZY_IMPORTS = {
+    'AsyncBitlyShortener': '.async_bitly_shortener',
+    'AsyncRequestBasedShortener': '.async_request_based_shortener',
+    'AsyncTinyurlShortener': '.async_tinyurl_shortener',
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,50 @@
+import httpx
+
+from shorty import utils
+from shorty.shortlink.shorteners.async_request_based_shortener import AsyncRequestBasedShortener
+from shorty.shortlink.shorteners.bitly_shortener import BitlyShortener
+from shorty.shortlink.shorteners.request_based_shortener import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRY_BACKOFF_SECONDS,
+    request_timeout,
+)
+
+__all__ = (
+    'AsyncBitlyShortener',
+)
+
+
+class AsyncBitlyShortener(AsyncRequestBasedShortener):
+    shorten_endpoint = BitlyShortener.shorten_endpoint
+
+    # Request data and response formats are the same as for the blocking shortener.
+    prepare_request_data = BitlyShortener.prepare_request_data
+    short_link_from_response = BitlyShortener.short_link_from_response
+
+    def __init__(self, provider_url: str, api_key: str,
+                 domain: str | None = None, group_guid: str | None = None, timeout: float | None = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, idle_timeout: float | None = None,
+                 max_retries: int = 0, retry_backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS):
+        """
+        Initialize `AsyncBitlyShortener`. See `BitlyShortener` for parameters description.
+        """
+        super().__init__(
+            pool_size=pool_size, keep_alive=keep_alive, idle_timeout=idle_timeout,
+            max_retries=max_retries, retry_backoff=retry_backoff,
+        )
+        self._provider_url = provider_url
+        self._domain = domain
+        self._group_guid = group_guid
+        self._timeout = timeout
+        self._headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json',
+        }
+
+    async def make_shorten_request(self, request_data: dict) -> httpx.Response:
+        return await self.client.post(
+            utils.urljoin(self._provider_url, self.shorten_endpoint),
+            json=request_data,
+            headers=self._headers,
+            timeout=request_timeout(self._timeout),
+        )
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import random
+import weakref
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+
+import httpx
+
+from shorty import tracing
+from shorty.shortlink import deadline
+from shorty.shortlink.rate_limiter import TokenBucket
+from shorty.shortlink.shorteners import exceptions
+from shorty.shortlink.shorteners.async_shortener import AsyncShortener
+from shorty.shortlink.shorteners.request_based_shortener import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRY_BACKOFF_SECONDS,
+    RETRY_STATUSES,
+)
+
+__all__ = (
+    'AsyncRequestBasedShortener',
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _inject_traceparent(request: httpx.Request) -> None:
+    # Pass the trace of the request being served on to the shortening provider.
+    if (traceparent := tracing.traceparent()) is not None:
+        request.headers[tracing.HEADER] = traceparent
+
+
+class AsyncRequestBasedShortener(AsyncShortener, ABC):
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, idle_timeout: float | None = None,
+                 max_retries: int = 0, retry_backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS):
+        """
+        Initialize `AsyncRequestBasedShortener`.
+
+        :param pool_size: Max number of connections to keep in the shortening provider connection pool.
+        :param keep_alive: Whether to reuse connections to the shortening provider between requests.
+        :param idle_timeout: Seconds after which an idle connection is closed. `None` means never.
+        :param max_retries: Max number of retries of transient 5xx responses.
+        :param retry_backoff: Base of the jittered exponential backoff between retries, in seconds.
+            See `RequestBasedShortener` for details.
+        """
+        # See `RequestBasedShortener.retry_token_bucket`.
+        self.retry_token_bucket: TokenBucket | None = None
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._idle_timeout = idle_timeout
+        # `httpx.AsyncClient` is bound to the event loop it's been used in, so there is a client per loop.
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def create_client(self) -> httpx.AsyncClient:
+        """
+        Create a new `httpx.AsyncClient` with a connection pool sized for this shortener.
+        """
+        limits = httpx.Limits(
+            max_connections=self._pool_size,
+            max_keepalive_connections=self._pool_size if self._keep_alive else 0,
+            keepalive_expiry=self._idle_timeout,
+        )
+
+        return httpx.AsyncClient(limits=limits, event_hooks={'request': [_inject_traceparent]})
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Pooled client to make shortening provider requests with in the running event loop. Created on first use.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = self.create_client()
+
+        return client
+
+    async def close(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    @abstractmethod
+    def prepare_request_data(self, long_url: str) -> dict:
+        """
+        Prepare request data for future shortening provider request.
+
+        :param long_url: Long url to shorten.
+        :return: Data that will be used to make shortening provider request.
+        """
+        pass
+
+    @abstractmethod
+    async def make_shorten_request(self, request_data: dict) -> httpx.Response:
+        """
+        Request shortening provider using a given `request_data` and return its response.
+
+        :param request_data: Data to make shortening provider request.
+        :return: Shortening provider response.
+        """
+        pass
+
+    @abstractmethod
+    def short_link_from_response(self, response: httpx.Response) -> str:
+        """
+        Retrieve a short link from a given shortening provider `response`.
+
+        :param response: Shortening provider response.
+        :return: Short url.
+        """
+        pass
+
+    async def _request(self, request_data: dict) -> httpx.Response:
+        if deadline.expired():
+            raise exceptions.DeadlineExceeded('No time left until the request deadline')
+
+        with tracing.span('provider_request', shortener=self.__class__.__name__) as span:
+            try:
+                response = await self.make_shorten_request(request_data=request_data)
+            except httpx.TimeoutException as e:
+                # The timeout may have been cut short by the request deadline rather than by the provider.
+                if deadline.expired():
+                    raise exceptions.DeadlineExceeded('No time left until the request deadline') from e
+                raise exceptions.ShorteningProviderTimeout from e
+            except httpx.HTTPError as e:
+                raise exceptions.ShorteningProviderRequestException from e
+
+            if span is not None:
+                span.set('http.status_code', response.status_code)
+            return response
+
+    async def shorten(self, long_url: str) -> str:
+        """
+        Shorten a given `long_url` using a specific shortening provider.
+
+        :param long_url: Long url to shorten.
+        :raises: exceptions.ShorteningProviderTimeout: If timeout error occurred during shortening provider request.
+        :raises: exceptions.DeadlineExceeded: If there is no time left until the request deadline.
+        :raises: exceptions.ShorteningProviderRequestException: If some other error occurred during request.
+        :raises: exceptions.ShorteningProviderRateLimited: If provider rejected the request due to its rate limit.
+        :raises: exceptions.InvalidShorteningProviderResponse: If provider request returned invalid response.
+        :return: Short url pointing to a given `long_url`.
+        """
+        data = self.prepare_request_data(long_url=long_url)
+        logger.debug('%s. Prepared request data: %s', self.__class__.__name__, data)
+
+        attempt = 0
+        while True:
+            response = await self._request(data)
+            if response.status_code not in RETRY_STATUSES or attempt >= self._max_retries:
+                break
+
+            backoff = random.uniform(0, self._retry_backoff * 2 ** attempt)
+            budget = deadline.remaining()
+            if budget is not None and backoff >= budget:
+                break
+
+            await asyncio.sleep(backoff)
+            if self.retry_token_bucket is not None and not self.retry_token_bucket.acquire():
+                logger.info(
+                    '%s. Rate limit does not allow retrying %s response', self.__class__.__name__, response.status_code,
+                )
+                break
+
+            attempt += 1
+            logger.info(
+                '%s. Retrying %s response after %.3fs (attempt %s)',
+                self.__class__.__name__, response.status_code, backoff, attempt,
+            )
+
+        logger.info('%s. Received response from provider', self.__class__.__name__)
+        logger.debug('%s. Provider response status code: %s', self.__class__.__name__, response.status_code)
+        logger.debug('%s. Provider response status content: %s', self.__class__.__name__, response.content)
+
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            raise exceptions.ShorteningProviderRateLimited(f'Rate limited by provider: {response.content!r}')
+
+        try:
+            response.raise_for_status()
+            return self.short_link_from_response(response)
+        except Exception as e:
+            raise exceptions.InvalidShorteningProviderResponse from e
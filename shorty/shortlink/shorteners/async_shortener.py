@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+__all__ = (
+    'AsyncShortener',
+)
+
+
+class AsyncShortener(ABC):
+    @abstractmethod
+    async def shorten(self, long_url: str) -> str:
+        """
+        Shorten a given `long_url` without blocking the running event loop.
+
+        :raises: shorty.shortlink.shorteners.exceptions.ShortenerException: If error occurred during shortening.
+        :param long_url: Long url to shorten.
+        :return: Short url pointing to a given `long_url`.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release resources held by the shortener for the running event loop.
+        """
+        pass
@@ -0,0 +1,42 @@
+import httpx
+
+from shorty import utils
+from shorty.shortlink.shorteners.async_request_based_shortener import AsyncRequestBasedShortener
+from shorty.shortlink.shorteners.request_based_shortener import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRY_BACKOFF_SECONDS,
+    request_timeout,
+)
+from shorty.shortlink.shorteners.tinyurl_shortener import TinyurlShortener
+
+__all__ = (
+    'AsyncTinyurlShortener',
+)
+
+
+class AsyncTinyurlShortener(AsyncRequestBasedShortener):
+    shorten_endpoint = TinyurlShortener.shorten_endpoint
+
+    # Request data and response formats are the same as for the blocking shortener.
+    prepare_request_data = TinyurlShortener.prepare_request_data
+    short_link_from_response = TinyurlShortener.short_link_from_response
+
+    def __init__(self, provider_url: str, timeout: float | None = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, idle_timeout: float | None = None,
+                 max_retries: int = 0, retry_backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS):
+        """
+        Initialize `AsyncTinyurlShortener`. See `TinyurlShortener` for parameters description.
+        """
+        super().__init__(
+            pool_size=pool_size, keep_alive=keep_alive, idle_timeout=idle_timeout,
+            max_retries=max_retries, retry_backoff=retry_backoff,
+        )
+        self._provider_url = provider_url
+        self._timeout = timeout
+
+    async def make_shorten_request(self, request_data: dict) -> httpx.Response:
+        return await self.client.get(
+            utils.urljoin(self._provider_url, self.shorten_endpoint),
+            params=request_data,
+            timeout=request_timeout(self._timeout),
+        )
@@ -1,7 +1,12 @@
 import requests
 
 from shorty import utils
-from shorty.shortlink.shorteners.request_based_shortener import RequestBasedShortener
+from shorty.shortlink.shorteners.request_based_shortener import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRY_BACKOFF_SECONDS,
+    RequestBasedShortener,
+    request_timeout,
+)
 
 __all__ = (
     'BitlyShortener',
@@ -12,7 +17,9 @@ class BitlyShortener(RequestBasedShortener):
     shorten_endpoint = 'shorten'
 
     def __init__(self, provider_url: str, api_key: str,
-                 domain: str | None = None, group_guid: str | None = None, timeout: float | None = None):
+                 domain: str | None = None, group_guid: str | None = None, timeout: float | None = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, idle_timeout: float | None = None,
+                 max_retries: int = 0, retry_backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS):
         """
         Initialize `BitLyShortener`.
 
@@ -21,7 +28,16 @@ class BitlyShortener(RequestBasedShortener):
         :param domain: Bitly domain. See https://dev.bitly.com/api-reference#shortenlink for details.
         :param group_guid: Bitly group GUID. See https://dev.bitly.com/api-reference#shortenlink for details.
         :param timeout: Timeout to reach Bitly API. See `requests.request` for details.
+        :param pool_size: Max number of pooled connections to Bitly API.
+        :param keep_alive: Whether to reuse connections to Bitly API between requests.
+        :param idle_timeout: Seconds after which an unused connection pool is closed.
+        :param max_retries: Max number of retries of transient 5xx Bitly API responses.
+        :param retry_backoff: Base of the jittered exponential backoff between retries, in seconds.
         """
+        super().__init__(
+            pool_size=pool_size, keep_alive=keep_alive, idle_timeout=idle_timeout,
+            max_retries=max_retries, retry_backoff=retry_backoff,
+        )
         self._provider_url = provider_url
         self._domain = domain
         self._group_guid = group_guid
@@ -41,11 +57,11 @@ class BitlyShortener(RequestBasedShortener):
         return data
 
     def make_shorten_request(self, request_data: dict) -> requests.Response:
-        return requests.post(
+        return self.session.post(
             utils.urljoin(self._provider_url, self.shorten_endpoint),
             json=request_data,
             headers=self._headers,
-            timeout=self._timeout,
+            timeout=request_timeout(self._timeout),
         )
 
     def short_link_from_response(self, response: requests.Response):
@@ -0,0 +1,37 @@
+from shorty.shortlink.cache import ShortlinkCache
+from shorty.shortlink.compact_map import CompactShortlinkMap
+from shorty.shortlink.shorteners.shortener import Shortener
+from shorty.shortlink.shorteners.wrapped_shortener import WrappedShortener
+
+__all__ = (
+    'CachingShortener',
+)
+
+
+class CachingShortener(WrappedShortener):
+    def __init__(self, wrapped: Shortener, provider: str, cache: ShortlinkCache | CompactShortlinkMap):
+        """
+        Initialize `CachingShortener`.
+
+        :param wrapped: Shortener to delegate shortening to on cache miss.
+        :param provider: Shortening provider name. Used as a part of the cache key.
+        :param cache: Cache to store short links in. May be shared between providers.
+        """
+        super().__init__(wrapped, provider)
+        self._cache = cache
+
+    def peek(self, long_url: str) -> str | None:
+        short_link = self._cache.get((self.provider, long_url))
+        if short_link is None and (short_link := super().peek(long_url)):
+            self._cache.set((self.provider, long_url), short_link)
+
+        return short_link
+
+    def shorten(self, long_url: str) -> str:
+        # Lookups are accounted in `peek`, which is consulted first on the request path.
+        short_link = self._cache.get((self.provider, long_url), record_stats=False)
+        if short_link is None:
+            short_link = self.wrapped.shorten(long_url)
+            self._cache.set((self.provider, long_url), short_link)
+
+        return short_link
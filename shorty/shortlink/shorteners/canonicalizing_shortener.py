@@ -0,0 +1,43 @@
+from shorty.shortlink.canonicalization import UrlCanonicalizer
+from shorty.shortlink.shorteners.shortener import Shortener
+from shorty.shortlink.shorteners.wrapped_shortener import WrappedShortener
+
+__all__ = (
+    'CanonicalizingShortener',
+)
+
+
+class CanonicalizingShortener(WrappedShortener):
+    """
+    Shortener passing canonical urls to the wrapped one. Must be the outermost layer, so that caching and
+    coalescing layers key by canonical urls.
+    """
+    stats_name = 'canonicalization'
+
+    def __init__(self, wrapped: Shortener, provider: str, canonicalizer: UrlCanonicalizer):
+        """
+        Initialize `CanonicalizingShortener`.
+
+        :param wrapped: Shortener to delegate shortening to.
+        :param provider: Shortening provider name.
+        :param canonicalizer: Canonicalizer of the urls to shorten.
+        """
+        super().__init__(wrapped, provider)
+        self.canonicalizer = canonicalizer
+        self.rewritten = 0
+
+    def _canonicalize(self, long_url: str) -> str:
+        canonical_url = self.canonicalizer.canonicalize(long_url)
+        if canonical_url != long_url:
+            self.rewritten += 1
+
+        return canonical_url
+
+    def shorten(self, long_url: str) -> str:
+        return self.wrapped.shorten(self._canonicalize(long_url))
+
+    def peek(self, long_url: str) -> str | None:
+        return super().peek(self.canonicalizer.canonicalize(long_url))
+
+    def stats(self) -> dict:
+        return {'rewritten': self.rewritten}
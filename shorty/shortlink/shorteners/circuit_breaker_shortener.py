@@ -0,0 +1,53 @@
+import logging
+
+from shorty.shortlink.circuit_breaker import CircuitBreaker
+from shorty.shortlink.shorteners import exceptions
+from shorty.shortlink.shorteners.shortener import Shortener
+from shorty.shortlink.shorteners.wrapped_shortener import WrappedShortener
+
+__all__ = (
+    'CircuitBreakerShortener',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerShortener(WrappedShortener):
+    stats_name = 'circuit_breaker'
+
+    def __init__(self, wrapped: Shortener, provider: str, circuit_breaker: CircuitBreaker):
+        """
+        Initialize `CircuitBreakerShortener`.
+
+        :param wrapped: Shortener to delegate shortening to while the circuit allows it.
+        :param provider: Shortening provider name.
+        :param circuit_breaker: Circuit breaker tracking the shortening provider health.
+        """
+        super().__init__(wrapped, provider)
+        self.circuit_breaker = circuit_breaker
+
+    def shorten(self, long_url: str) -> str:
+        """
+        Shorten a given `long_url` unless the circuit is open.
+
+        :raises: exceptions.ShorteningProviderUnavailable: If the circuit is open.
+        """
+        if not self.circuit_breaker.allow_request():
+            logger.info('%s. Circuit is open for provider %s', self.__class__.__name__, self.provider)
+            raise exceptions.ShorteningProviderUnavailable(f'Circuit is open for provider {self.provider}')
+
+        try:
+            short_link = self.wrapped.shorten(long_url)
+        except (exceptions.DeadlineExceeded, exceptions.RateLimitExceeded):
+            # The caller has run out of time or rate limit tokens, which is no sign of the provider failing.
+            self.circuit_breaker.release()
+            raise
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+
+        self.circuit_breaker.record_success()
+        return short_link
+
+    def stats(self) -> dict:
+        return self.circuit_breaker.stats()
@@ -0,0 +1,30 @@
+from shorty.shortlink.event_loop import EventLoopThread
+from shorty.shortlink.shorteners.async_shortener import AsyncShortener
+from shorty.shortlink.shorteners.shortener import Shortener
+
+__all__ = (
+    'EventLoopShortener',
+)
+
+
+class EventLoopShortener(Shortener):
+    """
+    Runs an `AsyncShortener` on a long-lived event loop, so that it can be wrapped into the same layers as blocking
+    shorteners, while its connections are pooled across requests.
+    """
+
+    def __init__(self, async_shortener: AsyncShortener, event_loop: EventLoopThread):
+        """
+        Initialize `EventLoopShortener`.
+
+        :param async_shortener: Shortener to delegate shortening to.
+        :param event_loop: Event loop to run `async_shortener` on. May be shared between providers.
+        """
+        self.async_shortener = async_shortener
+        self.event_loop = event_loop
+
+    def shorten(self, long_url: str) -> str:
+        return self.event_loop.run(self.async_shortener.shorten(long_url))
+
+    def close(self) -> None:
+        self.event_loop.run(self.async_shortener.close())
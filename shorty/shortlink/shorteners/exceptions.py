@@ -12,3 +12,19 @@ class InvalidShorteningProviderResponse(ShorteningProviderRequestException):
 
 class ShorteningProviderTimeout(ShorteningProviderRequestException):
     pass
+
+
+class ShorteningProviderUnavailable(ShorteningProviderRequestException):
+    pass
+
+
+class RateLimitExceeded(ShorteningProviderUnavailable):
+    pass
+
+
+class ShorteningProviderRateLimited(ShorteningProviderRequestException):
+    pass
+
+
+class DeadlineExceeded(ShorteningProviderTimeout):
+    pass
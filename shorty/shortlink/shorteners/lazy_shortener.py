@@ -0,0 +1,44 @@
+import threading
+from typing import Callable
+
+from shorty.shortlink.shorteners.shortener import Shortener
+from shorty.shortlink.shorteners.wrapped_shortener import WrappedShortener
+
+__all__ = (
+    'LazyShortener',
+)
+
+
+class LazyShortener(WrappedShortener):
+    """
+    Builds the shortener to delegate to on its first use, so that startup doesn't pay for unused providers.
+    """
+
+    def __init__(self, factory: Callable[[], Shortener], provider: str):
+        """
+        Initialize `LazyShortener`.
+
+        :param factory: Builds the shortener to delegate shortening to.
+        :param provider: Shortening provider name the built shortener is registered under.
+        """
+        self.factory = factory
+        self.provider = provider
+        self._wrapped: Shortener | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def wrapped(self) -> Shortener:
+        if self._wrapped is None:
+            with self._lock:
+                if self._wrapped is None:
+                    self._wrapped = self.factory()
+
+        return self._wrapped
+
+    @property
+    def is_built(self) -> bool:
+        return self._wrapped is not None
+
+    def close(self) -> None:
+        if self._wrapped is not None:
+            self._wrapped.close()
@@ -0,0 +1,185 @@
+import hashlib
+import sqlite3
+import threading
+
+from shorty import utils
+from shorty.shortlink.cache import ShortlinkCache
+from shorty.shortlink.shorteners.shortener import Shortener
+
+__all__ = (
+    'LocalShortener',
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS local_shortlinks (
+    id INTEGER PRIMARY KEY,
+    long_url TEXT NOT NULL UNIQUE
+)
+'''
+
+# SQLite ids are signed 64-bit integers, whose largest base62 code is 11 characters long.
+MAX_ID = 2 ** 63 - 1
+MAX_CODE_LENGTH = len(utils.base62_encode(MAX_ID))
+# Ids are permuted by a Feistel network over 64-bit numbers, i.e. two 32-bit halves.
+HALF_BITS = 32
+HALF_MASK = 2 ** HALF_BITS - 1
+FEISTEL_ROUNDS = 4
+
+
+class LocalShortener(Shortener):
+    """
+    Shortener generating short links itself, without reaching any external shortening provider.
+
+    Each long url gets a sequential id, and its short link is `base_url` followed by the base62 encoded permutation
+    of the id. The permutation is keyed by `code_key`, so that codes can't be enumerated without knowing the key.
+    Mappings are persisted in SQLite, so that they survive restarts and short links issued by one worker process
+    are redirected by the others. Recently used mappings are also kept in a bounded in-memory index.
+    """
+
+    def __init__(self, base_url: str, database_path: str, code_key: str, busy_timeout: float = 5.0,
+                 max_cached: int = 10_000):
+        """
+        Initialize `LocalShortener`.
+
+        :param base_url: Base url of short links, i.e. the url Shorty's redirect endpoint is served at.
+        :param database_path: SQLite database file path. Shared by all worker processes.
+        :param code_key: Secret key of the id permutation. Changing it invalidates all issued short links.
+        :param busy_timeout: Seconds to wait for a database lock held by another process.
+        :param max_cached: Max number of recently used mappings to keep in memory.
+        """
+        if not database_path:
+            raise ValueError('Local shortener `database_path` must be set.')
+        if not code_key:
+            raise ValueError('Local shortener `code_key` must be set.')
+
+        self._base_url = base_url
+        self._database_path = database_path
+        # Keys of any length are fit into the max `blake2b` key length.
+        self._code_key = hashlib.blake2b(code_key.encode()).digest()
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._codes_by_url = ShortlinkCache(max_entries=max_cached)
+        self._urls_by_code = ShortlinkCache(max_entries=max_cached)
+
+        with self._connection as connection:
+            connection.execute(SCHEMA)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections can't be used concurrently, so there is a connection per thread.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self._database_path, timeout=self._busy_timeout, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection
+
+    def _round(self, index: int, half: int) -> int:
+        digest = hashlib.blake2b(
+            bytes((index,)) + half.to_bytes(HALF_BITS // 8, 'big'), key=self._code_key, digest_size=HALF_BITS // 8,
+        ).digest()
+        return int.from_bytes(digest, 'big')
+
+    def _encrypt(self, number: int) -> int:
+        left, right = number >> HALF_BITS, number & HALF_MASK
+        for index in range(FEISTEL_ROUNDS):
+            left, right = right, left ^ self._round(index, right)
+
+        return left << HALF_BITS | right
+
+    def _decrypt(self, number: int) -> int:
+        left, right = number >> HALF_BITS, number & HALF_MASK
+        for index in reversed(range(FEISTEL_ROUNDS)):
+            left, right = right ^ self._round(index, left), left
+
+        return left << HALF_BITS | right
+
+    def encode(self, id_: int) -> str:
+        """
+        Make the short link code of an id.
+        """
+        # The permutation is over 64-bit numbers, so it's applied again until the number is a valid id ("cycle
+        # walking"), which keeps the codes of valid ids and only them within the valid id range.
+        number = self._encrypt(id_)
+        while not 0 < number <= MAX_ID:
+            number = self._encrypt(number)
+
+        return utils.base62_encode(number)
+
+    def decode(self, code: str) -> int | None:
+        """
+        Find the id of a short link code.
+
+        :return: Id or `None` if `code` isn't a code of any valid id.
+        """
+        if len(code) > MAX_CODE_LENGTH:
+            return None
+        try:
+            number = utils.base62_decode(code)
+        except ValueError:
+            return None
+        # Each id has a single code, e.g. there are no codes with leading zeros.
+        if not 0 < number <= MAX_ID or utils.base62_encode(number) != code:
+            return None
+
+        number = self._decrypt(number)
+        while not 0 < number <= MAX_ID:
+            number = self._decrypt(number)
+
+        return number
+
+    def _remember(self, code: str, long_url: str) -> None:
+        self._codes_by_url.set(long_url, code)
+        self._urls_by_code.set(code, long_url)
+
+    def _get_id(self, long_url: str) -> int:
+        with self._connection as connection:
+            connection.execute('INSERT OR IGNORE INTO local_shortlinks (long_url) VALUES (?)', (long_url,))
+            row = connection.execute('SELECT id FROM local_shortlinks WHERE long_url = ?', (long_url,)).fetchone()
+
+        return row[0]
+
+    def short_link(self, code: str) -> str:
+        return utils.urljoin(self._base_url, code)
+
+    def shorten(self, long_url: str) -> str:
+        code = self._codes_by_url.get(long_url)
+        if code is None:
+            code = self.encode(self._get_id(long_url))
+            self._remember(code, long_url)
+
+        return self.short_link(code)
+
+    def resolve(self, code: str) -> str | None:
+        """
+        Find a long url by the code of its short link.
+
+        :param code: Short link code, i.e. the short link path.
+        :return: Long url or `None` if there is no such code.
+        """
+        long_url = self._urls_by_code.get(code)
+        if long_url is not None:
+            return long_url
+
+        id_ = self.decode(code)
+        if id_ is None:
+            return None
+
+        row = self._connection.execute('SELECT long_url FROM local_shortlinks WHERE id = ?', (id_,)).fetchone()
+        if row is None:
+            return None
+
+        self._remember(code, row[0])
+        return row[0]
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,28 @@
+import time
+
+from shorty import metrics
+from shorty.shortlink.shorteners.wrapped_shortener import WrappedShortener
+
+__all__ = (
+    'MetricsShortener',
+)
+
+
+class MetricsShortener(WrappedShortener):
+    """
+    Records latency, outcome and in-flight count of every shortening provider call.
+    """
+
+    def shorten(self, long_url: str) -> str:
+        in_flight = metrics.PROVIDER_IN_FLIGHT.labels(self.provider)
+        in_flight.inc()
+        started = time.perf_counter()
+        exception = None
+        try:
+            return self.wrapped.shorten(long_url)
+        except BaseException as e:
+            exception = e
+            raise
+        finally:
+            in_flight.dec()
+            metrics.observe_provider_call(self.provider, time.perf_counter() - started, exception)
@@ -0,0 +1,54 @@
+import logging
+import sqlite3
+
+from shorty.shortlink.shorteners.shortener import Shortener
+from shorty.shortlink.shorteners.wrapped_shortener import WrappedShortener
+from shorty.shortlink.store import SqliteShortlinkStore
+
+__all__ = (
+    'PersistentShortener',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentShortener(WrappedShortener):
+    """
+    Reads short links from a persistent store and stores short links made by the wrapped shortener. Store errors
+    (e.g. a locked or full database) don't fail shortening: a failed read is a miss and a failed write is skipped.
+    """
+
+    def __init__(self, wrapped: Shortener, provider: str, store: SqliteShortlinkStore):
+        """
+        Initialize `PersistentShortener`.
+
+        :param wrapped: Shortener to delegate shortening to if there is no stored short link.
+        :param provider: Shortening provider name. Used as a part of the store key.
+        :param store: Store to read short links from and write them to. May be shared between providers.
+        """
+        super().__init__(wrapped, provider)
+        self._store = store
+
+    def _get(self, long_url: str) -> str | None:
+        try:
+            return self._store.get(self.provider, long_url)
+        except sqlite3.Error as e:
+            logger.warning('%s. Failed to read stored short link: %s', self.__class__.__name__, e)
+            return None
+
+    def _set(self, long_url: str, short_link: str) -> str:
+        try:
+            return self._store.set(self.provider, long_url, short_link)
+        except sqlite3.Error as e:
+            logger.warning('%s. Failed to store short link: %s', self.__class__.__name__, e)
+            return short_link
+
+    def peek(self, long_url: str) -> str | None:
+        return self._get(long_url) or super().peek(long_url)
+
+    def shorten(self, long_url: str) -> str:
+        short_link = self._get(long_url)
+        if short_link is None:
+            short_link = self._set(long_url, self.wrapped.shorten(long_url))
+
+        return short_link
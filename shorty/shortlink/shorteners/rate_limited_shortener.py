@@ -0,0 +1,49 @@
+import logging
+
+from shorty.shortlink import deadline
+from shorty.shortlink.rate_limiter import TokenBucket
+from shorty.shortlink.shorteners import exceptions
+from shorty.shortlink.shorteners.shortener import Shortener
+from shorty.shortlink.shorteners.wrapped_shortener import WrappedShortener
+
+__all__ = (
+    'RateLimitedShortener',
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitedShortener(WrappedShortener):
+    stats_name = 'rate_limiter'
+
+    def __init__(self, wrapped: Shortener, provider: str, token_bucket: TokenBucket, max_wait: float = 0.0):
+        """
+        Initialize `RateLimitedShortener`.
+
+        :param wrapped: Shortener to delegate shortening to within the rate limit.
+        :param provider: Shortening provider name.
+        :param token_bucket: Token bucket limiting the rate of shortening provider calls.
+        :param max_wait: Max seconds to wait for the rate limit to allow a call, if the request deadline allows.
+        """
+        super().__init__(wrapped, provider)
+        self.token_bucket = token_bucket
+        self.max_wait = max_wait
+
+    def shorten(self, long_url: str) -> str:
+        """
+        Shorten a given `long_url` once the rate limit allows it.
+
+        :raises: exceptions.RateLimitExceeded: If the rate limit doesn't allow a call within `max_wait`.
+        """
+        if not self.token_bucket.acquire(timeout=deadline.clamp(self.max_wait)):
+            logger.info('%s. Rate limit is exceeded for provider %s', self.__class__.__name__, self.provider)
+            raise exceptions.RateLimitExceeded(f'Rate limit is exceeded for provider {self.provider}')
+
+        return self.wrapped.shorten(long_url)
+
+    def stats(self) -> dict:
+        return self.token_bucket.stats()
+
+    def close(self) -> None:
+        self.token_bucket.close()
+        super().close()
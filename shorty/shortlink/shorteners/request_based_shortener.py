@@ -1,8 +1,16 @@
 import logging
+import random
+import threading
+import time
 from abc import ABC, abstractmethod
+from http import HTTPStatus
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from shorty import tracing
+from shorty.shortlink import deadline
+from shorty.shortlink.rate_limiter import TokenBucket
 from shorty.shortlink.shorteners import exceptions
 from shorty.shortlink.shorteners.shortener import Shortener
 
@@ -12,8 +20,153 @@ __all__ = (
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRY_BACKOFF_SECONDS = 0.05
+# Responses worth retrying: the provider may well succeed shortly. `429` isn't one of them, since retrying it would
+# only make the provider rate limit worse.
+RETRY_STATUSES = frozenset((
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+))
+
+
+def request_timeout(timeout: float | None) -> float | None:
+    """
+    Limit a shortening provider request `timeout` by the time left until the request deadline.
+
+    :param timeout: Timeout in seconds. `None` means no timeout.
+    :raises: exceptions.DeadlineExceeded: If there is no time left until the request deadline.
+    """
+    timeout = deadline.clamp(timeout)
+    if timeout is not None and timeout <= 0:
+        raise exceptions.DeadlineExceeded('No time left until the request deadline')
+
+    return timeout
+
+
+class _TracingHTTPAdapter(HTTPAdapter):
+    def add_headers(self, request: requests.PreparedRequest, **kwargs) -> None:
+        # Pass the trace of the request being served on to the shortening provider.
+        if (traceparent := tracing.traceparent()) is not None:
+            request.headers[tracing.HEADER] = traceparent
+
 
 class RequestBasedShortener(Shortener, ABC):
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, idle_timeout: float | None = None,
+                 max_retries: int = 0, retry_backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS):
+        """
+        Initialize `RequestBasedShortener`.
+
+        :param pool_size: Max number of connections to keep in the shortening provider connection pool.
+        :param keep_alive: Whether to reuse connections to the shortening provider between requests.
+        :param idle_timeout: Seconds after which an unused connection pool is closed in the background.
+            `None` means never.
+        :param max_retries: Max number of retries of transient 5xx responses.
+        :param retry_backoff: Base of the exponential backoff between retries, in seconds. The actual backoff is
+            a random value up to `retry_backoff * 2 ** attempt`, and there is no retry if it exceeds the time left
+            until the request deadline (see `shorty.shortlink.deadline`).
+        """
+        # Token bucket limiting the rate of calls to the shortening provider, if any. The first attempt of a call is
+        # expected to have taken a token already (see `RateLimitedShortener`), so only retries take one here.
+        self.retry_token_bucket: TokenBucket | None = None
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._idle_timeout = idle_timeout
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        self._session_last_used = 0.0
+        self._in_flight = 0
+        self._idle_timer: threading.Timer | None = None
+
+    def create_session(self) -> requests.Session:
+        """
+        Create a new `requests.Session` with a connection pool sized for this shortener.
+        """
+        session = requests.Session()
+        adapter = _TracingHTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self._keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Pooled session to make shortening provider requests with. Created on first use.
+        """
+        with self._session_lock:
+            if self._session is None:
+                self._session = self.create_session()
+                if self._idle_timeout is not None:
+                    self._schedule_idle_check(self._idle_timeout)
+            self._session_last_used = time.monotonic()
+            return self._session
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _schedule_idle_check(self, delay: float) -> None:
+        # Must be called holding `_session_lock`.
+        self._idle_timer = threading.Timer(delay, self._close_idle_session)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _close_idle_session(self) -> None:
+        with self._session_lock:
+            self._idle_timer = None
+            if self._session is None:
+                return
+
+            idle = time.monotonic() - self._session_last_used
+            if self._in_flight or idle < self._idle_timeout:
+                # Check again once the pool may have been idle for long enough.
+                self._schedule_idle_check(self._idle_timeout if self._in_flight else self._idle_timeout - idle)
+                return
+
+            logger.debug('%s. Closing idle connection pool', self.__class__.__name__)
+            self._session.close()
+            self._session = None
+
+    def _request(self, request_data: dict) -> requests.Response:
+        if deadline.expired():
+            raise exceptions.DeadlineExceeded('No time left until the request deadline')
+
+        with tracing.span('provider_request', shortener=self.__class__.__name__) as span:
+            try:
+                response = self._make_tracked_shorten_request(request_data=request_data)
+            except requests.exceptions.Timeout as e:
+                # The timeout may have been cut short by the request deadline rather than by the provider.
+                if deadline.expired():
+                    raise exceptions.DeadlineExceeded('No time left until the request deadline') from e
+                raise exceptions.ShorteningProviderTimeout from e
+            except requests.exceptions.HTTPError as e:
+                raise exceptions.ShorteningProviderRequestException from e
+
+            if span is not None:
+                span.set('http.status_code', response.status_code)
+            return response
+
+    def _make_tracked_shorten_request(self, request_data: dict) -> requests.Response:
+        with self._session_lock:
+            self._in_flight += 1
+        try:
+            return self.make_shorten_request(request_data=request_data)
+        finally:
+            with self._session_lock:
+                self._in_flight -= 1
+
     @abstractmethod
     def prepare_request_data(self, long_url: str) -> dict:
         """
@@ -51,24 +204,46 @@ class RequestBasedShortener(Shortener, ABC):
         :param long_url: Long url to shorten.
         :raises: exceptions.CouldNotReachShorteningProvider: If provider could not be reached during request.
         :raises: exceptions.ShorteningProviderTimeout: If timeout error occurred during shortening provider request.
+        :raises: exceptions.DeadlineExceeded: If there is no time left until the request deadline.
         :raises: exceptions.ShorteningProviderRequestException: If some other error occurred during request.
+        :raises: exceptions.ShorteningProviderRateLimited: If provider rejected the request due to its rate limit.
         :raises: exceptions.InvalidShorteningProviderResponse: If provider request returned invalid response.
         :return: Short url pointing to a given `long_url`.
         """
         data = self.prepare_request_data(long_url=long_url)
         logger.debug('%s. Prepared request data: %s', self.__class__.__name__, data)
 
-        try:
-            response = self.make_shorten_request(request_data=data)
-        except requests.exceptions.Timeout as e:
-            raise exceptions.ShorteningProviderTimeout from e
-        except requests.exceptions.HTTPError as e:
-            raise exceptions.ShorteningProviderRequestException from e
+        attempt = 0
+        while True:
+            response = self._request(data)
+            if response.status_code not in RETRY_STATUSES or attempt >= self._max_retries:
+                break
+
+            backoff = random.uniform(0, self._retry_backoff * 2 ** attempt)
+            budget = deadline.remaining()
+            if budget is not None and backoff >= budget:
+                break
+
+            time.sleep(backoff)
+            if self.retry_token_bucket is not None and not self.retry_token_bucket.acquire():
+                logger.info(
+                    '%s. Rate limit does not allow retrying %s response', self.__class__.__name__, response.status_code,
+                )
+                break
+
+            attempt += 1
+            logger.info(
+                '%s. Retrying %s response after %.3fs (attempt %s)',
+                self.__class__.__name__, response.status_code, backoff, attempt,
+            )
 
         logger.info('%s. Received response from provider', self.__class__.__name__)
         logger.debug('%s. Provider response status code: %s', self.__class__.__name__, response.status_code)
         logger.debug('%s. Provider response status content: %s', self.__class__.__name__, response.content)
 
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            raise exceptions.ShorteningProviderRateLimited(f'Rate limited by provider: {response.content!r}')
+
         try:
             response.raise_for_status()
             return self.short_link_from_response(response)
@@ -16,3 +16,9 @@ class Shortener(ABC):
         :return: Short url pointing to a given `long_url`.
         """
         pass
+
+    def close(self) -> None:
+        """
+        Release resources held by the shortener (connections, files, etc.).
+        """
+        pass
@@ -0,0 +1,52 @@
+from urllib.parse import urlsplit, urlunsplit
+
+from shorty.shortlink import deadline
+from shorty.shortlink.shorteners import exceptions
+from shorty.shortlink.shorteners.shortener import Shortener
+from shorty.shortlink.shorteners.wrapped_shortener import WrappedShortener
+from shorty.shortlink.single_flight import SingleFlight
+
+__all__ = (
+    'SingleFlightShortener',
+)
+
+
+class SingleFlightShortener(WrappedShortener):
+    stats_name = 'single_flight'
+
+    def __init__(self, wrapped: Shortener, provider: str, single_flight: SingleFlight | None = None):
+        """
+        Initialize `SingleFlightShortener`.
+
+        :param wrapped: Shortener to delegate shortening to.
+        :param provider: Shortening provider name. Used as a part of the coalescing key.
+        :param single_flight: Coalescer of identical in-flight calls. May be shared between providers.
+        """
+        super().__init__(wrapped, provider)
+        self.single_flight = single_flight or SingleFlight()
+
+    @staticmethod
+    def normalize_url(long_url: str) -> str:
+        # Scheme and host are case-insensitive, so such urls point to the same resource.
+        parts = urlsplit(long_url)
+        return urlunsplit(parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower()))
+
+    def shorten(self, long_url: str) -> str:
+        try:
+            return self.single_flight.do(
+                (self.provider, self.normalize_url(long_url)),
+                lambda: self.wrapped.shorten(long_url),
+                # A concurrent call may have a later deadline than this one.
+                timeout=deadline.clamp(None),
+            )
+        except TimeoutError as e:
+            raise exceptions.DeadlineExceeded('No time left until the request deadline') from e
+        except exceptions.DeadlineExceeded:
+            if deadline.expired():
+                raise
+
+        # The call has been cut by the deadline of a concurrent caller, while this one still has time to make its own.
+        return self.wrapped.shorten(long_url)
+
+    def stats(self) -> dict:
+        return self.single_flight.stats()
@@ -2,8 +2,14 @@ import pydantic
 import requests
 
 from shorty import utils
+from shorty.shortlink import schemas
 from shorty.shortlink.shorteners import exceptions
-from shorty.shortlink.shorteners.request_based_shortener import RequestBasedShortener
+from shorty.shortlink.shorteners.request_based_shortener import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRY_BACKOFF_SECONDS,
+    RequestBasedShortener,
+    request_timeout,
+)
 
 __all__ = (
     'TinyurlShortener',
@@ -13,13 +19,24 @@ __all__ = (
 class TinyurlShortener(RequestBasedShortener):
     shorten_endpoint = 'api-create.php'
 
-    def __init__(self, provider_url: str, timeout: float | None = None):
+    def __init__(self, provider_url: str, timeout: float | None = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True, idle_timeout: float | None = None,
+                 max_retries: int = 0, retry_backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS):
         """
         Initialize `TinyUrlShortener`.
 
         :param provider_url: Tinyurl provider base url. For example: 'https://tinyurl.com'
         :param timeout: Timeout to reach Tinyurl API. See `requests.request` for details.
+        :param pool_size: Max number of pooled connections to Tinyurl API.
+        :param keep_alive: Whether to reuse connections to Tinyurl API between requests.
+        :param idle_timeout: Seconds after which an unused connection pool is closed.
+        :param max_retries: Max number of retries of transient 5xx Tinyurl API responses.
+        :param retry_backoff: Base of the jittered exponential backoff between retries, in seconds.
         """
+        super().__init__(
+            pool_size=pool_size, keep_alive=keep_alive, idle_timeout=idle_timeout,
+            max_retries=max_retries, retry_backoff=retry_backoff,
+        )
         self._provider_url = provider_url
         self._timeout = timeout
 
@@ -27,16 +44,17 @@ class TinyurlShortener(RequestBasedShortener):
         return {'url': long_url}
 
     def make_shorten_request(self, request_data: dict) -> requests.Response:
-        return requests.get(
+        return self.session.get(
             utils.urljoin(self._provider_url, self.shorten_endpoint),
             params=request_data,
-            timeout=self._timeout,
+            timeout=request_timeout(self._timeout),
         )
 
     def short_link_from_response(self, response: requests.Response):
         try:
             url = response.content.decode()
-            pydantic.parse_obj_as(pydantic.HttpUrl, url)
+            if not schemas.is_plain_http_url(url):
+                pydantic.parse_obj_as(pydantic.HttpUrl, url)
         except Exception as e:
             raise exceptions.InvalidShorteningProviderResponse from e
 
@@ -0,0 +1,61 @@
+from typing import Iterator
+
+from shorty.shortlink.shorteners.shortener import Shortener
+
+__all__ = (
+    'WrappedShortener',
+    'iter_layers',
+)
+
+
+class WrappedShortener(Shortener):
+    """
+    Base class for shorteners that add behaviour on top of another (wrapped) shortener.
+    """
+    # Key to report `stats` of this layer under. Layers without it have nothing to report.
+    stats_name: str | None = None
+
+    def __init__(self, wrapped: Shortener, provider: str):
+        """
+        Initialize `WrappedShortener`.
+
+        :param wrapped: Shortener to delegate shortening to.
+        :param provider: Shortening provider name the wrapped shortener is registered under.
+        """
+        self.wrapped = wrapped
+        self.provider = provider
+
+    def shorten(self, long_url: str) -> str:
+        return self.wrapped.shorten(long_url)
+
+    def peek(self, long_url: str) -> str | None:
+        """
+        Return an already known short link for a given `long_url` without reaching the shortening provider.
+
+        :param long_url: Long url to look up.
+        :return: Known short url or `None`.
+        """
+        if isinstance(self.wrapped, WrappedShortener):
+            return self.wrapped.peek(long_url)
+
+        return None
+
+    def stats(self) -> dict:
+        """
+        Return monitoring data of this layer.
+        """
+        return {}
+
+    def close(self) -> None:
+        self.wrapped.close()
+
+
+def iter_layers(shortener: Shortener) -> Iterator[Shortener]:
+    """
+    Iterate over a given `shortener` and all shorteners wrapped by it, starting from the outermost one.
+    """
+    while isinstance(shortener, WrappedShortener):
+        yield shortener
+        shortener = shortener.wrapped
+
+    yield shortener
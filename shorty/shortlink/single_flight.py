@@ -0,0 +1,75 @@
+import threading
+from typing import Callable, Hashable, TypeVar
+
+__all__ = (
+    'SingleFlight',
+)
+
+T = TypeVar('T')
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'exception')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: only the first caller runs the call,
+    while the concurrent ones wait for it and share its result or exception.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, func: Callable[[], T], timeout: float | None = None) -> T:
+        """
+        Run `func` unless a call with the same `key` is already in flight, in which case wait for its outcome.
+
+        :param key: Key identifying identical calls.
+        :param func: Call to run.
+        :param timeout: Max seconds to wait for a concurrent call. `None` means no limit.
+        :return: Result of `func` run by this or a concurrent caller.
+        :raises: TimeoutError: If the concurrent call isn't done within `timeout`.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.collapsed += 1
+
+        if not is_leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f'Concurrent call is not done within {timeout}s')
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'collapsed': self.collapsed,
+                'in_flight': len(self._calls),
+            }
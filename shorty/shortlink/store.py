@@ -0,0 +1,161 @@
+import logging
+import sqlite3
+import threading
+import time
+
+from shorty.shortlink.bloom import BloomFilter
+
+__all__ = (
+    'SqliteShortlinkStore',
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_CHUNK_SIZE = 1000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS shortlinks (
+    id INTEGER PRIMARY KEY,
+    provider TEXT NOT NULL,
+    long_url TEXT NOT NULL,
+    short_link TEXT NOT NULL,
+    UNIQUE (provider, long_url)
+)
+'''
+
+
+class SqliteShortlinkStore:
+    """
+    Persistent (provider, long url) -> short link store on top of SQLite.
+
+    An in-memory Bloom filter of stored keys lets lookups of unknown urls skip the disk. The database may be
+    shared by several processes: the Bloom filter picks up keys stored by other processes every `refresh_interval`
+    seconds, and the first stored short link of a url wins for all of them.
+    """
+
+    def __init__(self, path: str, bloom_capacity: int = 1_000_000, bloom_error_rate: float = 0.01,
+                 refresh_interval: float = 5.0, busy_timeout: float = 5.0):
+        """
+        Initialize `SqliteShortlinkStore`.
+
+        :param path: SQLite database file path.
+        :param bloom_capacity: Expected number of stored short links.
+        :param bloom_error_rate: Bloom filter false positive rate at `bloom_capacity` short links.
+        :param refresh_interval: Min seconds between loading keys stored by other processes into the Bloom filter.
+        :param busy_timeout: Seconds to wait for a database lock held by another process.
+        """
+        self._path = path
+        self._busy_timeout = busy_timeout
+        self._refresh_interval = refresh_interval
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity=bloom_capacity, error_rate=bloom_error_rate)
+        self._last_id = 0
+        self._refreshed_at = 0.0
+        self.bloom_skips = 0
+        self.disk_reads = 0
+        self.disk_hits = 0
+        self.writes = 0
+
+        with self._connection as connection:
+            connection.execute(SCHEMA)
+        self._refresh_bloom()
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections can't be used concurrently, so there is a connection per thread.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._busy_timeout, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection
+
+    @staticmethod
+    def _key(provider: str, long_url: str) -> str:
+        return f'{provider} {long_url}'
+
+    def _refresh_bloom(self) -> None:
+        with self._lock:
+            self._refreshed_at = time.monotonic()
+            cursor = self._connection.execute(
+                'SELECT id, provider, long_url FROM shortlinks WHERE id > ? ORDER BY id', (self._last_id,),
+            )
+            # Rows are streamed in chunks, so that loading a large database doesn't hold all of its keys in memory.
+            loaded = 0
+            while rows := cursor.fetchmany(REFRESH_CHUNK_SIZE):
+                for row_id, provider, long_url in rows:
+                    self._bloom.add(self._key(provider, long_url))
+                    self._last_id = row_id
+                loaded += len(rows)
+
+        if loaded:
+            logger.debug('%s. Loaded %s keys into Bloom filter', self.__class__.__name__, loaded)
+
+    def _might_contain(self, key: str) -> bool:
+        if key in self._bloom:
+            return True
+        if time.monotonic() - self._refreshed_at >= self._refresh_interval:
+            self._refresh_bloom()
+            return key in self._bloom
+
+        return False
+
+    def get(self, provider: str, long_url: str) -> str | None:
+        if not self._might_contain(self._key(provider, long_url)):
+            self.bloom_skips += 1
+            return None
+
+        self.disk_reads += 1
+        row = self._connection.execute(
+            'SELECT short_link FROM shortlinks WHERE provider = ? AND long_url = ?', (provider, long_url),
+        ).fetchone()
+        if row is None:
+            return None
+
+        self.disk_hits += 1
+        return row[0]
+
+    def set(self, provider: str, long_url: str, short_link: str) -> str:
+        """
+        Store a short link unless there already is one for a given `provider` and `long_url`.
+
+        :return: Stored short link. It differs from a given `short_link` if another one has been stored before.
+        """
+        with self._connection as connection:
+            cursor = connection.execute(
+                'INSERT OR IGNORE INTO shortlinks (provider, long_url, short_link) VALUES (?, ?, ?)',
+                (provider, long_url, short_link),
+            )
+            if not cursor.rowcount:
+                short_link = connection.execute(
+                    'SELECT short_link FROM shortlinks WHERE provider = ? AND long_url = ?', (provider, long_url),
+                ).fetchone()[0]
+
+        with self._lock:
+            self._bloom.add(self._key(provider, long_url))
+            self.writes += 1
+
+        return short_link
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def stats(self) -> dict:
+        return {
+            'bloom_keys': self._bloom.count,
+            'bloom_size_bytes': self._bloom.size_bytes,
+            'bloom_skips': self.bloom_skips,
+            'disk_reads': self.disk_reads,
+            'disk_hits': self.disk_hits,
+            'writes': self.writes,
+        }
@@ -1,20 +1,47 @@
+import contextvars
+import functools
+import json as json_lib
 import logging
-from typing import Mapping
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, ContextManager, IO, Iterator, Mapping, Sequence
 
 import pydantic
-from flasgger import swag_from
-from flask import blueprints, jsonify, Response, request as flask_request
+from flask import (
+    blueprints, current_app, jsonify, redirect, Response, request as flask_request, stream_with_context, url_for,
+)
 from flask.views import MethodView
 from werkzeug import exceptions as flask_exceptions
 
-from shorty import utils
-from shorty.shortlink import shorteners, schemas
+from shorty import metrics, openapi, server_timing, tracing, utils
+from shorty.error_handlers import error_payload
+from shorty.shortlink import deadline, shorteners, schemas
+from shorty.shortlink.cache import ShortlinkCache
+from shorty.shortlink.compact_map import CompactShortlinkMap
+from shorty.shortlink.canonicalization import UrlCanonicalizer
+from shorty.shortlink.circuit_breaker import CircuitBreaker
+from shorty.shortlink.event_loop import EventLoopThread
+from shorty.shortlink.hedging import hedged_call
+from shorty.shortlink.jobs import JobQueue, JobQueueFull, MemoryJobStore, SqliteJobStore
+from shorty.shortlink.ranking import ProviderRanking
+from shorty.shortlink.rate_limiter import SqliteTokenBucket, TokenBucket
+from shorty.shortlink.store import SqliteShortlinkStore
 from shorty.shortlink.exceptions import APIValidationError
 from shorty.shortlink.shorteners import exceptions as shortener_exceptions
 
 __all__ = (
     'blueprint',
+    'close_shorteners',
+    'shutdown_executors',
+    'AsyncShortlinksAPI',
     'ShortlinksAPI',
+    'ShortlinksBatchAPI',
+    'ShortlinksJobsAPI',
+    'ShortlinkJobAPI',
+    'ShortlinksStreamAPI',
+    'ShortlinkRedirectAPI',
+    'ShortlinksStatsAPI',
 )
 
 logger = logging.getLogger(__name__)
@@ -22,6 +49,21 @@ logger = logging.getLogger(__name__)
 blueprint = blueprints.Blueprint('shortlink', __name__)
 
 _shorteners_mapping: dict[str, shorteners.Shortener] = {}
+_async_shorteners_mapping: dict[str, shorteners.Shortener] = {}
+_async_shortener_factories: dict[str, Callable[[], shorteners.Shortener]] = {}
+_async_shorteners_lock = threading.RLock()
+_event_loop: EventLoopThread | None = None
+_local_shorteners: list[shorteners.LocalShortener] | None = None
+_shortlinks_cache: ShortlinkCache | CompactShortlinkMap | None = None
+_shortlinks_store: SqliteShortlinkStore | None = None
+_batch_executor: ThreadPoolExecutor | None = None
+_hedging_executor: ThreadPoolExecutor | None = None
+_provider_ranking: ProviderRanking | None = None
+_job_queue: JobQueue | None = None
+_fallback_mode = 'sequential'
+_hedge_delay = 0.0
+
+FALLBACK_MODES = ('sequential', 'hedged', 'race')
 
 
 def load_shorteners(setup_state: blueprints.BlueprintSetupState) -> None:
@@ -29,70 +71,883 @@ def load_shorteners(setup_state: blueprints.BlueprintSetupState) -> None:
     Initialise mapping includes all available shortening providers.
     Must be invoked oly after initialisation of the `Flask` application.
     """
-    _shorteners_mapping.update({
-        name: utils.dynamically_load(shortener_config['class_path'])(**shortener_config['kwargs'])
-        for name, shortener_config in setup_state.app.config['SHORTENERS'].items()
+    global _shortlinks_cache, _shortlinks_store, _local_shorteners
+
+    # Shorteners of a previously registered application are replaced, so their resources are released first.
+    _close_loaded_shorteners()
+    _shorteners_mapping.clear()
+
+    config = setup_state.app.config
+    cache_config = config['SHORTLINKS_CACHE']
+    _shortlinks_cache = None
+    if cache_config['enabled'] and cache_config['compact']:
+        _shortlinks_cache = CompactShortlinkMap(max_entries=cache_config['max_entries'])
+    elif cache_config['enabled']:
+        _shortlinks_cache = ShortlinkCache(max_entries=cache_config['max_entries'], ttl=cache_config['ttl'])
+
+    store_config = dict(config['SHORTLINKS_STORE'])
+    _shortlinks_store = SqliteShortlinkStore(**store_config) if store_config.pop('enabled') else None
+
+    for name, shortener_config in config['SHORTENERS'].items():
+        if config['SHORTLINKS_LAZY_SHORTENERS']:
+            _shorteners_mapping[name] = shorteners.LazyShortener(
+                functools.partial(build_shortener, name, shortener_config, config), provider=name,
+            )
+        else:
+            _shorteners_mapping[name] = build_shortener(name, shortener_config, config)
+
+    _local_shorteners = None
+    # Async shorteners (and `httpx`) are needed only by the async endpoint, so they are built on its first use.
+    _async_shorteners_mapping.clear()
+    _async_shortener_factories.clear()
+    _async_shortener_factories.update({
+        name: functools.partial(build_async_shortener, name, shortener_config, config)
+        for name, shortener_config in config['SHORTENERS'].items() if 'async_class_path' in shortener_config
     })
     schemas.init_schemas(_shorteners_mapping.keys())
 
 
+def get_local_shorteners() -> list[shorteners.LocalShortener]:
+    """
+    Return all loaded `LocalShortener`s, collected on the first call.
+    """
+    global _local_shorteners
+
+    if _local_shorteners is None:
+        _local_shorteners = [
+            layer for shortener in _shorteners_mapping.values() for layer in shorteners.iter_layers(shortener)
+            if isinstance(layer, shorteners.LocalShortener)
+        ]
+
+    return _local_shorteners
+
+
+def get_async_shortener(name: str) -> shorteners.Shortener:
+    """
+    Return the async shortener of a given shortening provider, building it on the first call.
+    """
+    if (shortener := _async_shorteners_mapping.get(name)) is None:
+        with _async_shorteners_lock:
+            if (shortener := _async_shorteners_mapping.get(name)) is None:
+                shortener = _async_shorteners_mapping[name] = _async_shortener_factories[name]()
+
+    return shortener
+
+
+def get_event_loop() -> EventLoopThread:
+    """
+    Return the event loop async shorteners run on, starting it on the first call.
+    """
+    global _event_loop
+
+    with _async_shorteners_lock:
+        if _event_loop is None:
+            _event_loop = EventLoopThread(name='shortlinks-async')
+
+        return _event_loop
+
+
+def build_token_bucket(name: str, rate_limit_config: Mapping) -> TokenBucket:
+    """
+    Instantiate a shortening provider rate limit. See `AppConfig.SHORTLINKS_RATE_LIMIT`.
+
+    :param name: Shortening provider name.
+    :param rate_limit_config: Shortening provider rate limit config.
+    """
+    if rate_limit_config['path']:
+        return SqliteTokenBucket(
+            rate_limit_config['path'], key=name, rate=rate_limit_config['rate'], burst=rate_limit_config['burst'],
+        )
+
+    return TokenBucket(rate=rate_limit_config['rate'], burst=rate_limit_config['burst'])
+
+
+def build_shortener(name: str, shortener_config: Mapping, config: Mapping,
+                    provider_shortener: shorteners.Shortener | None = None,
+                    circuit_breaker: CircuitBreaker | None = None,
+                    token_bucket: TokenBucket | None = None) -> shorteners.Shortener:
+    """
+    Instantiate a shortening provider and wrap it into the configured shortener layers.
+
+    :param name: Shortening provider name.
+    :param shortener_config: Shortening provider config. See `AppConfig.SHORTENERS`.
+    :param config: Application config.
+    :param provider_shortener: Shortening provider to wrap instead of the `class_path` one.
+    :param circuit_breaker: Circuit breaker to share with another shortener of the provider instead of a new one.
+    :param token_bucket: Rate limit to share with another shortener of the provider instead of a new one.
+    """
+    shortener = provider_shortener or utils.dynamically_load(shortener_config['class_path'])(
+        **shortener_config['kwargs'],
+    )
+
+    if config.get('METRICS_ENABLED'):
+        shortener = shorteners.MetricsShortener(shortener, provider=name)
+
+    # Inside of the circuit breaker, so that calls rejected by the open circuit don't take tokens. The circuit breaker
+    # doesn't count calls rejected by the rate limit as provider failures.
+    rate_limit_config = {
+        **config['SHORTLINKS_RATE_LIMIT'],
+        **{key: value for key, value in shortener_config.get('rate_limit', {}).items() if value is not None},
+    }
+    if rate_limit_config['enabled']:
+        token_bucket = token_bucket or build_token_bucket(name, rate_limit_config)
+        # Retries are made by the provider shortener itself, so it takes tokens for them from the same bucket.
+        for layer in shorteners.iter_layers(shortener):
+            if isinstance(layer, shorteners.RequestBasedShortener):
+                layer.retry_token_bucket = token_bucket
+        shortener = shorteners.RateLimitedShortener(
+            shortener, provider=name, token_bucket=token_bucket, max_wait=rate_limit_config['max_wait'],
+        )
+
+    circuit_breaker_config = {**config['SHORTLINKS_CIRCUIT_BREAKER'], **shortener_config.get('circuit_breaker', {})}
+    if circuit_breaker_config.pop('enabled'):
+        shortener = shorteners.CircuitBreakerShortener(
+            shortener, provider=name, circuit_breaker=circuit_breaker or CircuitBreaker(**circuit_breaker_config),
+        )
+
+    if _shortlinks_store is not None:
+        shortener = shorteners.PersistentShortener(shortener, provider=name, store=_shortlinks_store)
+
+    if config['SHORTLINKS_SINGLE_FLIGHT']['enabled']:
+        shortener = shorteners.SingleFlightShortener(shortener, provider=name)
+
+    if _shortlinks_cache is not None:
+        shortener = shorteners.CachingShortener(shortener, provider=name, cache=_shortlinks_cache)
+
+    canonicalization_config = {
+        **config['SHORTLINKS_CANONICALIZATION'], **shortener_config.get('canonicalization', {}),
+    }
+    if canonicalization_config.pop('enabled'):
+        shortener = shorteners.CanonicalizingShortener(
+            shortener, provider=name, canonicalizer=UrlCanonicalizer(**canonicalization_config),
+        )
+
+    return shortener
+
+
+def build_async_shortener(name: str, shortener_config: Mapping, config: Mapping) -> shorteners.Shortener:
+    """
+    Instantiate the async shortener of a shortening provider to run on the shared event loop, and wrap it into the
+    same shortener layers as the blocking one. Both share the circuit breaker and the rate limit of the provider.
+
+    :param name: Shortening provider name.
+    :param shortener_config: Shortening provider config with `async_class_path`. See `AppConfig.SHORTENERS`.
+    :param config: Application config.
+    """
+    async_shortener = utils.dynamically_load(shortener_config['async_class_path'])(**shortener_config['kwargs'])
+    layers = list(shorteners.iter_layers(_shorteners_mapping[name]))
+    circuit_breaker = next(
+        (layer.circuit_breaker for layer in layers if isinstance(layer, shorteners.CircuitBreakerShortener)), None,
+    )
+    token_bucket = next(
+        (layer.token_bucket for layer in layers if isinstance(layer, shorteners.RateLimitedShortener)), None,
+    )
+    # See the rate limit in `build_shortener`.
+    if token_bucket is not None and isinstance(async_shortener, shorteners.AsyncRequestBasedShortener):
+        async_shortener.retry_token_bucket = token_bucket
+
+    return build_shortener(
+        name, shortener_config, config, shorteners.EventLoopShortener(async_shortener, get_event_loop()),
+        circuit_breaker=circuit_breaker, token_bucket=token_bucket,
+    )
+
+
+def load_batch_executor(setup_state: blueprints.BlueprintSetupState) -> None:
+    """
+    Initialise a bounded worker pool used to shorten batch items concurrently.
+    """
+    global _batch_executor
+
+    _batch_executor = ThreadPoolExecutor(
+        max_workers=setup_state.app.config['SHORTLINKS_BATCH']['max_workers'],
+        thread_name_prefix='shortlinks-batch',
+    )
+
+
+def load_job_queue(setup_state: blueprints.BlueprintSetupState) -> None:
+    """
+    Initialise the queue of asynchronous shortening jobs. See `AppConfig.SHORTLINKS_JOBS`.
+    """
+    global _job_queue
+
+    jobs_config = setup_state.app.config['SHORTLINKS_JOBS']
+    if jobs_config['path']:
+        store = SqliteJobStore(jobs_config['path'], ttl=jobs_config['ttl'], pending_ttl=jobs_config['pending_ttl'])
+    else:
+        store = MemoryJobStore(ttl=jobs_config['ttl'], pending_ttl=jobs_config['pending_ttl'])
+
+    _job_queue = JobQueue(
+        store, max_workers=jobs_config['max_workers'], max_queued_items=jobs_config['max_queued_items'],
+    )
+
+
+def load_fallback_strategy(setup_state: blueprints.BlueprintSetupState) -> None:
+    """
+    Initialise the strategy of falling back between shortening providers. See `AppConfig.SHORTLINKS_FALLBACK`.
+    """
+    global _fallback_mode, _hedge_delay, _hedging_executor
+
+    fallback_config = setup_state.app.config['SHORTLINKS_FALLBACK']
+    if fallback_config['mode'] not in FALLBACK_MODES:
+        raise ValueError(f'Unknown fallback mode: {fallback_config["mode"]}. Available modes: {FALLBACK_MODES}')
+
+    _fallback_mode = fallback_config['mode']
+    _hedge_delay = 0.0 if _fallback_mode == 'race' else fallback_config['hedge_delay']
+    _hedging_executor = None
+    if _fallback_mode != 'sequential':
+        _hedging_executor = ThreadPoolExecutor(
+            max_workers=fallback_config['max_workers'],
+            thread_name_prefix='shortlinks-hedging',
+        )
+
+
+def load_provider_ranking(setup_state: blueprints.BlueprintSetupState) -> None:
+    """
+    Initialise adaptive ordering of providers. See `AppConfig.SHORTLINKS_ADAPTIVE_ORDERING`.
+    """
+    global _provider_ranking
+
+    ranking_config = dict(setup_state.app.config['SHORTLINKS_ADAPTIVE_ORDERING'])
+    _provider_ranking = ProviderRanking(**ranking_config) if ranking_config.pop('enabled') else None
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """
+    Stop batch, hedging and job worker pools.
+
+    :param wait: Whether to wait for in-flight shortening provider calls and queued job items to complete.
+    """
+    for executor in _batch_executor, _hedging_executor:
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    if _job_queue is not None:
+        _job_queue.shutdown(wait=wait)
+
+
+def close_shorteners() -> None:
+    """
+    Release resources (e.g. connection pools) held by all loaded shortening providers.
+    """
+    _close_loaded_shorteners()
+
+    if _job_queue is not None:
+        _job_queue.close()
+
+
+def _close_loaded_shorteners() -> None:
+    global _event_loop
+
+    for name, shortener in (*_shorteners_mapping.items(), *_async_shorteners_mapping.items()):
+        try:
+            shortener.close()
+        except Exception:
+            logger.exception('Could not close shortener %s', name)
+
+    _async_shorteners_mapping.clear()
+    if _event_loop is not None:
+        _event_loop.close()
+        _event_loop = None
+
+    if _shortlinks_store is not None:
+        _shortlinks_store.close()
+
+
+def request_deadline() -> ContextManager:
+    """
+    Return a context manager setting the current request deadline. See `AppConfig.SHORTLINKS_DEADLINE`.
+
+    :raises: flask_exceptions.BadRequest: If the deadline request header isn't a positive number of seconds.
+    """
+    deadline_config = current_app.config['SHORTLINKS_DEADLINE']
+    seconds = deadline_config['default'] or None
+    if (header := flask_request.headers.get(deadline_config['header'])) is not None:
+        try:
+            seconds = float(header)
+        except ValueError:
+            seconds = None
+        if seconds is None or not 0 < seconds < float('inf'):
+            raise flask_exceptions.BadRequest(
+                f'{deadline_config["header"]} header must be a positive number of seconds',
+            )
+
+        seconds = min(seconds, deadline_config['max'])
+
+    return deadline.scope(seconds)
+
+
+def _provider_name(shortener: shorteners.Shortener) -> str:
+    return getattr(shortener, 'provider', shortener.__class__.__name__)
+
+
 class ShortlinksAPI(MethodView):
     @classmethod
     def parse_request_json(cls, json: Mapping) -> schemas.ShortlinksRequest:
         try:
-            return schemas.ShortlinksRequest(**json)
+            with server_timing.timed('validate'), tracing.span('parse_request_json'):
+                if isinstance(json, Mapping):
+                    return schemas.parse_shortlinks_request(json)
+                return schemas.ShortlinksRequest(**json)
         except pydantic.ValidationError as e:
             logger.info('%s. Received invalid request. Body: %s', cls.__name__, json)
             logger.info('%s. Validation error: %s', cls.__name__, e)
-            raise APIValidationError(errors=e.errors())
+            # Round trip through JSON, as error contexts may contain values `jsonify` can't serialize (e.g. sets).
+            raise APIValidationError(errors=json_lib.loads(e.json()))
 
     @classmethod
     def _get_short_link(cls, long_link: str, shortener: shorteners.Shortener) -> str:
+        if deadline.expired():
+            logger.info('%s. No time left to try %s', cls.__name__, _provider_name(shortener))
+            raise flask_exceptions.GatewayTimeout
+
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            provider = _provider_name(shortener)
+            with server_timing.timed(f'provider.{provider}'), tracing.span('get_short_link', provider=provider):
+                short_link = cls._shorten_using(long_link, shortener)
+            succeeded = True
+            return short_link
+        except flask_exceptions.ServiceUnavailable:
+            # The provider has been skipped without a call, so there is nothing to rank it by.
+            succeeded = None
+            raise
+        except flask_exceptions.GatewayTimeout:
+            # Running out of the request deadline tells nothing about the provider either.
+            if deadline.expired():
+                succeeded = None
+            raise
+        finally:
+            if _provider_ranking is not None and succeeded is not None:
+                _provider_ranking.record(shortener, time.perf_counter() - started, succeeded)
+
+    @classmethod
+    def _get_short_link_or_fall_back(cls, long_link: str, shortener: shorteners.Shortener) -> str:
+        """
+        The same as `_get_short_link`, but counts a failure as a fall back to the next shortening provider.
+        """
+        try:
+            return cls._get_short_link(long_link, shortener)
+        except Exception:
+            metrics.FALLBACKS.labels(_provider_name(shortener)).inc()
+            raise
+
+    @classmethod
+    def _shorten_using(cls, long_link: str, shortener: shorteners.Shortener) -> str:
         try:
             logger.info('%s. Trying to shorten using %s', cls.__name__, shortener.__class__.__name__)
             logger.debug('%s. Long link: %s', cls.__name__, long_link)
             short_link = shortener.shorten(long_link)
-        except shortener_exceptions.ShorteningProviderTimeout:
-            exception_to_raise = flask_exceptions.GatewayTimeout
-        except shortener_exceptions.ShorteningProviderRequestException:
-            exception_to_raise = flask_exceptions.BadGateway
+        except shortener_exceptions.ShorteningProviderUnavailable as e:
+            logger.info('%s. Skipping unavailable provider: %s', cls.__name__, e)
+            raise flask_exceptions.ServiceUnavailable
+        except shortener_exceptions.ShorteningProviderTimeout as e:
+            exception_to_raise, error = flask_exceptions.GatewayTimeout, e
+        except shortener_exceptions.ShorteningProviderRequestException as e:
+            exception_to_raise, error = flask_exceptions.BadGateway, e
         else:
             logger.info('%s. The link has been successfully shortened.', cls.__name__)
             logger.debug('%s. Shortened: %s -> %s', cls.__name__, long_link, short_link)
             return short_link
 
-        logger.exception('An error occurred during shortening')
+        logger.error('An error occurred during shortening', exc_info=error)
         raise exception_to_raise
 
+    @classmethod
+    def _get_known_short_link(cls, long_link: str, *shorteners_: shorteners.Shortener) -> str | None:
+        for shortener in shorteners_:
+            if isinstance(shortener, shorteners.WrappedShortener) and (short_link := shortener.peek(long_link)):
+                logger.info('%s. Found known short link for provider %s', cls.__name__, shortener.provider)
+                return short_link
+
+        return None
+
     @classmethod
     def get_short_link(cls, long_link: str, shortener: shorteners.Shortener, *fallback_shorteners) -> str:
-        for shortener in shortener, *fallback_shorteners:
+        if short_link := cls._get_known_short_link(long_link, shortener, *fallback_shorteners):
+            return short_link
+
+        # A failure of any but the last shortener means falling back to the next one.
+        *leading_shorteners, last_shortener = shortener, *fallback_shorteners
+        calls = [
+            *(functools.partial(cls._get_short_link_or_fall_back, long_link, shortener_)
+              for shortener_ in leading_shorteners),
+            functools.partial(cls._get_short_link, long_link, last_shortener),
+        ]
+
+        if fallback_shorteners and _hedging_executor is not None:
+            logger.info('%s. Shortening using %s fallback.', cls.__name__, _fallback_mode)
+            # Calls run in copies of the current context to keep the request deadline and timing.
+            return hedged_call(
+                _hedging_executor,
+                (functools.partial(contextvars.copy_context().run, call) for call in calls),
+                hedge_delay=_hedge_delay,
+            )
+
+        for call in calls[:-1]:
             try:
-                return cls._get_short_link(long_link, shortener)
-            except Exception as e:
-                last_exception = e
+                return call()
+            except Exception:
+                pass
 
-        raise last_exception
+        return calls[-1]()
 
     @classmethod
-    @swag_from('shortlinks.yml')
+    def shorten(cls, request: schemas.ShortlinksRequest) -> str:
+        """
+        Shorten a requested url using the requested shortening provider or any available one.
+        """
+        if request.provider:
+            return cls.get_short_link(request.url, shortener=_shorteners_mapping[request.provider])
+
+        logger.info('%s. Trying to shorten using all shorteners.', cls.__name__)
+        shorteners_ = _shorteners_mapping.values()
+        if _provider_ranking is not None:
+            shorteners_ = _provider_ranking.order(shorteners_)
+
+        return cls.get_short_link(request.url, *shorteners_)
+
+    @classmethod
+    @openapi.spec_from_file('shortlinks.yml')
     def post(cls) -> Response:
-        request = cls.parse_request_json(flask_request.json)
-        logger.debug('%s. Received request. Body: %s', cls.__name__, flask_request.json)
+        with server_timing.timed('parse'):
+            json = flask_request.json
+        request = cls.parse_request_json(json)
+        logger.debug('%s. Received request. Body: %s', cls.__name__, json)
         logger.info('%s. Provider name from request: %s.', cls.__name__, request.provider)
 
+        with request_deadline():
+            short_link = cls.shorten(request)
+        with server_timing.timed('respond'):
+            response = Response(schemas.dump_shortlinks_response(request.url, short_link), mimetype='application/json')
+        logger.debug('%s. Prepared response: %s', cls.__name__, response.data)
+
+        return response
+
+    @classmethod
+    def get(cls) -> Response:
+        """
+        Idempotent counterpart of `POST /shortlinks` for CDNs and reverse proxies to cache. Responses have
+        a strong `ETag` and `Cache-Control` headers, and `If-None-Match` requests of a current `ETag` get `304`.
+        ---
+        parameters:
+          - in: query
+            name: url
+            description: URL to shorten.
+            type: string
+            required: true
+            example: "https://example.com"
+          - in: query
+            name: provider
+            description: "Shortening provider to use for shortening. If the `provider` is omitted, then the service
+                          will try to shorten a given URL using any available shortening provider."
+            type: string
+            enum: [ 'bitly', 'tinyurl', 'local' ]
+            required: false
+          - in: header
+            name: If-None-Match
+            description: "`ETag` of a cached response to revalidate."
+            type: string
+            required: false
+        responses:
+          200:
+            description: Response with shortened url, the same as of `POST /shortlinks`.
+          304:
+            description: The cached response with a given `ETag` is still valid.
+          422:
+            description: Invalid/unprocessable query parameters received.
+        """
+        query = {name: flask_request.args[name] for name in ('url', 'provider') if name in flask_request.args}
+        request = cls.parse_request_json(query)
+        logger.info('%s. Provider name from request: %s.', cls.__name__, request.provider)
+
+        with request_deadline():
+            short_link = cls.shorten(request)
+        with server_timing.timed('respond'):
+            response = Response(schemas.dump_shortlinks_response(request.url, short_link), mimetype='application/json')
+            http_cache_config = current_app.config['SHORTLINKS_HTTP_CACHE']
+            response.headers['Cache-Control'] = (
+                f'public, max-age={http_cache_config["max_age"]}, '
+                f'stale-while-revalidate={http_cache_config["stale_while_revalidate"]}'
+            )
+            response.add_etag()
+
+        return response.make_conditional(flask_request)
+
+
+class AsyncShortlinksAPI(ShortlinksAPI):
+    """
+    `ShortlinksAPI` counterpart making shortening provider requests with `AsyncShortener`s, behind the same shortener
+    layers as blocking shorteners (see `build_async_shortener`). Provider requests of all server threads run on
+    a single shared event loop, so that they share its pooled connections.
+
+    Shortener layers block, so the view itself is a blocking one: each request still takes a server thread, which
+    waits for the shared event loop.
+    """
+
+    # Short links are looked up with `GET /shortlinks`.
+    methods = {'POST'}
+
+    @classmethod
+    def shorten(cls, request: schemas.ShortlinksRequest) -> str:
         if request.provider:
-            short_link = cls.get_short_link(request.url, shortener=_shorteners_mapping[request.provider])
-        else:
-            logger.info('%s. Trying to shorten using all shorteners.', cls.__name__)
-            short_link = cls.get_short_link(request.url, *_shorteners_mapping.values())
+            return cls.get_short_link(request.url, get_async_shortener(request.provider))
 
-        response_data = schemas.ShortlinksResponse(url=request.url, link=short_link)
-        response = jsonify(response_data.dict())
-        logger.debug('%s. Prepared response: %s', cls.__name__, response.data)
+        logger.info('%s. Trying to shorten using all shorteners.', cls.__name__)
+        shorteners_ = [get_async_shortener(name) for name in _async_shortener_factories]
+        if _provider_ranking is not None:
+            shorteners_ = _provider_ranking.order(shorteners_)
+
+        return cls.get_short_link(request.url, *shorteners_)
+
+    @classmethod
+    def post(cls) -> Response:
+        """
+        The same as `POST /shortlinks`, but shortening provider requests are made with async shorteners.
+        ---
+        parameters:
+          - in: body
+            name: body
+            required: true
+            schema:
+              type: object
+              properties:
+                url:
+                  type: string
+                  example: "https://example.com"
+                provider:
+                  type: string
+                  enum: [ 'bitly', 'tinyurl' ]
+        responses:
+          200:
+            description: Response with shortened url.
+          501:
+            description: Requested shortening provider has no async shortener.
+        """
+        request = cls.parse_request_json(flask_request.json)
+        logger.info('%s. Provider name from request: %s.', cls.__name__, request.provider)
+
+        if request.provider and request.provider not in _async_shortener_factories:
+            raise flask_exceptions.NotImplemented(description=f'Provider {request.provider} has no async shortener.')
+
+        with request_deadline():
+            short_link = cls.shorten(request)
+
+        return Response(schemas.dump_shortlinks_response(request.url, short_link), mimetype='application/json')
+
+
+class ShortlinksBatchAPI(MethodView):
+    @staticmethod
+    def _validation_error(msg: str, type_: str) -> APIValidationError:
+        return APIValidationError(errors=[{'loc': ['__root__'], 'msg': msg, 'type': type_}])
+
+    @classmethod
+    def parse_request_json(cls, json: Any, max_items: int) -> list[schemas.ShortlinksRequest | APIValidationError]:
+        """
+        Validate a batch as a whole and each of its items separately.
+
+        :raises: APIValidationError: If the batch itself is invalid.
+        :return: Parsed request or validation error for each batch item, in the input order.
+        """
+        if not isinstance(json, list):
+            raise cls._validation_error('value is not a valid list', 'type_error.list')
+        if not 0 < len(json) <= max_items:
+            raise cls._validation_error(
+                f'ensure this value has between 1 and {max_items} items', 'value_error.list.size',
+            )
+
+        items = []
+        for item in json:
+            try:
+                if not isinstance(item, Mapping):
+                    raise cls._validation_error('value is not a valid dict', 'type_error.dict')
+                items.append(ShortlinksAPI.parse_request_json(item))
+            except APIValidationError as e:
+                items.append(e)
+
+        return items
+
+    @classmethod
+    def _shorten_item(cls, request: schemas.ShortlinksRequest) -> dict:
+        return {'url': request.url, 'link': ShortlinksAPI.shorten(request)}
+
+    @classmethod
+    def _item_result(cls, item: Any, outcome: APIValidationError | Future | Callable[[], dict]) -> dict:
+        try:
+            if isinstance(outcome, APIValidationError):
+                raise outcome
+            return outcome.result() if isinstance(outcome, Future) else outcome()
+        except flask_exceptions.HTTPException as e:
+            exception = e
+        except Exception as e:
+            logger.exception('An error occurred during batch item shortening')
+            exception = flask_exceptions.InternalServerError(original_exception=e)
+
+        return {'url': item.get('url') if isinstance(item, Mapping) else None, 'error': error_payload(exception)}
 
+    @classmethod
+    def shorten_batch(
+        cls, items: Sequence[schemas.ShortlinksRequest | APIValidationError],
+    ) -> list[Future | APIValidationError]:
+        """
+        Shorten valid batch items concurrently. Identical items are shortened only once.
+
+        :return: Future holding the result or validation error for each batch item, in the input order.
+        """
+        futures: dict[tuple[str, str | None], Future] = {}
+        for item in items:
+            if isinstance(item, schemas.ShortlinksRequest) and (key := (item.url, item.provider)) not in futures:
+                futures[key] = _batch_executor.submit(contextvars.copy_context().run, cls._shorten_item, item)
+
+        logger.info('%s. Shortening %s unique items of %s.', cls.__name__, len(futures), len(items))
+        return [futures[(item.url, item.provider)] if isinstance(item, schemas.ShortlinksRequest) else item
+                for item in items]
+
+    @classmethod
+    @openapi.spec_from_file('shortlinks_batch.yml')
+    def post(cls) -> Response:
+        json = flask_request.json
+        items = cls.parse_request_json(json, max_items=current_app.config['SHORTLINKS_BATCH']['max_items'])
+        # The whole batch shares the request deadline.
+        with request_deadline():
+            outcomes = cls.shorten_batch(items)
+            results = [cls._item_result(item, outcome) for item, outcome in zip(json, outcomes)]
+
+        return jsonify(results)
+
+
+class ShortlinksStreamAPI(ShortlinksBatchAPI):
+    mimetype = 'application/x-ndjson'
+
+    @classmethod
+    def _read_lines(cls, stream: IO[bytes], max_line_size: int) -> Iterator[tuple[int, bytes | None]]:
+        """
+        Read lines from `stream` one by one. Lines longer than `max_line_size` bytes are skipped and
+        reported as `None`, so a single line can't exhaust memory.
+        """
+        line_number = 0
+        while line := stream.readline(max_line_size + 1):
+            line_number += 1
+            if len(line) > max_line_size and not line.endswith(b'\n'):
+                while (rest := stream.readline(max_line_size)) and not rest.endswith(b'\n'):
+                    pass
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+
+    @classmethod
+    def parse_line(cls, line: bytes | None) -> tuple[Any, schemas.ShortlinksRequest | APIValidationError]:
+        """
+        Parse a single NDJSON line.
+
+        :return: Raw line item and its parsed request or validation error.
+        """
+        if line is None:
+            return None, cls._validation_error('line is too long', 'value_error.line.size')
+
+        try:
+            item = json_lib.loads(line)
+        except ValueError:
+            return None, cls._validation_error('line is not a valid JSON', 'value_error.json')
+
+        if not isinstance(item, Mapping):
+            return item, cls._validation_error('value is not a valid dict', 'type_error.dict')
+
+        try:
+            return item, ShortlinksAPI.parse_request_json(item)
+        except APIValidationError as e:
+            return item, e
+
+    @classmethod
+    def shorten_stream(cls, stream: IO[bytes], max_in_flight: int, max_line_size: int) -> Iterator[str]:
+        """
+        Shorten NDJSON items read from `stream` concurrently, keeping at most `max_in_flight` items in progress.
+
+        :return: NDJSON lines with results, in the order items are processed.
+        """
+        in_flight: dict[Future, tuple[int, Any]] = {}
+
+        def serialize(line_number: int, item: Any, outcome: APIValidationError | Future) -> str:
+            return json_lib.dumps({'line': line_number, **cls._item_result(item, outcome)}) + '\n'
+
+        def complete_any() -> Iterator[str]:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield serialize(*in_flight.pop(future), future)
+
+        for line_number, line in cls._read_lines(stream, max_line_size):
+            item, request = cls.parse_line(line)
+            if isinstance(request, APIValidationError):
+                yield serialize(line_number, item, request)
+                continue
+
+            while len(in_flight) >= max_in_flight:
+                yield from complete_any()
+            # Items are shortened in copies of the current context to keep the request deadline and timing.
+            future = _batch_executor.submit(contextvars.copy_context().run, cls._shorten_item, request)
+            in_flight[future] = (line_number, item)
+
+        while in_flight:
+            yield from complete_any()
+
+    @classmethod
+    def post(cls) -> Response:
+        """
+        Shorten URLs streamed as newline-delimited JSON `{"url": ..., "provider": ...}` items.
+        Results are streamed back as newline-delimited JSON as soon as they are ready, each with
+        the `line` number of its item and either a `link` or an `error`.
+        ---
+        consumes:
+          - application/x-ndjson
+        produces:
+          - application/x-ndjson
+        parameters:
+          - in: body
+            name: body
+            description: Newline-delimited JSON items with `url` and optional `provider`.
+            required: true
+            schema:
+              type: string
+              example: '{"url": "https://example.com", "provider": "bitly"}'
+        responses:
+          200:
+            description: Newline-delimited JSON results in the completion order.
+        """
+        stream_config = current_app.config['SHORTLINKS_STREAM']
+        results = cls.shorten_stream(
+            flask_request.stream,
+            max_in_flight=stream_config['max_in_flight'],
+            max_line_size=stream_config['max_line_size'],
+        )
+
+        return Response(stream_with_context(results), mimetype=cls.mimetype)
+
+
+class ShortlinkRedirectAPI(MethodView):
+    @classmethod
+    def get(cls, code: str) -> Response:
+        """
+        Redirect to the original url of a short link generated by a `local` shortening provider.
+        ---
+        parameters:
+          - in: path
+            name: code
+            description: Short link code.
+            type: string
+            required: true
+        responses:
+          302:
+            description: Redirect to the original url.
+          404:
+            description: Unknown short link code.
+        """
+        for shortener in get_local_shorteners():
+            if long_url := shortener.resolve(code):
+                logger.debug('%s. Resolved %s -> %s', cls.__name__, code, long_url)
+                return redirect(long_url)
+
+        raise flask_exceptions.NotFound
+
+
+class ShortlinksJobsAPI(MethodView):
+    @classmethod
+    @openapi.spec_from_file('shortlinks_jobs.yml')
+    def post(cls) -> Response:
+        json = flask_request.json
+        json_items = [json] if isinstance(json, Mapping) else json
+        items = ShortlinksBatchAPI.parse_request_json(
+            json_items, max_items=current_app.config['SHORTLINKS_BATCH']['max_items'],
+        )
+
+        records, tasks = [], {}
+        for position, (json_item, item) in enumerate(zip(json_items, items)):
+            if isinstance(item, APIValidationError):
+                records.append(ShortlinksBatchAPI._item_result(json_item, item))
+            else:
+                records.append({'url': item.url, 'status': 'pending'})
+                tasks[position] = functools.partial(
+                    ShortlinksBatchAPI._item_result, json_item,
+                    functools.partial(ShortlinksBatchAPI._shorten_item, item),
+                )
+
+        try:
+            job_id = _job_queue.submit(records, tasks)
+        except JobQueueFull as e:
+            logger.warning('%s. Rejected job: %s', cls.__name__, e)
+            raise flask_exceptions.ServiceUnavailable(description=str(e), retry_after=1)
+
+        logger.info('%s. Submitted job %s of %s items.', cls.__name__, job_id, len(records))
+        response = jsonify(_job_queue.get(job_id))
+        response.status_code = 202
+        response.headers['Location'] = url_for('shortlink.shortlink_job', job_id=job_id)
         return response
 
 
+class ShortlinkJobAPI(MethodView):
+    @classmethod
+    def get(cls, job_id: str) -> Response:
+        """
+        Shortening job status and results.
+        ---
+        parameters:
+          - in: path
+            name: job_id
+            type: string
+            required: true
+        responses:
+          200:
+            description: "Job with `status` (`pending` or `done`) and `items` in the submitted order. An item has
+                          either `link`, `error` or `status: pending`."
+          404:
+            description: Job is not found or has expired.
+        """
+        job = _job_queue.get(job_id)
+        if job is None:
+            raise flask_exceptions.NotFound(description=f'Job {job_id} is not found or has expired.')
+
+        return jsonify(job)
+
+
+class ShortlinksStatsAPI(MethodView):
+    @classmethod
+    def _provider_stats(cls, shortener: shorteners.Shortener) -> dict:
+        stats = {
+            layer.stats_name: layer.stats()
+            for layer in shorteners.iter_layers(shortener) if getattr(layer, 'stats_name', None)
+        }
+        if _provider_ranking is not None:
+            stats['ranking'] = _provider_ranking.stats(shortener)
+
+        return stats
+
+    @classmethod
+    def get(cls) -> Response:
+        """
+        Shortlinks service monitoring data.
+        ---
+        responses:
+          200:
+            description: Monitoring data of the shortlinks service internals.
+        """
+        return jsonify({
+            'cache': _shortlinks_cache.stats() if _shortlinks_cache is not None else None,
+            'store': _shortlinks_store.stats() if _shortlinks_store is not None else None,
+            'jobs': _job_queue.stats() if _job_queue is not None else None,
+            'tracing': tracing.stats(),
+            'providers': {name: cls._provider_stats(shortener) for name, shortener in _shorteners_mapping.items()},
+        })
+
+
 blueprint.record(load_shorteners)
+blueprint.record(load_batch_executor)
+blueprint.record(load_fallback_strategy)
+blueprint.record(load_provider_ranking)
+blueprint.record(load_job_queue)
 blueprint.add_url_rule('/shortlinks', view_func=ShortlinksAPI.as_view('shortlinks'))
+blueprint.add_url_rule('/shortlinks/async', view_func=AsyncShortlinksAPI.as_view('shortlinks_async'))
+blueprint.add_url_rule('/shortlinks/batch', view_func=ShortlinksBatchAPI.as_view('shortlinks_batch'))
+blueprint.add_url_rule('/shortlinks/stream', view_func=ShortlinksStreamAPI.as_view('shortlinks_stream'))
+blueprint.add_url_rule('/shortlinks/jobs', view_func=ShortlinksJobsAPI.as_view('shortlinks_jobs'))
+blueprint.add_url_rule('/shortlinks/jobs/<job_id>', view_func=ShortlinkJobAPI.as_view('shortlink_job'))
+blueprint.add_url_rule('/<code>', view_func=ShortlinkRedirectAPI.as_view('shortlink_redirect'))
+blueprint.add_url_rule('/shortlinks/stats', view_func=ShortlinksStatsAPI.as_view('shortlinks_stats'))
@@ -0,0 +1,391 @@
+"""
+Per request tracing. A trace is a tree of timed spans: the request itself, its validation, each shortening provider
+attempt and each outbound provider call. Trace context is propagated with the W3C `traceparent` header: taken from
+incoming requests and passed on to shortening providers.
+
+Traces are kept by a tail-based sampler once their requests are done and appended to a JSONL file, a span per line,
+by a background thread in batches.
+"""
+import contextvars
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any
+
+from flask import Flask, Response, g, request
+
+__all__ = (
+    'init_app',
+    'parse_traceparent',
+    'span',
+    'stats',
+    'stop',
+    'traceparent',
+    'JsonlSpanExporter',
+    'Span',
+    'TailSampler',
+    'Trace',
+    'Tracer',
+)
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'traceparent'
+
+# `version-trace id-parent span id-flags`, see https://www.w3.org/TR/trace-context/#traceparent-header.
+_TRACEPARENT_RE = re.compile(r'([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})')
+_INVALID_TRACE_ID = '0' * 32
+_INVALID_SPAN_ID = '0' * 16
+_SAMPLED_FLAG = 0x01
+
+_current_span: contextvars.ContextVar['Span | None'] = contextvars.ContextVar('span', default=None)
+# Shared no-op context manager returned by `span` while there is no trace, so that it costs a single lookup.
+_NOT_TRACED = nullcontext()
+
+_tracer: 'Tracer | None' = None
+
+
+def _new_id(bits: int) -> str:
+    return f'{random.getrandbits(bits):0{bits // 4}x}'
+
+
+class Trace:
+    """
+    Spans of a single request. Spans are added once they end, possibly by several threads.
+    """
+
+    __slots__ = ('trace_id', 'sampled', 'spans')
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: list[Span] = []
+
+
+class Span:
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'attributes', 'started_at', 'started', 'duration', 'error')
+
+    def __init__(self, trace: Trace, name: str, parent_id: str | None, attributes: dict[str, Any]):
+        self.trace = trace
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        # Wall clock start time to order spans of different processes, and monotonic one to time the span.
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration: float | None = None
+        self.error: str | None = None
+
+    def set(self, name: str, value: Any) -> None:
+        self.attributes[name] = value
+
+    def end(self, error: BaseException | None = None) -> None:
+        self.duration = time.perf_counter() - self.started
+        if error is not None:
+            self.error = error.__class__.__name__
+        # `list.append` is atomic, so spans may be ended by several threads at once.
+        self.trace.spans.append(self)
+
+    def traceparent(self) -> str:
+        return f'00-{self.trace.trace_id}-{self.span_id}-{_SAMPLED_FLAG if self.trace.sampled else 0:02x}'
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'trace_id': self.trace.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.started_at,
+            'duration_ms': round(self.duration * 1000, 3),
+            'error': self.error,
+            'attributes': self.attributes,
+        }
+
+
+class _SpanScope:
+    __slots__ = ('span', 'token')
+
+    def __init__(self, span_: Span):
+        self.span = span_
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, _, error: BaseException | None, __) -> None:
+        _current_span.reset(self.token)
+        self.span.end(error)
+
+
+def span(name: str, **attributes: Any) -> _SpanScope | nullcontext:
+    """
+    Return a context manager recording its block as a `name` span, a child of the current one.
+    It does nothing, and enters `None`, if tracing is off or there is no request being traced.
+    Code run on other threads records spans only if it's run in a copy of the current context.
+
+    :param name: Span name.
+    :param attributes: Span attributes. More can be set with `Span.set` within the block.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return _NOT_TRACED
+
+    return _SpanScope(Span(parent.trace, name, parent.span_id, attributes))
+
+
+def traceparent() -> str | None:
+    """
+    Return the `traceparent` header value to pass the current span on to a downstream service, if any.
+    """
+    current = _current_span.get()
+    return None if current is None else current.traceparent()
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """
+    Parse a `traceparent` header value.
+
+    :return: Trace id, parent span id and whether the caller has sampled the trace, `None` if the value is invalid.
+    """
+    match = _TRACEPARENT_RE.fullmatch(value.strip().lower()) if value else None
+    if match is None:
+        return None
+
+    version, trace_id, parent_id, flags = match.groups()
+    if version == 'ff' or trace_id == _INVALID_TRACE_ID or parent_id == _INVALID_SPAN_ID:
+        return None
+
+    return trace_id, parent_id, bool(int(flags, 16) & _SAMPLED_FLAG)
+
+
+class TailSampler:
+    """
+    Keep traces sampled when their requests start, and all traces of slow requests once they are done.
+    """
+
+    def __init__(self, sample_rate: float, slow_threshold: float | None):
+        """
+        Initialize `TailSampler`.
+
+        :param sample_rate: Share of traces to keep regardless of their duration, unless the caller has decided.
+        :param slow_threshold: Seconds; traces of requests taking at least that long are always kept.
+            `None` means only `sample_rate` applies.
+        """
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+
+    def sample(self, parent_sampled: bool | None) -> bool:
+        """
+        Decide whether to keep a trace when its request starts.
+
+        :param parent_sampled: The `traceparent` sampled flag of the request, `None` if there is no `traceparent`.
+        """
+        if parent_sampled is not None:
+            return parent_sampled
+
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def keep(self, trace: Trace, duration: float) -> bool:
+        """
+        Decide whether to keep a trace when its request is done.
+        """
+        return trace.sampled or self.slow_threshold is not None and duration >= self.slow_threshold
+
+
+class JsonlSpanExporter:
+    """
+    Background thread appending spans of traces to a JSONL file, a span per line. Traces are queued by request
+    threads, which never wait for the file, and written in batches of up to `batch_size` traces at least once
+    per `flush_interval` seconds.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 1.0, queue_size: int = 10_000):
+        """
+        Initialize `JsonlSpanExporter` and start its thread.
+
+        :param path: JSONL file path. Spans are appended to the file, which may be shared by several processes.
+        :param batch_size: Max number of traces written at once.
+        :param flush_interval: Max seconds a queued trace waits for its batch to fill up.
+        :param queue_size: Max number of traces waiting to be written. Traces are dropped when the queue is full.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.exported = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name='tracing-exporter', daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _next_batch(self) -> list:
+        batch = [self._queue.get()]
+        flush_at = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+            try:
+                batch.append(self._queue.get(timeout=max(flush_at - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self) -> None:
+        # Unbuffered, so that a batch is appended with a single `write` and doesn't interleave with other processes.
+        with open(self.path, 'ab', buffering=0) as file:
+            stopped = False
+            while not stopped:
+                batch = self._next_batch()
+                if stopped := batch[-1] is self._STOP:
+                    batch.pop()
+
+                # Spans ended after their request, e.g. by losing hedged calls, may or may not make it.
+                lines = [json.dumps(span_.as_dict(), default=str) for trace in batch for span_ in list(trace.spans)]
+                try:
+                    if lines:
+                        file.write(('\n'.join(lines) + '\n').encode())
+                    self.exported += len(batch)
+                except OSError:
+                    logger.exception('Failed to write %s traces to %s', len(batch), self.path)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """
+        Write out queued traces and stop the thread.
+        """
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'queued': self._queue.qsize(),
+            'exported': self.exported,
+            'dropped': self.dropped,
+        }
+
+
+class Tracer:
+    """
+    Start request traces and hand the ones `sampler` keeps over to `exporter`.
+    """
+
+    def __init__(self, exporter: JsonlSpanExporter, sampler: TailSampler):
+        self.exporter = exporter
+        self.sampler = sampler
+        self.started = 0
+        self.kept = 0
+        self.kept_slow = 0
+
+    def start(self, name: str, parent: str | None = None, **attributes: Any) -> Span:
+        """
+        Start the root span of a new trace.
+
+        :param name: Span name.
+        :param parent: Incoming `traceparent` header value. The trace continues it, if it's valid.
+        :param attributes: Span attributes.
+        """
+        self.started += 1
+        if parsed := parse_traceparent(parent):
+            trace_id, parent_id, parent_sampled = parsed
+        else:
+            trace_id, parent_id, parent_sampled = _new_id(128), None, None
+
+        return Span(Trace(trace_id, self.sampler.sample(parent_sampled)), name, parent_id, attributes)
+
+    def finish(self, root: Span, error: BaseException | None = None) -> None:
+        root.end(error)
+        if self.sampler.keep(root.trace, root.duration):
+            self.kept += 1
+            self.kept_slow += not root.trace.sampled
+            self.exporter.export(root.trace)
+
+    def close(self) -> None:
+        self.exporter.close()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'started': self.started,
+            'kept': self.kept,
+            'kept_slow': self.kept_slow,
+            **self.exporter.stats(),
+        }
+
+
+def _before_request() -> None:
+    if _tracer is None:
+        return
+
+    root = _tracer.start(
+        'request', request.headers.get(HEADER), **{'http.method': request.method, 'http.path': request.path},
+    )
+    g.tracing_span = root
+    g.tracing_token = _current_span.set(root)
+
+
+def _after_request(response: Response) -> Response:
+    if (root := g.get('tracing_span')) is not None:
+        root.set('http.status_code', response.status_code)
+        if request.url_rule is not None:
+            root.set('http.route', request.url_rule.rule)
+
+    return response
+
+
+def _teardown_request(error: BaseException | None) -> None:
+    if (token := g.pop('tracing_token', None)) is not None:
+        _current_span.reset(token)
+    if (root := g.pop('tracing_span', None)) is not None and _tracer is not None:
+        _tracer.finish(root, error)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Register hooks tracing requests and start the tracer if `TRACING` is enabled in the app config.
+    Replaces the previously configured tracer, if any.
+    """
+    global _tracer
+
+    stop()
+
+    tracing_config = dict(app.config['TRACING'])
+    if tracing_config.pop('enabled'):
+        exporter = JsonlSpanExporter(
+            tracing_config['path'],
+            batch_size=tracing_config['batch_size'],
+            flush_interval=tracing_config['flush_interval'],
+            queue_size=tracing_config['queue_size'],
+        )
+        _tracer = Tracer(exporter, TailSampler(tracing_config['sample_rate'], tracing_config['slow_threshold']))
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+
+def stop() -> None:
+    """
+    Write out queued traces and stop tracing, if it's configured.
+    """
+    global _tracer
+
+    if _tracer is None:
+        return
+
+    _tracer.close()
+    _tracer = None
+
+
+def stats() -> dict[str, int] | None:
+    return None if _tracer is None else _tracer.stats()
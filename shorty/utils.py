@@ -4,14 +4,21 @@ from typing import TypeVar, Type
 from urllib.parse import urljoin as legacy_url_join
 
 __all__ = (
+    'base62_decode',
+    'base62_encode',
     'urljoin',
     'get_env',
+    'str_to_bool',
+    'str_to_tuple',
 )
 
 T = TypeVar('T')
 
 _NOT_SET = object()
 
+BASE62_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_BASE62_INDEX = {char: index for index, char in enumerate(BASE62_ALPHABET)}
+
 
 def get_env(env_name: str, default: T | None = _NOT_SET, converter: Type[T] = str) -> T | None:
     """
@@ -25,6 +32,32 @@ def get_env(env_name: str, default: T | None = _NOT_SET, converter: Type[T] = st
         return default
 
 
+def str_to_bool(value: str | bool) -> bool:
+    """
+    Convert a string flag (e.g. from environment variables) to `bool`.
+    """
+    if isinstance(value, bool):
+        return value
+
+    normalized = value.strip().lower()
+    if normalized in ('1', 'true', 'yes', 'on'):
+        return True
+    if normalized in ('0', 'false', 'no', 'off', ''):
+        return False
+
+    raise ValueError(f'Invalid boolean value: {value!r}')
+
+
+def str_to_tuple(value: str | tuple) -> tuple[str, ...]:
+    """
+    Convert a comma-separated string (e.g. from environment variables) to a tuple of non-empty items.
+    """
+    if isinstance(value, tuple):
+        return value
+
+    return tuple(item.strip() for item in value.split(',') if item.strip())
+
+
 def urljoin(base: str, url: str, allow_fragments: bool = True) -> str:
     """
     Join `base` url to a `url`.
@@ -45,3 +78,37 @@ def dynamically_load(class_path: str) -> Type:
     class_ = getattr(importlib.import_module(module), shortener_class_name)
 
     return class_
+
+
+def base62_encode(number: int) -> str:
+    """
+    Encode a non-negative integer using [0-9a-zA-Z] alphabet.
+    """
+    if number < 0:
+        raise ValueError('Only non-negative integers can be base62 encoded.')
+
+    chars = []
+    while True:
+        number, remainder = divmod(number, 62)
+        chars.append(BASE62_ALPHABET[remainder])
+        if not number:
+            return ''.join(reversed(chars))
+
+
+def base62_decode(code: str) -> int:
+    """
+    Decode an integer encoded with `base62_encode`.
+
+    :raises: ValueError: If `code` isn't a valid base62 string.
+    """
+    if not code:
+        raise ValueError('Empty base62 code.')
+
+    number = 0
+    for char in code:
+        try:
+            number = number * 62 + _BASE62_INDEX[char]
+        except KeyError:
+            raise ValueError(f'Invalid base62 code: {code!r}') from None
+
+    return number
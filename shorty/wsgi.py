@@ -0,0 +1,6 @@
+"""
+WSGI entry point for external servers, e.g. `gunicorn shorty.wsgi:app`.
+"""
+from shorty.app import create_app
+
+app = create_app()
@@ -12,7 +12,9 @@ from flask import Flask
 from flask.testing import FlaskClient
 
 from shorty import app as app_module
+from shorty.shortlink import views
 from shorty.shortlink.schemas import ShortlinksRequest
+from shorty.shortlink.shorteners import CircuitBreakerShortener, iter_layers
 
 root = os.path.join(os.path.dirname(__file__))
 package = os.path.join(root, '..')
@@ -50,7 +52,7 @@ def humanize_werkzeug_client(client_method) -> Callable:
         # If data is present then make sure it is json encoded.
         if 'data' in kwargs:
             data = kwargs['data']
-            if isinstance(data, dict):
+            if isinstance(data, (dict, list)):
                 kwargs['data'] = json.dumps(data)
 
         kwargs['buffered'] = True
@@ -74,6 +76,20 @@ def app(request, session_mocker) -> Flask:
     return app
 
 
+@pytest.fixture(autouse=True)
+def clear_shortlinks_cache(app) -> None:
+    if views._shortlinks_cache is not None:
+        views._shortlinks_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers(app) -> None:
+    for shortener in views._shorteners_mapping.values():
+        for layer in iter_layers(shortener):
+            if isinstance(layer, CircuitBreakerShortener):
+                layer.circuit_breaker.reset()
+
+
 @pytest.fixture
 def client(app) -> FlaskClient:
     return app.test_client()
@@ -0,0 +1,28 @@
+import pytest
+
+from shorty.shortlink.bloom import BloomFilter
+
+
+def test_added_keys_present() -> None:
+    bloom = BloomFilter(capacity=1000)
+    keys = [f'https://example.com/{i}' for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 1000
+
+
+def test_false_positive_rate() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f'https://example.com/{i}')
+
+    false_positives = sum(f'https://other.com/{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.parametrize('capacity,error_rate', ((0, 0.01), (10, 0), (10, 1)))
+def test_invalid_parameters(capacity, error_rate) -> None:
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=capacity, error_rate=error_rate)
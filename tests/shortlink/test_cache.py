@@ -0,0 +1,54 @@
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shorty.shortlink.cache import ShortlinkCache
+
+
+@pytest.fixture
+def cache() -> ShortlinkCache:
+    return ShortlinkCache(max_entries=2, ttl=10)
+
+
+def test_get_set(cache) -> None:
+    assert cache.get('key') is None
+    cache.set('key', 'value')
+    assert cache.get('key') == 'value'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_get_without_stats(cache) -> None:
+    cache.set('key', 'value')
+    assert cache.get('key', record_stats=False) == 'value'
+    assert cache.get('other', record_stats=False) is None
+    assert cache.stats()['hits'] == 0
+    assert cache.stats()['misses'] == 0
+
+
+def test_lru_eviction(cache) -> None:
+    cache.set('a', '1')
+    cache.set('b', '2')
+    cache.get('a')
+    cache.set('c', '3')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == '1'
+    assert cache.get('c') == '3'
+    assert cache.stats()['evictions'] == 1
+    assert len(cache) == 2
+
+
+def test_ttl_expiration(mocker: MockerFixture, cache) -> None:
+    cache.set('key', 'value')
+    mocker.patch.object(time, attribute='monotonic', return_value=time.monotonic() + 11)
+
+    assert cache.get('key') is None
+    assert cache.stats()['expirations'] == 1
+    assert len(cache) == 0
+
+
+def test_invalid_max_entries() -> None:
+    with pytest.raises(ValueError):
+        ShortlinkCache(max_entries=0)
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shorty.shortlink.circuit_breaker import CircuitBreaker, CircuitState
+
+
+@pytest.fixture
+def circuit_breaker() -> CircuitBreaker:
+    return CircuitBreaker(failure_rate_threshold=0.5, window=10, min_calls=4, open_duration=5, half_open_max_calls=1)
+
+
+def _open(circuit_breaker: CircuitBreaker) -> None:
+    for _ in range(4):
+        assert circuit_breaker.allow_request()
+        circuit_breaker.record_failure()
+
+
+def test_stays_closed_below_threshold(circuit_breaker) -> None:
+    for _ in range(3):
+        circuit_breaker.record_success()
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.state is CircuitState.CLOSED
+    assert circuit_breaker.allow_request()
+
+
+def test_stays_closed_below_min_calls(circuit_breaker) -> None:
+    for _ in range(3):
+        circuit_breaker.record_failure()
+
+    assert circuit_breaker.state is CircuitState.CLOSED
+
+
+def test_opens(circuit_breaker) -> None:
+    _open(circuit_breaker)
+
+    assert circuit_breaker.state is CircuitState.OPEN
+    assert not circuit_breaker.allow_request()
+    assert circuit_breaker.stats()['rejected'] == 1
+    assert circuit_breaker.stats()['times_opened'] == 1
+
+
+def test_old_calls_leave_window(mocker: MockerFixture, circuit_breaker) -> None:
+    for _ in range(3):
+        circuit_breaker.record_failure()
+    mocker.patch.object(time, attribute='monotonic', return_value=time.monotonic() + 11)
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.state is CircuitState.CLOSED
+    assert circuit_breaker.stats()['calls_in_window'] == 1
+
+
+def test_half_open_probe_success(mocker: MockerFixture, circuit_breaker) -> None:
+    _open(circuit_breaker)
+    mocker.patch.object(time, attribute='monotonic', return_value=time.monotonic() + 6)
+
+    assert circuit_breaker.state is CircuitState.HALF_OPEN
+    assert circuit_breaker.allow_request()
+    assert not circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+
+    assert circuit_breaker.state is CircuitState.CLOSED
+    assert circuit_breaker.allow_request()
+
+
+def test_half_open_probe_failure(mocker: MockerFixture, circuit_breaker) -> None:
+    _open(circuit_breaker)
+    mocker.patch.object(time, attribute='monotonic', return_value=time.monotonic() + 6)
+
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.state is CircuitState.OPEN
+    assert circuit_breaker.stats()['times_opened'] == 2
+
+
+def test_half_open_probe_released(mocker: MockerFixture, circuit_breaker) -> None:
+    _open(circuit_breaker)
+    mocker.patch.object(time, attribute='monotonic', return_value=time.monotonic() + 6)
+
+    assert circuit_breaker.allow_request()
+    circuit_breaker.release()
+
+    assert circuit_breaker.state is CircuitState.HALF_OPEN
+    assert circuit_breaker.allow_request()
+
+
+def test_reset(circuit_breaker) -> None:
+    _open(circuit_breaker)
+    circuit_breaker.reset()
+
+    assert circuit_breaker.state is CircuitState.CLOSED
+
+
+def test_invalid_threshold() -> None:
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_rate_threshold=0)
@@ -0,0 +1,83 @@
+import pytest
+
+from shorty.shortlink.compact_map import CompactShortlinkMap
+
+URLS = (
+    'https://example.com/some/path/page?query=value/x#fragment',
+    'https://example.com/some/path/other',
+    'https://example.com/some/',
+    'https://example.com',
+    'https://example.com?query=/value',
+    'http://пример.рф/путь/страница',
+    'not a url',
+)
+
+
+@pytest.fixture
+def compact_map() -> CompactShortlinkMap:
+    return CompactShortlinkMap(max_entries=100)
+
+
+def test_get_set(compact_map) -> None:
+    for i, url in enumerate(URLS):
+        compact_map.set(('bitly', url), f'https://bit.ly/{i}')
+        compact_map.set(('tinyurl', url), f'tiny{i}')
+
+    assert len(compact_map) == 2 * len(URLS)
+    for i, url in enumerate(URLS):
+        assert compact_map.get(('bitly', url)) == f'https://bit.ly/{i}'
+        assert compact_map.get(('tinyurl', url)) == f'tiny{i}'
+    assert compact_map.get(('bitly', URLS[0] + 'x')) is None
+    assert compact_map.get(('local', URLS[0])) is None
+    assert compact_map.stats()['hits'] == 2 * len(URLS)
+    assert compact_map.stats()['misses'] == 2
+
+
+def test_get_without_stats(compact_map) -> None:
+    compact_map.set(('bitly', URLS[0]), 'https://bit.ly/1')
+
+    assert compact_map.get(('bitly', URLS[0]), record_stats=False) == 'https://bit.ly/1'
+    assert compact_map.get(('bitly', URLS[1]), record_stats=False) is None
+    assert compact_map.stats()['hits'] == compact_map.stats()['misses'] == 0
+
+
+def test_replace(compact_map) -> None:
+    compact_map.set(('bitly', URLS[0]), 'https://bit.ly/1')
+    compact_map.set(('bitly', URLS[1]), 'https://bit.ly/2')
+    compact_map.set(('bitly', URLS[0]), 'https://bit.ly/3')
+
+    assert compact_map.get(('bitly', URLS[0])) == 'https://bit.ly/3'
+    assert compact_map.get(('bitly', URLS[1])) == 'https://bit.ly/2'
+    assert len(compact_map) == 2
+
+
+def test_many_entries() -> None:
+    compact_map = CompactShortlinkMap(max_entries=10_000)
+    for i in range(10_000):
+        compact_map.set(('bitly', f'https://site{i % 7}.com/{i % 13}/{i}'), f'https://bit.ly/{i}')
+
+    assert all(compact_map.get(('bitly', f'https://site{i % 7}.com/{i % 13}/{i}')) == f'https://bit.ly/{i}'
+               for i in range(10_000))
+    assert compact_map.stats()['bytes'] < 10_000 * 100
+
+
+def test_max_entries() -> None:
+    compact_map = CompactShortlinkMap(max_entries=1)
+    compact_map.set(('bitly', URLS[0]), 'https://bit.ly/1')
+    compact_map.set(('bitly', URLS[1]), 'https://bit.ly/2')
+
+    assert compact_map.get(('bitly', URLS[1])) is None
+    assert compact_map.stats()['rejected'] == 1
+
+
+def test_clear(compact_map) -> None:
+    compact_map.set(('bitly', URLS[0]), 'https://bit.ly/1')
+    compact_map.clear()
+
+    assert compact_map.get(('bitly', URLS[0])) is None
+    assert len(compact_map) == 0
+
+
+def test_invalid_max_entries() -> None:
+    with pytest.raises(ValueError):
+        CompactShortlinkMap(max_entries=0)
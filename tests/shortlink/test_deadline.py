@@ -0,0 +1,43 @@
+import time
+
+from pytest_mock import MockerFixture
+
+from shorty.shortlink import deadline
+
+
+def test_no_deadline() -> None:
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    assert 1.0 == deadline.clamp(1.0)
+    assert deadline.clamp(None) is None
+
+
+def test_scope() -> None:
+    with deadline.scope(10):
+        assert 9 < deadline.remaining() <= 10
+        assert 1.0 == deadline.clamp(1.0)
+        assert 9 < deadline.clamp(None) <= 10
+
+    assert deadline.remaining() is None
+
+
+def test_scope_keeps_earlier_deadline() -> None:
+    with deadline.scope(1):
+        with deadline.scope(10):
+            assert deadline.remaining() <= 1
+
+        with deadline.scope(0.5):
+            assert deadline.remaining() <= 0.5
+
+
+def test_scope_without_budget() -> None:
+    with deadline.scope(None):
+        assert deadline.remaining() is None
+
+
+def test_expired(mocker: MockerFixture) -> None:
+    with deadline.scope(1):
+        mocker.patch.object(time, attribute='monotonic', return_value=time.monotonic() + 2)
+
+        assert deadline.expired()
+        assert 0.0 == deadline.clamp(1.0)
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+import pytest
+
+from shorty.shortlink import deadline
+from shorty.shortlink.event_loop import EventLoopThread
+
+
+@pytest.fixture
+def event_loop_thread() -> EventLoopThread:
+    event_loop_thread = EventLoopThread()
+    yield event_loop_thread
+    event_loop_thread.close()
+
+
+def test_run(event_loop_thread) -> None:
+    async def _thread_name() -> str:
+        await asyncio.sleep(0)
+        return threading.current_thread().name
+
+    assert 'event-loop' == event_loop_thread.run(_thread_name())
+
+
+def test_run_error(event_loop_thread) -> None:
+    async def _fail() -> None:
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        event_loop_thread.run(_fail())
+
+
+def test_run_in_current_context(event_loop_thread) -> None:
+    async def _remaining() -> float | None:
+        return deadline.remaining()
+
+    with deadline.scope(10):
+        assert 0 < event_loop_thread.run(_remaining()) <= 10
+    assert event_loop_thread.run(_remaining()) is None
+
+
+def test_submit_awaited_from_other_loop(event_loop_thread) -> None:
+    async def _loop() -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    async def _await_submitted() -> tuple[asyncio.AbstractEventLoop, asyncio.AbstractEventLoop]:
+        return await asyncio.wrap_future(event_loop_thread.submit(_loop())), asyncio.get_running_loop()
+
+    shared_loop, own_loop = asyncio.run(_await_submitted())
+    assert shared_loop is not own_loop
+    assert shared_loop is event_loop_thread.run(_loop())
+
+
+def test_close(event_loop_thread) -> None:
+    event_loop_thread.close()
+    event_loop_thread.close()
+
+    assert not event_loop_thread._thread.is_alive()
@@ -0,0 +1,54 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from shorty.shortlink.hedging import hedged_call
+
+
+@pytest.fixture
+def executor() -> ThreadPoolExecutor:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+@pytest.fixture
+def release() -> threading.Event:
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_first_succeeds(executor) -> None:
+    second = Mock(return_value='second')
+    assert hedged_call(executor, (lambda: 'first', second), hedge_delay=1) == 'first'
+    second.assert_not_called()
+
+
+def test_hedged_after_delay(executor, release) -> None:
+    def slow():
+        release.wait()
+        return 'slow'
+
+    started = time.monotonic()
+    assert hedged_call(executor, (slow, lambda: 'fast'), hedge_delay=0.05) == 'fast'
+    assert time.monotonic() - started < 1
+
+
+def test_next_started_on_failure(executor) -> None:
+    failing = Mock(side_effect=ValueError)
+    assert hedged_call(executor, (failing, lambda: 'second'), hedge_delay=10) == 'second'
+    failing.assert_called_once_with()
+
+
+def test_race(executor, release) -> None:
+    calls = [Mock(side_effect=lambda: release.wait()), Mock(return_value='second'), Mock(return_value='third')]
+    assert hedged_call(executor, calls, hedge_delay=0) in ('second', 'third')
+    calls[0].assert_called_once_with()
+
+
+def test_all_failed(executor) -> None:
+    with pytest.raises(KeyError):
+        hedged_call(executor, (Mock(side_effect=ValueError), Mock(side_effect=KeyError)), hedge_delay=10)
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shorty.shortlink.jobs import JobQueue, JobQueueFull, MemoryJobStore, SqliteJobStore
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path) -> MemoryJobStore | SqliteJobStore:
+    if request.param == 'memory':
+        store = MemoryJobStore(ttl=60)
+    else:
+        store = SqliteJobStore(str(tmp_path / 'jobs.sqlite3'), ttl=60)
+    yield store
+    store.close()
+
+
+def test_store(store) -> None:
+    store.create('job', [{'url': 'a', 'status': 'pending'}, {'url': 'b', 'error': {}}], pending=1)
+
+    assert store.get('job') == {
+        'id': 'job', 'status': 'pending', 'total': 2, 'completed': 1,
+        'items': [{'url': 'a', 'status': 'pending'}, {'url': 'b', 'error': {}}],
+    }
+
+    store.set_item('job', 0, {'url': 'a', 'link': 'short'})
+
+    assert store.get('job')['status'] == 'done'
+    assert store.get('job')['items'][0] == {'url': 'a', 'link': 'short'}
+    assert store.get('unknown') is None
+
+
+def test_store_expiry(store, mocker: MockerFixture) -> None:
+    store.create('finished', [{'url': 'a'}], pending=0)
+    store.create('pending', [{'url': 'a'}], pending=1)
+    for clock in 'monotonic', 'time':
+        mocker.patch.object(time, attribute=clock, return_value=getattr(time, clock)() + 61)
+
+    assert store.get('finished') is None
+    assert store.get('pending') is not None
+
+
+@pytest.mark.parametrize('store_cls', (MemoryJobStore, SqliteJobStore))
+def test_store_pending_expiry(store_cls, tmp_path, mocker: MockerFixture) -> None:
+    args = (str(tmp_path / 'jobs.sqlite3'),) if store_cls is SqliteJobStore else ()
+    store = store_cls(*args, ttl=60, pending_ttl=600)
+    store.create('orphaned', [{'url': 'a'}], pending=1)
+    for clock in 'monotonic', 'time':
+        mocker.patch.object(time, attribute=clock, return_value=getattr(time, clock)() + 601)
+
+    assert store.get('orphaned') is None
+    store.create('new', [{'url': 'a'}], pending=1)
+    store.set_item('orphaned', 0, {'url': 'a', 'link': 'short'})
+    assert store.get('orphaned') is None
+    assert store.get('new') is not None
+    store.close()
+
+
+def test_sqlite_store_shared(tmp_path) -> None:
+    path = str(tmp_path / 'jobs.sqlite3')
+    first, second = SqliteJobStore(path), SqliteJobStore(path)
+    first.create('job', [{'url': 'a'}], pending=1)
+    second.set_item('job', 0, {'url': 'a', 'link': 'short'})
+
+    assert first.get('job')['status'] == 'done'
+
+
+def test_queue_runs_tasks() -> None:
+    queue = JobQueue(MemoryJobStore(), max_workers=2)
+    job_id = queue.submit(
+        [{'status': 'pending'}, {'error': {}}, {'status': 'pending'}],
+        {0: lambda: {'link': 'first'}, 2: lambda: 1 / 0},
+    )
+    queue.shutdown(wait=True)
+    job = queue.get(job_id)
+
+    assert job['status'] == 'done'
+    assert job['items'][0] == {'link': 'first'}
+    assert job['items'][2]['error']['name'] == 'Internal Server Error'
+    assert queue.stats()['queued_items'] == 0
+
+
+def test_queue_full() -> None:
+    release = threading.Event()
+    queue = JobQueue(MemoryJobStore(), max_workers=1, max_queued_items=2)
+    queue.submit([{}, {}], {0: release.wait, 1: release.wait})
+
+    with pytest.raises(JobQueueFull):
+        queue.submit([{}], {0: dict})
+    queue.submit([{'error': {}}], {})
+
+    release.set()
+    queue.shutdown(wait=True)
+    assert queue.stats() == {'queued_items': 0, 'max_queued_items': 2, 'submitted': 2, 'rejected': 1}
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shorty.shortlink.ranking import ProviderRanking
+
+
+@pytest.fixture
+def ranking() -> ProviderRanking:
+    return ProviderRanking(alpha=0.5, exploration_rate=0)
+
+
+def test_order_unmeasured_keeps_order(ranking) -> None:
+    assert ranking.order(['a', 'b', 'c']) == ['a', 'b', 'c']
+
+
+def test_order_unmeasured_first(ranking) -> None:
+    ranking.record('a', 0.1, succeeded=True)
+    assert ranking.order(['a', 'b']) == ['b', 'a']
+
+
+def test_order_by_latency(ranking) -> None:
+    ranking.record('a', 0.5, succeeded=True)
+    ranking.record('b', 0.1, succeeded=True)
+    assert ranking.order(['a', 'b']) == ['b', 'a']
+
+
+def test_order_by_success_rate(ranking) -> None:
+    ranking.record('a', 0.1, succeeded=True)
+    ranking.record('b', 0.05, succeeded=False)
+    assert ranking.order(['a', 'b']) == ['a', 'b']
+
+
+def test_order_fast_failing_last(ranking) -> None:
+    ranking.record('a', 0.001, succeeded=True)
+    ranking.record('a', 0.001, succeeded=False)
+    ranking.record('a', 0.001, succeeded=False)
+    ranking.record('b', 0.5, succeeded=True)
+
+    assert ranking.order(['a', 'b']) == ['b', 'a']
+
+
+def test_order_unhealthy_by_score(ranking) -> None:
+    ranking.record('a', 0.1, succeeded=False)
+    ranking.record('b', 0.01, succeeded=False)
+    ranking.record('c', 1.0, succeeded=True)
+
+    assert ranking.order(['a', 'b', 'c']) == ['c', 'b', 'a']
+
+
+def test_ewma(ranking) -> None:
+    ranking.record('a', 1.0, succeeded=True)
+    ranking.record('a', 0.0, succeeded=False)
+
+    assert ranking.stats('a') == {'latency': 0.5, 'success_rate': 0.5, 'calls': 2}
+
+
+def test_recovered_provider_wins_back(ranking) -> None:
+    ranking.record('a', 0.1, succeeded=False)
+    ranking.record('b', 0.2, succeeded=True)
+    assert ranking.order(['a', 'b']) == ['b', 'a']
+
+    for _ in range(5):
+        ranking.record('a', 0.1, succeeded=True)
+    assert ranking.order(['a', 'b']) == ['a', 'b']
+
+
+def test_exploration(mocker: MockerFixture) -> None:
+    ranking = ProviderRanking(exploration_rate=0.5)
+    mocker.patch.object(random, attribute='random', return_value=0.1)
+    mocker.patch.object(random, attribute='randrange', return_value=2)
+
+    assert ranking.order(['a', 'b', 'c']) == ['c', 'a', 'b']
+
+
+def test_invalid_alpha() -> None:
+    with pytest.raises(ValueError):
+        ProviderRanking(alpha=0)
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from shorty.shortlink.rate_limiter import SqliteTokenBucket, TokenBucket
+
+
+@pytest.fixture
+def sqlite_path(tmp_path) -> str:
+    return str(tmp_path / 'rate_limit.sqlite3')
+
+
+def test_burst() -> None:
+    token_bucket = TokenBucket(rate=1, burst=3)
+
+    assert all(token_bucket.acquire() for _ in range(3))
+    assert not token_bucket.acquire()
+    assert token_bucket.stats()['acquired'] == 3
+    assert token_bucket.stats()['rejected'] == 1
+
+
+def test_refill(mocker: MockerFixture) -> None:
+    token_bucket = TokenBucket(rate=2, burst=2)
+    token_bucket.acquire()
+    token_bucket.acquire()
+    mocker.patch.object(time, attribute='monotonic', return_value=time.monotonic() + 0.5)
+
+    assert token_bucket.acquire()
+    assert not token_bucket.acquire()
+
+
+def test_acquire_waits(mocker: MockerFixture) -> None:
+    token_bucket = TokenBucket(rate=100, burst=1)
+    token_bucket.acquire()
+    sleep = mocker.spy(time, 'sleep')
+
+    assert token_bucket.acquire(timeout=1)
+    assert 0 < sleep.call_args.args[0] <= 0.01
+    assert token_bucket.stats()['delayed'] == 1
+
+
+def test_acquire_does_not_wait_beyond_timeout(mocker: MockerFixture) -> None:
+    token_bucket = TokenBucket(rate=1, burst=1)
+    token_bucket.acquire()
+    sleep = mocker.patch.object(time, attribute='sleep')
+
+    assert not token_bucket.acquire(timeout=0.5)
+    sleep.assert_not_called()
+
+
+def test_invalid_rate() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_sqlite_bucket_is_shared(sqlite_path) -> None:
+    first = SqliteTokenBucket(sqlite_path, key='bitly', rate=1, burst=2)
+    second = SqliteTokenBucket(sqlite_path, key='bitly', rate=1, burst=2)
+    other = SqliteTokenBucket(sqlite_path, key='tinyurl', rate=1, burst=2)
+
+    assert first.acquire()
+    assert second.acquire()
+    assert not first.acquire()
+    assert not second.acquire()
+    assert other.acquire()
+
+    for token_bucket in first, second, other:
+        token_bucket.close()
+
+
+def test_sqlite_bucket_refill(mocker: MockerFixture, sqlite_path) -> None:
+    token_bucket = SqliteTokenBucket(sqlite_path, key='bitly', rate=10, burst=1)
+    assert token_bucket.acquire()
+    assert not token_bucket.acquire()
+    mocker.patch.object(time, attribute='time', return_value=time.time() + 0.1)
+
+    assert token_bucket.acquire()
+    token_bucket.close()
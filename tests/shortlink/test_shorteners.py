@@ -1,11 +1,42 @@
+import asyncio
+import json
+import sqlite3
+import time
 from typing import Any
+from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 import requests
 from pytest_mock import MockerFixture
 
-from shorty.shortlink.shorteners import BitlyShortener, TinyurlShortener, exceptions
-from tests.conftest import LONG_URL
+from shorty import utils
+from shorty.shortlink import deadline
+from shorty.shortlink.cache import ShortlinkCache
+from shorty.shortlink.compact_map import CompactShortlinkMap
+from shorty.shortlink.canonicalization import UrlCanonicalizer
+from shorty.shortlink.circuit_breaker import CircuitBreaker
+from shorty.shortlink.event_loop import EventLoopThread
+from shorty.shortlink.rate_limiter import TokenBucket
+from shorty.shortlink.store import SqliteShortlinkStore
+from shorty.shortlink.shorteners import (
+    AsyncBitlyShortener,
+    AsyncTinyurlShortener,
+    BitlyShortener,
+    CachingShortener,
+    CanonicalizingShortener,
+    CircuitBreakerShortener,
+    EventLoopShortener,
+    LazyShortener,
+    LocalShortener,
+    PersistentShortener,
+    RateLimitedShortener,
+    SingleFlightShortener,
+    TinyurlShortener,
+    exceptions,
+)
+from shorty.shortlink.shorteners.local_shortener import MAX_CODE_LENGTH, MAX_ID
+from tests.conftest import LONG_URL, SHORT_URL
 
 
 class DummyResponse(requests.Response):
@@ -24,6 +55,62 @@ def empty_response() -> requests.Response:
     return DummyResponse(status_code=200)
 
 
+class TestRequestBasedShortener:
+    @pytest.fixture
+    def shortener(self) -> TinyurlShortener:
+        return TinyurlShortener('https://tinyurl.com', 1, pool_size=3, idle_timeout=10)
+
+    def test_session_reused(self, shortener) -> None:
+        session = shortener.session
+        assert shortener.session is session
+        assert session.get_adapter('https://tinyurl.com')._pool_maxsize == 3
+
+    def test_session_keep_alive_disabled(self) -> None:
+        shortener = TinyurlShortener('https://tinyurl.com', keep_alive=False)
+        assert shortener.session.headers['Connection'] == 'close'
+
+    def test_idle_session_closed(self, mocker: MockerFixture, shortener) -> None:
+        session = shortener.session
+        mock_close = mocker.patch.object(session, attribute='close')
+        mocker.patch.object(time, attribute='monotonic', return_value=shortener._session_last_used + 11)
+
+        shortener._close_idle_session()
+
+        mock_close.assert_called_once_with()
+        assert shortener._idle_timer is None
+        assert shortener.session is not session
+        shortener.close()
+
+    def test_used_session_kept(self, mocker: MockerFixture, shortener) -> None:
+        session = shortener.session
+        mock_close = mocker.patch.object(session, attribute='close')
+        mocker.patch.object(time, attribute='monotonic', return_value=shortener._session_last_used + 4)
+
+        shortener._close_idle_session()
+
+        mock_close.assert_not_called()
+        assert shortener._idle_timer.interval == 6
+        assert shortener.session is session
+        shortener.close()
+
+    def test_idle_session_closed_in_background(self) -> None:
+        shortener = TinyurlShortener('https://tinyurl.com', 1, idle_timeout=0.05)
+        session, idle_timer = shortener.session, shortener._idle_timer
+
+        idle_timer.join(1)
+        assert session is not None
+        assert shortener._session is None
+
+    def test_close(self, mocker: MockerFixture, shortener) -> None:
+        mock_close = mocker.patch.object(shortener.session, attribute='close')
+        idle_timer = shortener._idle_timer
+        shortener.close()
+        shortener.close()
+
+        mock_close.assert_called_once_with()
+        assert idle_timer.finished.is_set()
+
+
 class TestBitLyShortener:
     @pytest.fixture
     def request_data(self, long_url) -> dict[str, Any]:
@@ -63,7 +150,7 @@ class TestBitLyShortener:
         assert shortener.prepare_request_data(long_url) == expected
 
     def test_make_shorten_request(self, mocker: MockerFixture, empty_response, shortener, request_data) -> None:
-        mock_post = mocker.patch.object(requests, attribute='post', return_value=empty_response)
+        mock_post = mocker.patch.object(requests.Session, attribute='post', return_value=empty_response)
         assert shortener.make_shorten_request(request_data) == empty_response
         mock_post.assert_called_once_with(
             'https://bit.ly/shorten',
@@ -100,6 +187,105 @@ class TestBitLyShortener:
         mock_prepare_request_data.assert_called_once_with(long_url=long_url)
         mock_make_request.assert_called_once_with(request_data=request_data)
 
+    def test_shorten_rate_limited(self, mocker: MockerFixture, shortener, long_url) -> None:
+        mocker.patch.object(shortener, attribute='make_shorten_request', return_value=DummyResponse(status_code=429))
+
+        with pytest.raises(exceptions.ShorteningProviderRateLimited):
+            shortener.shorten(long_url)
+
+
+class TestRetries:
+    @pytest.fixture
+    def shortener(self) -> BitlyShortener:
+        return BitlyShortener('https://bit.ly', 'api_key', timeout=1, max_retries=2, retry_backoff=0.001)
+
+    @pytest.mark.parametrize('status_code', (500, 502, 503, 504))
+    def test_retry_transient_errors(self, mocker: MockerFixture, shortener, long_url, short_url, status_code):
+        make_request = mocker.patch.object(shortener, attribute='make_shorten_request', side_effect=(
+            DummyResponse(status_code=status_code),
+            DummyResponse(status_code=200, json={'link': short_url}),
+        ))
+
+        assert shortener.shorten(long_url) == short_url
+        assert make_request.call_count == 2
+
+    def test_max_retries(self, mocker: MockerFixture, shortener, long_url):
+        make_request = mocker.patch.object(
+            shortener, attribute='make_shorten_request', return_value=DummyResponse(status_code=503),
+        )
+
+        with pytest.raises(exceptions.InvalidShorteningProviderResponse):
+            shortener.shorten(long_url)
+        assert make_request.call_count == 3
+
+    def test_no_retry_of_rate_limited(self, mocker: MockerFixture, shortener, long_url):
+        make_request = mocker.patch.object(
+            shortener, attribute='make_shorten_request', return_value=DummyResponse(status_code=429),
+        )
+
+        with pytest.raises(exceptions.ShorteningProviderRateLimited):
+            shortener.shorten(long_url)
+        assert make_request.call_count == 1
+
+    def test_retries_take_tokens(self, mocker: MockerFixture, shortener, long_url):
+        shortener.retry_token_bucket = TokenBucket(rate=0.001, burst=1)
+        make_request = mocker.patch.object(
+            shortener, attribute='make_shorten_request', return_value=DummyResponse(status_code=503),
+        )
+
+        with pytest.raises(exceptions.InvalidShorteningProviderResponse):
+            shortener.shorten(long_url)
+        assert make_request.call_count == 2
+        assert shortener.retry_token_bucket.stats()['rejected'] == 1
+
+    def test_no_retry_of_client_errors(self, mocker: MockerFixture, shortener, long_url):
+        make_request = mocker.patch.object(
+            shortener, attribute='make_shorten_request', return_value=DummyResponse(status_code=400),
+        )
+
+        with pytest.raises(exceptions.InvalidShorteningProviderResponse):
+            shortener.shorten(long_url)
+        assert make_request.call_count == 1
+
+    def test_no_retry_beyond_deadline(self, mocker: MockerFixture, long_url):
+        shortener = BitlyShortener('https://bit.ly', 'api_key', max_retries=2, retry_backoff=10)
+        make_request = mocker.patch.object(
+            shortener, attribute='make_shorten_request', return_value=DummyResponse(status_code=503),
+        )
+        mocker.patch('random.uniform', return_value=5)
+
+        with deadline.scope(1), pytest.raises(exceptions.InvalidShorteningProviderResponse):
+            shortener.shorten(long_url)
+        assert make_request.call_count == 1
+
+    def test_deadline_exceeded(self, mocker: MockerFixture, shortener, long_url):
+        make_request = mocker.patch.object(shortener, attribute='make_shorten_request')
+
+        with deadline.scope(0), pytest.raises(exceptions.DeadlineExceeded):
+            shortener.shorten(long_url)
+        make_request.assert_not_called()
+
+    def test_timeout_clamped_to_deadline(self, mocker: MockerFixture, shortener, empty_response, long_url):
+        mock_post = mocker.patch.object(requests.Session, attribute='post', return_value=empty_response)
+
+        with deadline.scope(0.5):
+            shortener.make_shorten_request({'long_url': long_url})
+        assert mock_post.call_args.kwargs['timeout'] <= 0.5
+
+    def test_no_time_left_for_request(self, mocker: MockerFixture, shortener, long_url):
+        mock_post = mocker.patch.object(requests.Session, attribute='post')
+
+        with deadline.scope(0), pytest.raises(exceptions.DeadlineExceeded):
+            shortener.make_shorten_request({'long_url': long_url})
+        mock_post.assert_not_called()
+
+    def test_timeout_cut_by_deadline(self, mocker: MockerFixture, shortener, long_url):
+        mocker.patch.object(shortener, attribute='make_shorten_request', side_effect=requests.exceptions.Timeout)
+        mocker.patch.object(deadline, attribute='expired', side_effect=(False, True))
+
+        with pytest.raises(exceptions.DeadlineExceeded):
+            shortener.shorten(long_url)
+
 
 class TestTinyurlShortener:
     @pytest.fixture
@@ -129,7 +315,7 @@ class TestTinyurlShortener:
         assert shortener.prepare_request_data(long_url) == expected
 
     def test_make_shorten_request(self, mocker: MockerFixture, empty_response, shortener, request_data) -> None:
-        mock_get = mocker.patch.object(requests, attribute='get', return_value=empty_response)
+        mock_get = mocker.patch.object(requests.Session, attribute='get', return_value=empty_response)
         assert shortener.make_shorten_request(request_data) == empty_response
         mock_get.assert_called_once_with(
             'https://tinyurl.com/api-create.php',
@@ -166,3 +352,476 @@ class TestTinyurlShortener:
 
         mock_prepare_request_data.assert_called_once_with(long_url=long_url)
         mock_make_request.assert_called_once_with(request_data=request_data)
+
+
+class TestCachingShortener:
+    @pytest.fixture
+    def wrapped(self) -> Mock:
+        return Mock(shorten=Mock(return_value=SHORT_URL))
+
+    @pytest.fixture(params=[ShortlinkCache, CompactShortlinkMap])
+    def cache(self, request) -> ShortlinkCache | CompactShortlinkMap:
+        return request.param(max_entries=10)
+
+    @pytest.fixture
+    def shortener(self, wrapped, cache) -> CachingShortener:
+        return CachingShortener(wrapped, provider='bitly', cache=cache)
+
+    def test_shorten_cached(self, shortener, wrapped, long_url, short_url) -> None:
+        assert shortener.shorten(long_url) == short_url
+        assert shortener.shorten(long_url) == short_url
+        wrapped.shorten.assert_called_once_with(long_url)
+
+    def test_shorten_error_not_cached(self, shortener, wrapped, long_url) -> None:
+        wrapped.shorten.side_effect = exceptions.ShorteningProviderTimeout
+        with pytest.raises(exceptions.ShorteningProviderTimeout):
+            shortener.shorten(long_url)
+
+        assert shortener.peek(long_url) is None
+
+    def test_peek(self, shortener, cache, long_url, short_url) -> None:
+        assert shortener.peek(long_url) is None
+        shortener.shorten(long_url)
+        assert shortener.peek(long_url) == short_url
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_peek_caches_wrapped_known_link(self, wrapped, cache, long_url, short_url) -> None:
+        inner = Mock(spec=CachingShortener, peek=Mock(return_value=short_url))
+        shortener = CachingShortener(inner, provider='bitly', cache=cache)
+
+        assert shortener.peek(long_url) == short_url
+        assert shortener.peek(long_url) == short_url
+        inner.peek.assert_called_once_with(long_url)
+
+    def test_cache_keyed_by_provider(self, wrapped, cache, long_url, short_url) -> None:
+        CachingShortener(wrapped, provider='bitly', cache=cache).shorten(long_url)
+        assert CachingShortener(wrapped, provider='tinyurl', cache=cache).peek(long_url) is None
+
+    def test_close(self, shortener, wrapped) -> None:
+        shortener.close()
+        wrapped.close.assert_called_once_with()
+
+
+class TestAsyncShorteners:
+    @staticmethod
+    def mock_transport(mocker: MockerFixture, shortener, handler) -> list[httpx.Request]:
+        requests_made = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            requests_made.append(request)
+            return handler(request)
+
+        mocker.patch.object(
+            shortener,
+            attribute='create_client',
+            side_effect=lambda: httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+        )
+        return requests_made
+
+    @staticmethod
+    def shorten(shortener, long_url: str) -> str:
+        async def _shorten():
+            try:
+                return await shortener.shorten(long_url)
+            finally:
+                await shortener.close()
+
+        return asyncio.run(_shorten())
+
+    def test_bitly_shorten(self, mocker: MockerFixture, long_url, short_url) -> None:
+        shortener = AsyncBitlyShortener('https://bit.ly', 'api_key', 'some_domain', 'some_guid', 1)
+        requests_made = self.mock_transport(
+            mocker, shortener, lambda request: httpx.Response(200, json={'link': short_url}),
+        )
+
+        assert self.shorten(shortener, long_url) == short_url
+        assert str(requests_made[0].url) == 'https://bit.ly/shorten'
+        assert requests_made[0].headers['Authorization'] == 'Bearer api_key'
+        assert json.loads(requests_made[0].content) == {
+            'long_url': long_url, 'domain': 'some_domain', 'group_guid': 'some_guid',
+        }
+
+    def test_tinyurl_shorten(self, mocker: MockerFixture, long_url, short_url) -> None:
+        shortener = AsyncTinyurlShortener('https://tinyurl.com', 1)
+        requests_made = self.mock_transport(
+            mocker, shortener, lambda request: httpx.Response(200, content=short_url.encode()),
+        )
+
+        assert self.shorten(shortener, long_url) == short_url
+        assert requests_made[0].url.path == '/api-create.php'
+        assert requests_made[0].url.params['url'] == long_url
+
+    @pytest.mark.parametrize(
+        'handler,expected_exception',
+        (
+            (lambda request: httpx.Response(500), exceptions.InvalidShorteningProviderResponse),
+            (lambda request: httpx.Response(200, content=b'invalid'), exceptions.InvalidShorteningProviderResponse),
+            (Mock(side_effect=httpx.ReadTimeout('timeout')), exceptions.ShorteningProviderTimeout),
+            (Mock(side_effect=httpx.ConnectError('error')), exceptions.ShorteningProviderRequestException),
+        )
+    )
+    def test_shorten_error(self, mocker: MockerFixture, long_url, handler, expected_exception) -> None:
+        shortener = AsyncTinyurlShortener('https://tinyurl.com', 1)
+        self.mock_transport(mocker, shortener, handler)
+
+        with pytest.raises(expected_exception):
+            self.shorten(shortener, long_url)
+
+    def test_retry_transient_errors(self, mocker: MockerFixture, long_url, short_url) -> None:
+        shortener = AsyncTinyurlShortener('https://tinyurl.com', 1, max_retries=1, retry_backoff=0.001)
+        responses = iter((httpx.Response(503), httpx.Response(200, content=short_url.encode())))
+        requests_made = self.mock_transport(mocker, shortener, lambda request: next(responses))
+
+        assert self.shorten(shortener, long_url) == short_url
+        assert len(requests_made) == 2
+
+    def test_client_per_event_loop(self) -> None:
+        shortener = AsyncTinyurlShortener('https://tinyurl.com', pool_size=3)
+
+        async def _get_client():
+            return shortener.client, shortener.client
+
+        first_client, same_client = asyncio.run(_get_client())
+        other_client, _ = asyncio.run(_get_client())
+
+        assert first_client is same_client
+        assert first_client is not other_client
+
+
+class TestEventLoopShortener:
+    @pytest.fixture
+    def event_loop_thread(self) -> EventLoopThread:
+        event_loop_thread = EventLoopThread()
+        yield event_loop_thread
+        event_loop_thread.close()
+
+    def test_shorten(self, mocker: MockerFixture, event_loop_thread, long_url, short_url) -> None:
+        async_shortener = AsyncTinyurlShortener('https://tinyurl.com', 1)
+        requests_made = TestAsyncShorteners.mock_transport(
+            mocker, async_shortener, lambda request: httpx.Response(200, content=short_url.encode()),
+        )
+        shortener = EventLoopShortener(async_shortener, event_loop_thread)
+
+        assert shortener.shorten(long_url) == short_url
+        assert shortener.shorten(long_url) == short_url
+        assert len(requests_made) == 2
+        # Requests made by different threads share the client of the event loop.
+        assert async_shortener.create_client.call_count == 1
+
+        shortener.close()
+        assert not async_shortener._clients
+
+    def test_shorten_error(self, mocker: MockerFixture, event_loop_thread, long_url) -> None:
+        async_shortener = AsyncTinyurlShortener('https://tinyurl.com', 1)
+        TestAsyncShorteners.mock_transport(mocker, async_shortener, lambda request: httpx.Response(500))
+
+        with pytest.raises(exceptions.InvalidShorteningProviderResponse):
+            EventLoopShortener(async_shortener, event_loop_thread).shorten(long_url)
+
+
+class TestCircuitBreakerShortener:
+    @pytest.fixture
+    def wrapped(self) -> Mock:
+        return Mock(shorten=Mock(return_value=SHORT_URL))
+
+    @pytest.fixture
+    def shortener(self, wrapped) -> CircuitBreakerShortener:
+        return CircuitBreakerShortener(wrapped, provider='bitly', circuit_breaker=CircuitBreaker(min_calls=2))
+
+    def test_shorten(self, shortener, wrapped, long_url, short_url) -> None:
+        assert shortener.shorten(long_url) == short_url
+        assert shortener.stats()['calls_in_window'] == 1
+
+    def test_shorten_fast_fail_when_open(self, shortener, wrapped, long_url) -> None:
+        wrapped.shorten.side_effect = exceptions.ShorteningProviderTimeout
+        for _ in range(2):
+            with pytest.raises(exceptions.ShorteningProviderTimeout):
+                shortener.shorten(long_url)
+
+        with pytest.raises(exceptions.ShorteningProviderUnavailable):
+            shortener.shorten(long_url)
+
+        assert wrapped.shorten.call_count == 2
+        assert shortener.stats()['state'] == 'open'
+
+    def test_deadline_exceeded_not_counted(self, shortener, wrapped, long_url) -> None:
+        wrapped.shorten.side_effect = exceptions.DeadlineExceeded
+        for _ in range(3):
+            with pytest.raises(exceptions.DeadlineExceeded):
+                shortener.shorten(long_url)
+
+        assert shortener.stats()['state'] == 'closed'
+        assert shortener.stats()['calls_in_window'] == 0
+
+    def test_rate_limit_exceeded_not_counted(self, shortener, wrapped, long_url) -> None:
+        wrapped.shorten.side_effect = exceptions.RateLimitExceeded
+        for _ in range(3):
+            with pytest.raises(exceptions.RateLimitExceeded):
+                shortener.shorten(long_url)
+
+        assert shortener.stats()['state'] == 'closed'
+        assert shortener.stats()['calls_in_window'] == 0
+
+    def test_rate_limited_by_provider_counted(self, shortener, wrapped, long_url) -> None:
+        wrapped.shorten.side_effect = exceptions.ShorteningProviderRateLimited
+        for _ in range(2):
+            with pytest.raises(exceptions.ShorteningProviderRateLimited):
+                shortener.shorten(long_url)
+
+        assert shortener.stats()['state'] == 'open'
+
+
+class TestRateLimitedShortener:
+    @pytest.fixture
+    def wrapped(self) -> Mock:
+        return Mock(shorten=Mock(return_value=SHORT_URL))
+
+    @pytest.fixture
+    def shortener(self, wrapped) -> RateLimitedShortener:
+        return RateLimitedShortener(wrapped, provider='bitly', token_bucket=TokenBucket(rate=1, burst=1))
+
+    def test_shorten(self, shortener, wrapped, long_url, short_url) -> None:
+        assert shortener.shorten(long_url) == short_url
+        assert shortener.stats()['acquired'] == 1
+
+    def test_shorten_rate_limited(self, shortener, wrapped, long_url) -> None:
+        shortener.shorten(long_url)
+
+        with pytest.raises(exceptions.RateLimitExceeded):
+            shortener.shorten(long_url)
+
+        assert wrapped.shorten.call_count == 1
+        assert shortener.stats()['rejected'] == 1
+
+    def test_shorten_wait_clamped_by_deadline(self, wrapped, long_url) -> None:
+        token_bucket = Mock(acquire=Mock(return_value=True))
+        shortener = RateLimitedShortener(wrapped, provider='bitly', token_bucket=token_bucket, max_wait=10)
+
+        with deadline.scope(0.5):
+            shortener.shorten(long_url)
+        assert token_bucket.acquire.call_args.kwargs['timeout'] <= 0.5
+
+
+class TestCanonicalizingShortener:
+    @pytest.fixture
+    def cache(self) -> ShortlinkCache:
+        return ShortlinkCache(max_entries=10, ttl=60)
+
+    @pytest.fixture
+    def shortener(self, cache) -> CanonicalizingShortener:
+        wrapped = CachingShortener(Mock(shorten=Mock(return_value=SHORT_URL)), provider='bitly', cache=cache)
+        return CanonicalizingShortener(wrapped, provider='bitly', canonicalizer=UrlCanonicalizer(sort_query=True))
+
+    def test_shorten(self, shortener, short_url) -> None:
+        assert shortener.shorten('HTTPS://Example.com:443/a?b=1&a=2') == short_url
+        assert shortener.shorten('https://example.com/a?a=2&b=1') == short_url
+
+        assert shortener.wrapped.wrapped.shorten.call_count == 1
+        shortener.wrapped.wrapped.shorten.assert_called_once_with('https://example.com/a?a=2&b=1')
+        assert shortener.stats() == {'rewritten': 1}
+
+    def test_peek(self, shortener, cache, short_url) -> None:
+        cache.set(('bitly', 'https://example.com/a'), short_url)
+
+        assert shortener.peek('HTTPS://EXAMPLE.com:443/a') == short_url
+
+
+class TestSingleFlightShortener:
+    @pytest.mark.parametrize(
+        'long_url,expected',
+        (
+            ('HTTPS://Example.COM/Path?Query', 'https://example.com/Path?Query'),
+            ('https://example.com', 'https://example.com'),
+        )
+    )
+    def test_normalize_url(self, long_url, expected) -> None:
+        assert SingleFlightShortener.normalize_url(long_url) == expected
+
+    def test_shorten(self, long_url, short_url) -> None:
+        wrapped = Mock(shorten=Mock(return_value=short_url))
+        shortener = SingleFlightShortener(wrapped, provider='bitly')
+
+        assert shortener.shorten(long_url) == short_url
+        wrapped.shorten.assert_called_once_with(long_url)
+        assert shortener.stats()['calls'] == 1
+
+    def test_shorten_after_deadline_of_other_caller(self, long_url, short_url) -> None:
+        wrapped = Mock(shorten=Mock(side_effect=(exceptions.DeadlineExceeded, short_url)))
+        shortener = SingleFlightShortener(wrapped, provider='bitly')
+
+        assert shortener.shorten(long_url) == short_url
+        assert wrapped.shorten.call_count == 2
+
+    def test_shorten_deadline_exceeded(self, long_url) -> None:
+        wrapped = Mock(shorten=Mock(side_effect=exceptions.DeadlineExceeded))
+        shortener = SingleFlightShortener(wrapped, provider='bitly')
+
+        with deadline.scope(0), pytest.raises(exceptions.DeadlineExceeded):
+            shortener.shorten(long_url)
+        wrapped.shorten.assert_called_once_with(long_url)
+
+    def test_shorten_concurrent_call_past_deadline(self, long_url) -> None:
+        shortener = SingleFlightShortener(Mock(), provider='bitly')
+
+        with patch.object(shortener.single_flight, 'do', side_effect=TimeoutError) as do:
+            with deadline.scope(0.5), pytest.raises(exceptions.DeadlineExceeded):
+                shortener.shorten(long_url)
+        assert 0 < do.call_args.kwargs['timeout'] <= 0.5
+
+
+class TestPersistentShortener:
+    @pytest.fixture
+    def store(self, tmp_path) -> SqliteShortlinkStore:
+        return SqliteShortlinkStore(str(tmp_path / 'shortlinks.sqlite3'), bloom_capacity=100)
+
+    def test_shorten_stored(self, store, long_url, short_url) -> None:
+        wrapped = Mock(shorten=Mock(return_value=short_url))
+        shortener = PersistentShortener(wrapped, provider='bitly', store=store)
+
+        assert shortener.peek(long_url) is None
+        assert shortener.shorten(long_url) == short_url
+        assert shortener.shorten(long_url) == short_url
+        assert shortener.peek(long_url) == short_url
+        wrapped.shorten.assert_called_once_with(long_url)
+
+    def test_shorten_store_failed(self, store, long_url, short_url) -> None:
+        wrapped = Mock(shorten=Mock(return_value=short_url))
+        shortener = PersistentShortener(wrapped, provider='bitly', store=store)
+
+        with (
+            patch.object(store, 'get', side_effect=sqlite3.OperationalError('database is locked')),
+            patch.object(store, 'set', side_effect=sqlite3.OperationalError('database is locked')),
+        ):
+            assert shortener.peek(long_url) is None
+            assert shortener.shorten(long_url) == short_url
+        wrapped.shorten.assert_called_once_with(long_url)
+
+
+class TestLocalShortener:
+    @pytest.fixture
+    def database_path(self, tmp_path) -> str:
+        return str(tmp_path / 'local.sqlite3')
+
+    @pytest.fixture
+    def shortener(self, database_path) -> LocalShortener:
+        shortener = LocalShortener('https://sho.rt', database_path=database_path, code_key='key')
+        yield shortener
+        shortener.close()
+
+    @staticmethod
+    def code(short_link: str) -> str:
+        return short_link.rsplit('/', 1)[1]
+
+    def test_database_required(self) -> None:
+        with pytest.raises(ValueError):
+            LocalShortener('https://sho.rt', database_path='', code_key='key')
+
+    def test_code_key_required(self, database_path) -> None:
+        with pytest.raises(ValueError):
+            LocalShortener('https://sho.rt', database_path=database_path, code_key='')
+
+    def test_shorten(self, shortener, long_url) -> None:
+        short_link = shortener.shorten(long_url)
+
+        assert short_link.startswith('https://sho.rt/')
+        assert shortener.shorten(long_url) == short_link
+        assert shortener.shorten('https://other.com') != short_link
+
+    def test_codes_not_sequential(self, shortener) -> None:
+        codes = [self.code(shortener.shorten(f'https://example.com/{i}')) for i in range(100)]
+
+        assert len(set(codes)) == 100
+        assert not {utils.base62_encode(id_) for id_ in range(1, 101)} & set(codes)
+
+    def test_codes_keyed(self, tmp_path, long_url) -> None:
+        short_links = [
+            LocalShortener('https://sho.rt', database_path=str(tmp_path / f'{key}.sqlite3'), code_key=key)
+            .shorten(long_url)
+            for key in ('key', 'other key')
+        ]
+
+        assert short_links[0] != short_links[1]
+
+    @pytest.mark.parametrize('id_', (1, 2, 1000, 2 ** 32, MAX_ID - 1, MAX_ID))
+    def test_encode_decode(self, shortener, id_) -> None:
+        code = shortener.encode(id_)
+
+        assert len(code) <= MAX_CODE_LENGTH
+        assert shortener.decode(code) == id_
+
+    def test_resolve(self, shortener, long_url) -> None:
+        code = self.code(shortener.shorten(long_url))
+        shortener._urls_by_code.clear()
+
+        assert shortener.resolve(code) == long_url
+        assert shortener.resolve(shortener.encode(2)) is None
+        assert shortener.resolve('in-valid') is None
+
+    def test_resolve_leading_zero(self, shortener, long_url) -> None:
+        code = self.code(shortener.shorten(long_url))
+        shortener._urls_by_code.clear()
+
+        assert shortener.resolve(f'0{code}') is None
+
+    @pytest.mark.parametrize('code', ('0', 'ZZZZZZZZZZZ', 'ZZZZZZZZZZZZZZZ'))
+    def test_resolve_out_of_range(self, shortener, code) -> None:
+        assert shortener.resolve(code) is None
+
+    def test_index_bounded(self, database_path, long_url) -> None:
+        shortener = LocalShortener('https://sho.rt', database_path=database_path, code_key='key', max_cached=1)
+        short_link = shortener.shorten(long_url)
+        shortener.shorten('https://other.com')
+
+        assert len(shortener._urls_by_code) == 1
+        assert shortener.resolve(self.code(short_link)) == long_url
+        assert shortener.shorten(long_url) == short_link
+
+    def test_shared_database(self, database_path, long_url) -> None:
+        short_link = LocalShortener('https://sho.rt', database_path=database_path, code_key='key').shorten(long_url)
+        other_shortener = LocalShortener('https://sho.rt', database_path=database_path, code_key='key')
+
+        assert other_shortener.resolve(self.code(short_link)) == long_url
+        assert other_shortener.shorten(long_url) == short_link
+
+    def test_close(self, shortener, long_url) -> None:
+        connection = shortener._connection
+        shortener.close()
+        shortener.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute('SELECT 1')
+        assert shortener.shorten(long_url).startswith('https://sho.rt/')
+
+
+class TestLazyShortener:
+    @pytest.fixture
+    def wrapped(self) -> Mock:
+        return Mock(shorten=Mock(return_value=SHORT_URL))
+
+    @pytest.fixture
+    def factory(self, wrapped) -> Mock:
+        return Mock(return_value=wrapped)
+
+    def test_built_on_first_use(self, factory, wrapped, long_url, short_url) -> None:
+        shortener = LazyShortener(factory, provider='bitly')
+        factory.assert_not_called()
+        assert not shortener.is_built
+
+        assert shortener.shorten(long_url) == short_url
+        assert shortener.shorten(long_url) == short_url
+        factory.assert_called_once_with()
+        assert shortener.is_built
+
+    def test_close_not_built(self, factory, wrapped) -> None:
+        LazyShortener(factory, provider='bitly').close()
+
+        factory.assert_not_called()
+        wrapped.close.assert_not_called()
+
+    def test_close(self, factory, wrapped, long_url) -> None:
+        shortener = LazyShortener(factory, provider='bitly')
+        shortener.shorten(long_url)
+        shortener.close()
+
+        wrapped.close.assert_called_once_with()
@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from shorty.shortlink.single_flight import SingleFlight
+
+
+@pytest.fixture
+def single_flight() -> SingleFlight:
+    return SingleFlight()
+
+
+def _run_concurrently(single_flight: SingleFlight, func: Mock, callers: int, key: str = 'key') -> list:
+    release = threading.Event()
+    leader_started = threading.Event()
+
+    def leader():
+        leader_started.set()
+        release.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(single_flight.do, key, leader)]
+        leader_started.wait()
+        futures += [executor.submit(single_flight.do, key, func) for _ in range(callers - 1)]
+        while single_flight.stats()['calls'] < callers:
+            pass
+        release.set()
+
+    return futures
+
+
+def test_sequential_calls_not_collapsed(single_flight) -> None:
+    func = Mock(return_value='result')
+    assert single_flight.do('key', func) == 'result'
+    assert single_flight.do('key', func) == 'result'
+    assert func.call_count == 2
+    assert single_flight.stats() == {'calls': 2, 'collapsed': 0, 'in_flight': 0}
+
+
+def test_concurrent_calls_collapsed(single_flight) -> None:
+    func = Mock(return_value='result')
+    futures = _run_concurrently(single_flight, func, callers=5)
+
+    assert [future.result() for future in futures] == ['result'] * 5
+    func.assert_called_once_with()
+    assert single_flight.stats() == {'calls': 5, 'collapsed': 4, 'in_flight': 0}
+
+
+def test_concurrent_calls_share_exception(single_flight) -> None:
+    func = Mock(side_effect=ValueError)
+    futures = _run_concurrently(single_flight, func, callers=3)
+
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+    func.assert_called_once_with()
+
+
+def test_concurrent_call_timeout(single_flight) -> None:
+    release = threading.Event()
+    leader_started = threading.Event()
+
+    def leader():
+        leader_started.set()
+        release.wait()
+        return 'result'
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(single_flight.do, 'key', leader)
+        leader_started.wait()
+        with pytest.raises(TimeoutError):
+            single_flight.do('key', Mock(), timeout=0.01)
+        release.set()
+        assert future.result() == 'result'
@@ -0,0 +1,56 @@
+import pytest
+
+from shorty.shortlink.store import SqliteShortlinkStore
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / 'shortlinks.sqlite3')
+
+
+@pytest.fixture
+def store(path) -> SqliteShortlinkStore:
+    store = SqliteShortlinkStore(path, bloom_capacity=100, refresh_interval=0)
+    yield store
+    store.close()
+
+
+def test_get_set(store, long_url, short_url) -> None:
+    assert store.get('bitly', long_url) is None
+    assert store.set('bitly', long_url, short_url) == short_url
+    assert store.get('bitly', long_url) == short_url
+    assert store.get('tinyurl', long_url) is None
+
+
+def test_miss_skips_disk(path, long_url) -> None:
+    store = SqliteShortlinkStore(path, bloom_capacity=100, refresh_interval=60)
+    assert store.get('bitly', long_url) is None
+    assert store.stats()['bloom_skips'] == 1
+    assert store.stats()['disk_reads'] == 0
+
+
+def test_persistent(path, store, long_url, short_url) -> None:
+    store.set('bitly', long_url, short_url)
+    store.close()
+
+    reopened = SqliteShortlinkStore(path, bloom_capacity=100)
+    assert reopened.get('bitly', long_url) == short_url
+
+
+def test_shared_between_processes(path, store, long_url, short_url) -> None:
+    other_store = SqliteShortlinkStore(path, bloom_capacity=100, refresh_interval=0)
+    other_store.set('bitly', long_url, short_url)
+
+    assert store.get('bitly', long_url) == short_url
+    assert store.set('bitly', long_url, 'https://other.short') == short_url
+
+
+def test_refresh_in_chunks(path, store, mocker) -> None:
+    mocker.patch('shorty.shortlink.store.REFRESH_CHUNK_SIZE', 2)
+    for i in range(5):
+        store.set('bitly', f'https://example.com/{i}', f'https://bit.ly/{i}')
+
+    reopened = SqliteShortlinkStore(path, bloom_capacity=100, refresh_interval=60)
+    for i in range(5):
+        assert reopened.get('bitly', f'https://example.com/{i}') == f'https://bit.ly/{i}'
+    assert reopened.stats()['bloom_skips'] == 0
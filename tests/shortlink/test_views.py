@@ -1,11 +1,31 @@
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Type
 from unittest.mock import Mock
 
+import httpx
 import pytest
 from werkzeug import exceptions as flask_exceptions
 
 from shorty.shortlink.exceptions import APIValidationError
-from shorty.shortlink.shorteners import BitlyShortener, TinyurlShortener, exceptions as shortener_exceptions
+from shorty.shortlink.shorteners import (
+    AsyncBitlyShortener,
+    AsyncTinyurlShortener,
+    BitlyShortener,
+    CircuitBreakerShortener,
+    LocalShortener,
+    RateLimitedShortener,
+    TinyurlShortener,
+    exceptions as shortener_exceptions,
+    iter_layers,
+)
+from shorty.shortlink import deadline, views
+from shorty.shortlink.circuit_breaker import CircuitBreaker
+from shorty.shortlink.ranking import ProviderRanking
+from shorty.shortlink.rate_limiter import SqliteTokenBucket, TokenBucket
 from shorty.shortlink.views import ShortlinksAPI
 from tests.conftest import ShorteningProviderName, SHORT_URL
 
@@ -126,3 +146,531 @@ class TestShortlinksAPI:
             shortener.assert_called_once_with(long_url)
 
         assert 500 == response.status_code
+
+    @pytest.mark.parametrize('mode,hedge_delay', (('hedged', 0.01), ('race', 0)))
+    def test_post_empty_provider_hedged(
+        self, post, mocker, mode, hedge_delay, short_url, long_url, mock_allowed_providers,
+    ):
+        bitly_started, release = threading.Event(), threading.Event()
+        executor = ThreadPoolExecutor(max_workers=2)
+        mocker.patch.object(views, '_hedging_executor', executor)
+        mocker.patch.object(views, '_fallback_mode', mode)
+        mocker.patch.object(views, '_hedge_delay', hedge_delay)
+        bitly_shortener = mocker.patch.object(
+            BitlyShortener,
+            attribute='shorten',
+            side_effect=lambda _: bitly_started.set() or release.wait() and short_url,
+        )
+        tinyurl_shortener = mocker.patch.object(
+            TinyurlShortener, attribute='shorten', side_effect=lambda _: bitly_started.wait(1) and short_url,
+        )
+        try:
+            response = post('/shortlinks', data={'url': long_url})
+        finally:
+            release.set()
+            # Wait for the losing call, so it doesn't leak into other tests.
+            executor.shutdown(wait=True)
+
+        assert 200 == response.status_code
+        assert short_url == response.json['link']
+        bitly_shortener.assert_called_once_with(long_url)
+        tinyurl_shortener.assert_called_once_with(long_url)
+
+    def test_post_circuit_open(self, post, mocker, short_url, long_url, mock_allowed_providers):
+        mocker.patch.object(CircuitBreaker, attribute='allow_request', return_value=False)
+        bitly_shortener = mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        tinyurl_shortener = mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+
+        response = post('/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.BITLY})
+        assert 503 == response.status_code
+
+        response = post('/shortlinks', data={'url': long_url})
+        assert 503 == response.status_code
+
+        bitly_shortener.assert_not_called()
+        tinyurl_shortener.assert_not_called()
+
+    def test_post_deadline_header(self, post, mocker, short_url, long_url, mock_allowed_providers):
+        budgets = []
+
+        def _shorten(_):
+            budgets.append(deadline.remaining())
+            return short_url
+
+        mocker.patch.object(BitlyShortener, attribute='shorten', side_effect=_shorten)
+
+        response = post(
+            '/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.BITLY},
+            headers={'X-Request-Timeout': '0.5'},
+        )
+
+        assert 200 == response.status_code
+        assert 0 < budgets[0] <= 0.5
+
+    @pytest.mark.parametrize('header', ('abc', '0', '-1', 'inf'))
+    def test_post_invalid_deadline_header(self, post, header, long_url, mock_allowed_providers):
+        response = post('/shortlinks', data={'url': long_url}, headers={'X-Request-Timeout': header})
+
+        assert 400 == response.status_code
+
+    def test_post_deadline_exceeded(self, post, mocker, short_url, long_url, mock_allowed_providers):
+        mocker.patch.object(
+            BitlyShortener, attribute='shorten', side_effect=shortener_exceptions.ShorteningProviderTimeout,
+        )
+        mocker.patch.object(deadline, attribute='expired', side_effect=(False, False, True))
+        tinyurl_shortener = mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+
+        response = post('/shortlinks', data={'url': long_url})
+
+        assert 504 == response.status_code
+        tinyurl_shortener.assert_not_called()
+
+    def test_post_deadline_exceeded_keeps_circuit_closed(self, get, post, mocker, long_url, mock_allowed_providers):
+        mocker.patch.object(BitlyShortener, attribute='shorten', side_effect=shortener_exceptions.DeadlineExceeded)
+
+        for _ in range(20):
+            response = post('/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.BITLY})
+            assert 504 == response.status_code
+
+        assert 'closed' == get('/shortlinks/stats').json['providers']['bitly']['circuit_breaker']['state']
+
+    def test_post_equivalent_urls(self, post, mocker, short_url, mock_allowed_providers):
+        bitly_shortener = mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+
+        for url in ('HTTPS://Example.com:443/a', 'https://example.com/a'):
+            response = post('/shortlinks', data={'url': url, 'provider': ShorteningProviderName.BITLY})
+            assert 200 == response.status_code
+            assert url == response.json['url']
+
+        bitly_shortener.assert_called_once_with('https://example.com/a')
+
+    def test_post_rate_limited(self, post, mocker, short_url, long_url, mock_allowed_providers):
+        ranking = ProviderRanking(exploration_rate=0)
+        mocker.patch.object(views, '_provider_ranking', ranking)
+        mocker.patch.object(BitlyShortener, attribute='shorten', side_effect=shortener_exceptions.RateLimitExceeded)
+        tinyurl_shortener = mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+
+        response = post('/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.BITLY})
+        assert 503 == response.status_code
+
+        response = post('/shortlinks', data={'url': long_url})
+        assert 200 == response.status_code
+        assert short_url == response.json['link']
+        tinyurl_shortener.assert_called_once_with(long_url)
+        assert 0 == ranking.stats(views._shorteners_mapping['bitly'])['calls']
+
+    def test_post_rate_limited_by_provider(self, post, mocker, long_url, mock_allowed_providers):
+        ranking = ProviderRanking(exploration_rate=0)
+        mocker.patch.object(views, '_provider_ranking', ranking)
+        mocker.patch.object(
+            BitlyShortener, attribute='shorten', side_effect=shortener_exceptions.ShorteningProviderRateLimited,
+        )
+
+        response = post('/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.BITLY})
+
+        assert 502 == response.status_code
+        assert {'calls': 1, 'success_rate': 0} == {
+            key: value for key, value in ranking.stats(views._shorteners_mapping['bitly']).items() if key != 'latency'
+        }
+
+    def test_post_empty_provider_adaptive_ordering(self, post, mocker, short_url, long_url, mock_allowed_providers):
+        ranking = ProviderRanking(exploration_rate=0)
+        mocker.patch.object(views, '_provider_ranking', ranking)
+        bitly_shortener = mocker.patch.object(
+            BitlyShortener, attribute='shorten', side_effect=shortener_exceptions.ShorteningProviderTimeout,
+        )
+        tinyurl_shortener = mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+
+        post('/shortlinks', data={'url': long_url})
+        views._shortlinks_cache.clear()
+        response = post('/shortlinks', data={'url': long_url})
+
+        assert 200 == response.status_code
+        assert 1 == bitly_shortener.call_count
+        assert 2 == tinyurl_shortener.call_count
+        assert 0 == ranking.stats(views._shorteners_mapping['bitly'])['success_rate']
+
+    def test_post_invalid_url(self, post, mock_allowed_providers):
+        response = post('/shortlinks', data={'url': 'htts://test.com'})
+
+        assert 422 == response.status_code
+        assert response.json['errors'][0]['loc'] == ['url']
+
+    def test_post_cached(self, post, mocker, short_url, long_url, mock_allowed_providers):
+        bitly_shortener = mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        tinyurl_shortener = mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+        post('/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.TINYURL})
+        response = post('/shortlinks', data={'url': long_url})
+
+        assert 200 == response.status_code
+        assert short_url == response.json['link']
+        bitly_shortener.assert_not_called()
+        tinyurl_shortener.assert_called_once_with(long_url)
+
+    def test_get(self, get, mocker, short_url, long_url, mock_allowed_providers):
+        shortener = mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        response = get('/shortlinks', query_string={'url': long_url, 'provider': ShorteningProviderName.BITLY.value})
+
+        assert 200 == response.status_code
+        assert {'url': long_url, 'link': short_url} == response.json
+        assert response.headers['Cache-Control'] == 'public, max-age=86400, stale-while-revalidate=3600'
+        assert not response.get_etag()[1]
+        shortener.assert_called_once_with(long_url)
+
+    def test_get_if_none_match(self, get, mocker, short_url, long_url, mock_allowed_providers):
+        shortener = mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        query = {'url': long_url, 'provider': ShorteningProviderName.BITLY.value}
+        etag = get('/shortlinks', query_string=query).headers['ETag']
+        response = get('/shortlinks', query_string=query, headers={'If-None-Match': etag})
+
+        assert 304 == response.status_code
+        assert b'' == response.data
+        assert etag == response.headers['ETag']
+        assert 'Cache-Control' in response.headers
+        shortener.assert_called_once_with(long_url)
+
+        response = get('/shortlinks', query_string=query, headers={'If-None-Match': '"outdated"'})
+        assert 200 == response.status_code
+
+    def test_get_invalid(self, get, mock_allowed_providers):
+        response = get('/shortlinks', query_string={'provider': ShorteningProviderName.BITLY.value})
+
+        assert 422 == response.status_code
+        assert response.json['errors'][0]['loc'] == ['url']
+        assert 'Cache-Control' not in response.headers
+
+    def test_get_async_not_allowed(self, get, long_url):
+        assert 405 == get('/shortlinks/async', query_string={'url': long_url}).status_code
+
+
+class TestShortlinkRedirectAPI:
+    def test_get(self, client, mocker, tmp_path, long_url):
+        shortener = LocalShortener('http://localhost', database_path=str(tmp_path / 'local.sqlite3'), code_key='key')
+        mocker.patch.object(views, '_local_shorteners', [shortener])
+        code = shortener.shorten(long_url).rsplit('/', 1)[1]
+        response = client.get(f'/{code}')
+
+        assert 302 == response.status_code
+        assert long_url == response.headers['Location']
+
+    @pytest.mark.parametrize('code', ('unknown', 'ZZZZZZZZZZZZZZZ'))
+    def test_get_unknown(self, client, mocker, tmp_path, code):
+        shortener = LocalShortener('http://localhost', database_path=str(tmp_path / 'local.sqlite3'), code_key='key')
+        mocker.patch.object(views, '_local_shorteners', [shortener])
+        response = client.get(f'/{code}')
+
+        assert 404 == response.status_code
+
+
+@pytest.mark.parametrize('path, token_bucket_cls', ((None, TokenBucket), ('rate_limit.sqlite3', SqliteTokenBucket)))
+def test_build_shortener_rate_limit(app, tmp_path, path, token_bucket_cls):
+    config = {
+        **app.config,
+        'SHORTLINKS_RATE_LIMIT': {
+            **app.config['SHORTLINKS_RATE_LIMIT'], 'enabled': True, 'path': path and str(tmp_path / path),
+        },
+    }
+    shortener_config = {
+        **app.config['SHORTENERS']['bitly'], 'rate_limit': {'enabled': None, 'rate': 5.0, 'burst': None},
+    }
+
+    shortener = views.build_shortener('bitly', shortener_config, config)
+    rate_limiter = next(layer for layer in iter_layers(shortener) if isinstance(layer, RateLimitedShortener))
+
+    assert isinstance(rate_limiter.token_bucket, token_bucket_cls)
+    assert 5.0 == rate_limiter.stats()['rate']
+    assert rate_limiter.token_bucket is list(iter_layers(shortener))[-1].retry_token_bucket
+    shortener.close()
+
+
+def test_load_shorteners_closes_replaced(app, mocker):
+    replaced = dict(views._shorteners_mapping)
+    closes = [mocker.patch.object(shortener, 'close') for shortener in replaced.values()]
+
+    views.load_shorteners(Mock(app=app))
+
+    for close in closes:
+        close.assert_called_once_with()
+    assert all(views._shorteners_mapping[name] is not shortener for name, shortener in replaced.items())
+
+
+def test_build_shortener_rate_limit_inside_circuit_breaker(app):
+    config = {
+        **app.config,
+        'SHORTLINKS_RATE_LIMIT': {**app.config['SHORTLINKS_RATE_LIMIT'], 'enabled': True},
+        'SHORTLINKS_CIRCUIT_BREAKER': {**app.config['SHORTLINKS_CIRCUIT_BREAKER'], 'enabled': True},
+    }
+
+    shortener = views.build_shortener('bitly', app.config['SHORTENERS']['bitly'], config)
+    layer_classes = [layer.__class__ for layer in iter_layers(shortener)]
+
+    assert layer_classes.index(CircuitBreakerShortener) < layer_classes.index(RateLimitedShortener)
+    shortener.close()
+
+
+class TestShortlinksStatsAPI:
+    def test_get(self, get, post, mocker, short_url, long_url, mock_allowed_providers):
+        mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        post('/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.BITLY})
+        post('/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.BITLY})
+        response = get('/shortlinks/stats')
+
+        assert 200 == response.status_code
+        assert 1 == response.json['cache']['size']
+        assert 1 <= response.json['cache']['hits']
+        assert 'closed' == response.json['providers']['bitly']['circuit_breaker']['state']
+
+
+class TestAsyncShortlinksAPI:
+    def test_post(self, post, mocker, short_url, long_url, mock_allowed_providers):
+        shortener = mocker.patch.object(AsyncBitlyShortener, attribute='shorten', return_value=short_url)
+        response = post('/shortlinks/async', data={'url': long_url, 'provider': ShorteningProviderName.BITLY})
+
+        assert 200 == response.status_code
+        assert short_url == response.json['link']
+        shortener.assert_awaited_once_with(long_url)
+
+    def test_post_empty_provider_fallback(self, post, mocker, short_url, long_url, mock_allowed_providers):
+        shorteners = (
+            mocker.patch.object(
+                AsyncBitlyShortener,
+                attribute='shorten',
+                side_effect=shortener_exceptions.ShorteningProviderTimeout,
+            ),
+            mocker.patch.object(AsyncTinyurlShortener, attribute='shorten', return_value=short_url),
+        )
+        response = post('/shortlinks/async', data={'url': long_url})
+
+        assert 200 == response.status_code
+        assert short_url == response.json['link']
+        for shortener in shorteners:
+            shortener.assert_awaited_once_with(long_url)
+
+    def test_post_all_failed(self, post, mocker, long_url, mock_allowed_providers):
+        for shortener_class in AsyncBitlyShortener, AsyncTinyurlShortener:
+            mocker.patch.object(
+                shortener_class,
+                attribute='shorten',
+                side_effect=shortener_exceptions.ShorteningProviderRequestException,
+            )
+        response = post('/shortlinks/async', data={'url': long_url})
+
+        assert 502 == response.status_code
+
+    def test_post_connections_pooled(self, post, mocker, short_url, mock_allowed_providers):
+        async def handle_async_request(_, request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={'link': short_url})
+
+        mocker.patch.object(httpx.AsyncHTTPTransport, attribute='handle_async_request', new=handle_async_request)
+        create_client = mocker.spy(AsyncBitlyShortener, 'create_client')
+
+        for url in ('https://example.com/a', 'https://example.com/b'):
+            response = post('/shortlinks/async', data={'url': url, 'provider': ShorteningProviderName.BITLY})
+            assert 200 == response.status_code
+
+        assert 1 == create_client.call_count
+
+    def test_post_cached(self, post, mocker, short_url, mock_allowed_providers):
+        shortener = mocker.patch.object(AsyncBitlyShortener, attribute='shorten', return_value=short_url)
+
+        for url in ('HTTPS://Example.com:443/a', 'https://example.com/a'):
+            response = post('/shortlinks/async', data={'url': url, 'provider': ShorteningProviderName.BITLY})
+            assert short_url == response.json['link']
+
+        shortener.assert_awaited_once_with('https://example.com/a')
+
+
+def test_build_async_shortener_shares_provider_limits(app, mocker):
+    config = {**app.config, 'SHORTLINKS_RATE_LIMIT': {**app.config['SHORTLINKS_RATE_LIMIT'], 'enabled': True}}
+    shortener_config = app.config['SHORTENERS']['bitly']
+    mocker.patch.dict(views._shorteners_mapping, {'bitly': views.build_shortener('bitly', shortener_config, config)})
+
+    layers = list(iter_layers(views._shorteners_mapping['bitly']))
+    async_layers = list(iter_layers(views.build_async_shortener('bitly', shortener_config, config)))
+
+    def _find(layers_: list, layer_cls: type):
+        return next(layer for layer in layers_ if isinstance(layer, layer_cls))
+
+    circuit_breaker = _find(layers, CircuitBreakerShortener).circuit_breaker
+    assert _find(async_layers, CircuitBreakerShortener).circuit_breaker is circuit_breaker
+    token_bucket = _find(layers, RateLimitedShortener).token_bucket
+    assert _find(async_layers, RateLimitedShortener).token_bucket is token_bucket
+    assert async_layers[-1].async_shortener.retry_token_bucket is token_bucket
+
+
+class TestShortlinksBatchAPI:
+    def test_post(self, post, mocker, short_url, mock_allowed_providers):
+        shortener = mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        response = post(
+            '/shortlinks/batch',
+            data=[
+                {'url': 'https://first.com', 'provider': ShorteningProviderName.BITLY},
+                {'url': 'htts://invalid.com'},
+                {'url': 'https://second.com', 'provider': ShorteningProviderName.BITLY},
+                {'url': 'https://first.com', 'provider': ShorteningProviderName.BITLY},
+                'not an item',
+            ],
+        )
+
+        assert 200 == response.status_code
+        assert [item.get('link') for item in response.json] == [short_url, None, short_url, short_url, None]
+        assert [item['url'] for item in response.json] == [
+            'https://first.com', 'htts://invalid.com', 'https://second.com', 'https://first.com', None,
+        ]
+        assert response.json[1]['error']['name'] == APIValidationError.name
+        assert response.json[4]['error']['name'] == APIValidationError.name
+        assert shortener.call_count == 2
+
+    def test_post_item_failed(self, post, mocker, short_url, mock_allowed_providers):
+        mocker.patch.object(
+            BitlyShortener, attribute='shorten', side_effect=shortener_exceptions.ShorteningProviderTimeout,
+        )
+        mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+        response = post(
+            '/shortlinks/batch',
+            data=[
+                {'url': 'https://first.com', 'provider': ShorteningProviderName.BITLY},
+                {'url': 'https://first.com', 'provider': ShorteningProviderName.TINYURL},
+            ],
+        )
+
+        assert 200 == response.status_code
+        assert response.json[0]['error']['name'] == 'Gateway Timeout'
+        assert response.json[1]['link'] == short_url
+
+    @pytest.mark.parametrize('data', ({'url': 'https://first.com'}, []))
+    def test_post_invalid(self, post, data, mock_allowed_providers):
+        response = post('/shortlinks/batch', data=json.dumps(data))
+
+        assert 422 == response.status_code
+        assert response.json['name'] == APIValidationError.name
+
+    def test_post_too_many_items(self, app, post, mocker, mock_allowed_providers):
+        mocker.patch.dict(app.config['SHORTLINKS_BATCH'], {'max_items': 1})
+        response = post('/shortlinks/batch', data=[{'url': 'https://first.com'}, {'url': 'https://second.com'}])
+
+        assert 422 == response.status_code
+
+
+class TestShortlinksStreamAPI:
+    @staticmethod
+    def _results(response) -> list[dict]:
+        return sorted((json.loads(line) for line in response.data.splitlines()), key=lambda result: result['line'])
+
+    def test_post(self, client, mocker, short_url, mock_allowed_providers):
+        shortener = mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        body = b'\n'.join((
+            b'{"url": "https://first.com", "provider": "bitly"}',
+            b'',
+            b'{"url": "htts://invalid.com"}',
+            b'not json',
+            b'["not", "an", "item"]',
+            b'{"url": "https://second.com", "provider": "bitly"}',
+        ))
+        response = client.post('/shortlinks/stream', data=body, content_type='application/x-ndjson')
+        results = self._results(response)
+
+        assert 200 == response.status_code
+        assert 'application/x-ndjson' == response.mimetype
+        assert [result['line'] for result in results] == [1, 3, 4, 5, 6]
+        assert [result.get('link') for result in results] == [short_url, None, None, None, short_url]
+        assert results[1]['url'] == 'htts://invalid.com'
+        assert all(results[i]['error']['name'] == APIValidationError.name for i in (1, 2, 3))
+        assert shortener.call_count == 2
+
+    def test_post_bounded_in_flight(self, app, client, mocker, short_url, mock_allowed_providers):
+        mocker.patch.dict(app.config['SHORTLINKS_STREAM'], {'max_in_flight': 1})
+        mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        body = b'\n'.join(b'{"url": "https://site%d.com", "provider": "bitly"}' % i for i in range(10))
+        response = client.post('/shortlinks/stream', data=body)
+
+        assert [result['line'] for result in self._results(response)] == list(range(1, 11))
+
+    def test_post_line_too_long(self, app, client, mocker, mock_allowed_providers):
+        mocker.patch.dict(app.config['SHORTLINKS_STREAM'], {'max_line_size': 32})
+        body = b'{"url": "https://%s.com"}\n{"url": "htts://x.com"}' % (b'a' * 100)
+        results = self._results(client.post('/shortlinks/stream', data=body))
+
+        assert [result['line'] for result in results] == [1, 2]
+        assert results[0]['error']['errors'][0]['msg'] == 'line is too long'
+
+    def test_shorten_stream_in_current_context(self, mocker, short_url):
+        remaining = []
+
+        def _shorten_item(request):
+            remaining.append(deadline.remaining())
+            return {'url': request.url, 'link': short_url}
+
+        mocker.patch.object(views.ShortlinksStreamAPI, '_shorten_item', side_effect=_shorten_item)
+        with deadline.scope(10):
+            results = list(views.ShortlinksStreamAPI.shorten_stream(
+                io.BytesIO(b'{"url": "https://example.com"}'), max_in_flight=1, max_line_size=1024,
+            ))
+
+        assert json.loads(results[0])['link'] == short_url
+        assert 0 < remaining[0] <= 10
+
+
+class TestShortlinksJobsAPI:
+    @staticmethod
+    def _wait_done(get, location: str) -> dict:
+        for _ in range(500):
+            response = get(location)
+            assert 200 == response.status_code
+            if response.json['status'] == 'done':
+                return response.json
+            time.sleep(0.01)
+
+        pytest.fail('Job is not done in time')
+
+    def test_post(self, get, post, mocker, short_url, mock_allowed_providers):
+        shortener = mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+        response = post(
+            '/shortlinks/jobs',
+            data=[
+                {'url': 'https://first.com', 'provider': ShorteningProviderName.BITLY},
+                {'url': 'htts://invalid.com'},
+                {'url': 'https://second.com', 'provider': ShorteningProviderName.BITLY},
+            ],
+        )
+
+        assert 202 == response.status_code
+        assert response.headers['Location'] == f'/shortlinks/jobs/{response.json["id"]}'
+        assert response.json['total'] == 3
+        assert response.json['items'][1]['error']['name'] == APIValidationError.name
+
+        job = self._wait_done(get, response.headers['Location'])
+        assert job['completed'] == 3
+        assert [item.get('link') for item in job['items']] == [short_url, None, short_url]
+        assert shortener.call_count == 2
+
+    def test_post_single_item(self, get, post, mocker, short_url, mock_allowed_providers):
+        mocker.patch.object(
+            BitlyShortener, attribute='shorten', side_effect=shortener_exceptions.ShorteningProviderTimeout,
+        )
+        response = post('/shortlinks/jobs', data={'url': 'https://first.com', 'provider': ShorteningProviderName.BITLY})
+
+        assert 202 == response.status_code
+        job = self._wait_done(get, response.headers['Location'])
+        assert job['items'] == [{'url': 'https://first.com', 'error': mocker.ANY}]
+        assert job['items'][0]['error']['name'] == 'Gateway Timeout'
+
+    def test_post_queue_full(self, post, mocker, mock_allowed_providers):
+        mocker.patch.object(views._job_queue, attribute='_max_queued_items', new=0)
+        response = post('/shortlinks/jobs', data=[{'url': 'https://first.com'}])
+
+        assert 503 == response.status_code
+        assert 'Retry-After' in response.headers
+
+    def test_get_not_found(self, get):
+        response = get('/shortlinks/jobs/unknown')
+
+        assert 404 == response.status_code
+
+
+def test_apispec(get):
+    response = get('/apispec_1.json')
+
+    assert 200 == response.status_code
+    assert '/shortlinks/stream' in response.json['paths']
+    assert '/shortlinks/jobs' in response.json['paths']
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from benchmarks.load import percentile, run_load
+from benchmarks.stub_providers import LatencyDistribution, start_stub_server
+from shorty.shortlink.shorteners import BitlyShortener, TinyurlShortener, exceptions
+
+
+@pytest.fixture
+def stub_server():
+    server = start_stub_server(LatencyDistribution('constant', 0))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize(
+    'percent,expected',
+    (
+        (50, 50),
+        (95, 95),
+        (99.9, 100),
+        (0, 1),
+    ),
+)
+def test_percentile(percent, expected):
+    assert percentile(list(range(1, 101)), percent) == expected
+
+
+@pytest.mark.parametrize(
+    'spec,low,high',
+    (
+        ('constant:20', 0.02, 0.02),
+        ('uniform:10:30', 0.01, 0.03),
+        ('exponential:20', 0.0, float('inf')),
+        ('lognormal:20:0.5', 0.0, float('inf')),
+    ),
+)
+def test_latency_distribution(spec, low, high):
+    distribution = LatencyDistribution.parse(spec)
+
+    assert str(distribution) == spec
+    assert all(low <= distribution.sample(random.Random(seed)) <= high for seed in range(100))
+
+
+def test_latency_distribution_unknown():
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse('normal:20')
+
+
+def test_stub_server_shorteners(stub_server, long_url):
+    bitly = BitlyShortener(provider_url=stub_server.url, api_key='key', timeout=1.0)
+    tinyurl = TinyurlShortener(provider_url=stub_server.url, timeout=1.0)
+
+    assert bitly.shorten(long_url).startswith('https://bit.ly/')
+    assert tinyurl.shorten(long_url).startswith('https://tinyurl.com/')
+    assert bitly.shorten(long_url) == bitly.shorten(long_url)
+
+
+def test_stub_server_errors(stub_server, long_url):
+    stub_server.error_rate = 1.0
+
+    with pytest.raises(exceptions.ShorteningProviderRequestException):
+        TinyurlShortener(provider_url=stub_server.url, timeout=1.0).shorten(long_url)
+
+
+def test_run_load(stub_server):
+    result = run_load(
+        f'{stub_server.url}/shorten', lambda number: {'long_url': f'https://example.com/{number}'},
+        concurrency=2, duration=0.2,
+    )
+
+    assert result.requests > 0
+    assert result.status_codes == {200: result.requests}
+    assert set(result.as_dict()['latency_ms']) == {'mean', 'p50', 'p95', 'p99', 'p999', 'max'}
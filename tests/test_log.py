@@ -0,0 +1,168 @@
+import logging
+import queue
+
+import pytest
+
+from shorty import log
+
+
+def _record(level: int = logging.ERROR, lineno: int = 1, exception: Exception | None = None) -> logging.LogRecord:
+    exc_info = (type(exception), exception, None) if exception else None
+    return logging.LogRecord('shorty.test', level, __file__, lineno, 'Error %s', ('details',), exc_info)
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.mark.parametrize(
+    'level,sample_rate,expected',
+    (
+        (logging.INFO, 1.0, True),
+        (logging.DEBUG, 0.0, False),
+        (logging.INFO, 0.0, False),
+        (logging.WARNING, 0.0, True),
+        (logging.ERROR, 0.0, True),
+    ),
+)
+def test_sampling_filter(level, sample_rate, expected):
+    assert log.SamplingFilter(sample_rate).filter(_record(level)) is expected
+
+
+def test_sampling_filter_rate(mocker):
+    mocker.patch.object(log.random, 'random', side_effect=(0.1, 0.6))
+    sampling = log.SamplingFilter(0.5)
+
+    assert sampling.filter(_record(logging.INFO))
+    assert not sampling.filter(_record(logging.INFO))
+
+
+def test_error_aggregation_filter(mocker):
+    monotonic = mocker.patch.object(log.time, 'monotonic', return_value=0.0)
+    aggregation = log.ErrorAggregationFilter(interval=10.0)
+
+    assert aggregation.filter(_record(exception=ValueError()))
+    assert not aggregation.filter(_record(exception=ValueError()))
+    assert not aggregation.filter(_record(exception=ValueError()))
+    # Different exception type, logging place or level aren't identical.
+    assert aggregation.filter(_record(exception=KeyError()))
+    assert aggregation.filter(_record(lineno=2, exception=ValueError()))
+    assert aggregation.filter(_record(logging.WARNING, exception=ValueError()))
+    assert [] == aggregation.flush()
+
+    monotonic.return_value = 10.0
+    summaries = aggregation.flush()
+
+    assert ['2 identical errors in the last 10.0s (ValueError): Error details'] == [
+        summary.getMessage() for summary in summaries
+    ]
+    assert summaries[0].exc_info is None
+    assert summaries[0].levelno == logging.ERROR
+    assert aggregation.filter(_record(exception=ValueError()))
+
+
+def test_error_aggregation_filter_next_interval(mocker):
+    monotonic = mocker.patch.object(log.time, 'monotonic', return_value=0.0)
+    aggregation = log.ErrorAggregationFilter(interval=10.0)
+    aggregation.filter(_record())
+    aggregation.filter(_record())
+
+    monotonic.return_value = 11.0
+    assert aggregation.filter(_record())
+    assert ['1 identical errors in the last 11.0s: Error details'] == [
+        summary.getMessage() for summary in aggregation.flush()
+    ]
+
+
+def test_error_aggregation_filter_force_flush():
+    aggregation = log.ErrorAggregationFilter(interval=60.0)
+    aggregation.filter(_record())
+    aggregation.filter(_record())
+
+    assert [] == aggregation.flush()
+    assert 1 == len(aggregation.flush(force=True))
+
+
+def test_non_blocking_queue_handler_drops_when_full():
+    handler = log.NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(_record())
+    handler.handle(_record())
+
+    assert 1 == handler.dropped
+    assert 1 == handler.queue.qsize()
+
+
+def test_log_pipeline():
+    queue_handler = log.NonBlockingQueueHandler(queue.Queue())
+    aggregation = log.ErrorAggregationFilter(interval=60.0)
+    queue_handler.addFilter(aggregation)
+    target = _ListHandler()
+    pipeline = log.LogPipeline(queue_handler, aggregation, target)
+    pipeline.start()
+
+    for _ in range(3):
+        queue_handler.handle(_record(exception=ValueError()))
+    pipeline.stop()
+
+    messages = [record.getMessage() for record in target.records]
+    assert 2 == len(messages)
+    assert 'Error details' == messages[0]
+    assert messages[1].startswith('2 identical errors in the last ')
+    assert messages[1].endswith('s (ValueError): Error details')
+
+
+def test_log_pipeline_summaries_under_load(mocker):
+    queue_handler = log.NonBlockingQueueHandler(queue.Queue())
+    aggregation = log.ErrorAggregationFilter(interval=10.0)
+    queue_handler.addFilter(aggregation)
+    monotonic = mocker.patch('time.monotonic', return_value=100.0)
+    target = _ListHandler()
+    pipeline = log.LogPipeline(queue_handler, aggregation, target)
+
+    for _ in range(3):
+        queue_handler.handle(_record(exception=ValueError()))
+    monotonic.return_value = 111.0
+    queue_handler.handle(_record(level=logging.INFO))
+    # The queue is never empty, yet the summary is written once the interval has passed.
+    for _ in range(2):
+        pipeline.handle(pipeline.dequeue(block=True))
+
+    messages = [record.getMessage() for record in target.records]
+    assert 3 == len(messages)
+    assert messages[0].startswith('2 identical errors in the last ')
+    assert ['Error details', 'Error details'] == messages[1:]
+
+
+def test_log_pipeline_aggregation_off():
+    queue_handler = log.NonBlockingQueueHandler(queue.Queue())
+    aggregation = log.ErrorAggregationFilter(interval=0)
+    queue_handler.addFilter(aggregation)
+    target = _ListHandler()
+    pipeline = log.LogPipeline(queue_handler, aggregation, target)
+    pipeline.start()
+
+    for _ in range(3):
+        queue_handler.handle(_record(exception=ValueError()))
+    pipeline.stop()
+
+    assert ['Error details'] * 3 == [record.getMessage() for record in target.records]
+
+
+def test_configure_pipeline():
+    root = logging.getLogger()
+    level = root.level
+    try:
+        pipeline = log.configure_pipeline(logging.INFO)
+        assert pipeline.queue_handler in root.handlers
+        assert log.configure_pipeline(logging.INFO) is not pipeline
+        assert pipeline.queue_handler not in root.handlers
+    finally:
+        log.stop_pipeline()
+        root.setLevel(level)
+
+    assert not any(isinstance(handler, log.NonBlockingQueueHandler) for handler in root.handlers)
@@ -0,0 +1,59 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from shorty import metrics
+from shorty.shortlink.shorteners import BitlyShortener, TinyurlShortener, exceptions
+from tests.conftest import ShorteningProviderName
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.parametrize(
+    'exception,expected',
+    (
+        (None, 'success'),
+        (exceptions.ShorteningProviderUnavailable(), 'unavailable'),
+        (exceptions.ShorteningProviderTimeout(), 'timeout'),
+        (exceptions.DeadlineExceeded(), 'deadline_exceeded'),
+        (exceptions.InvalidShorteningProviderResponse(), 'invalid_response'),
+        (exceptions.ShorteningProviderRequestException(), 'http_error'),
+        (ValueError(), 'error'),
+    ),
+)
+def test_provider_outcome(exception, expected):
+    assert metrics.provider_outcome(exception) == expected
+
+
+def test_metrics_endpoint(get, post, mocker, short_url, long_url, mock_allowed_providers):
+    mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+    requests_before = _sample(
+        'shorty_http_requests_total', endpoint='/shortlinks', method='POST', status='200',
+    )
+    calls_before = _sample('shorty_provider_requests_total', provider='bitly', outcome='success')
+
+    post('/shortlinks', data={'url': f'{long_url}/metrics', 'provider': ShorteningProviderName.BITLY})
+    response = get('/metrics')
+
+    assert 200 == response.status_code
+    assert response.content_type.startswith('text/plain')
+    assert b'shorty_provider_request_duration_seconds_bucket' in response.data
+    assert requests_before + 1 == _sample(
+        'shorty_http_requests_total', endpoint='/shortlinks', method='POST', status='200',
+    )
+    assert calls_before + 1 == _sample('shorty_provider_requests_total', provider='bitly', outcome='success')
+
+
+def test_fallbacks_counted(post, mocker, short_url, long_url, mock_allowed_providers):
+    mocker.patch.object(BitlyShortener, attribute='shorten', side_effect=exceptions.ShorteningProviderTimeout)
+    mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+    fallbacks_before = _sample('shorty_fallbacks_total', provider='bitly')
+    timeouts_before = _sample('shorty_provider_requests_total', provider='bitly', outcome='timeout')
+
+    response = post('/shortlinks', data={'url': f'{long_url}/fallback'})
+
+    assert 200 == response.status_code
+    assert fallbacks_before + 1 == _sample('shorty_fallbacks_total', provider='bitly')
+    assert timeouts_before + 1 == _sample('shorty_provider_requests_total', provider='bitly', outcome='timeout')
+    assert 0 == _sample('shorty_fallbacks_total', provider='tinyurl')
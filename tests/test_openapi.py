@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from flask import Flask
+
+from shorty import openapi
+from shorty.shortlink.views import ShortlinksAPI
+
+
+@pytest.fixture
+def spec_app(mocker) -> Flask:
+    mocker.patch.object(openapi, '_spec', None)
+    spec_app = Flask(__name__)
+    spec_app.register_blueprint(openapi.blueprint)
+    return spec_app
+
+
+def test_spec_from_file():
+    post = ShortlinksAPI.post.__func__
+
+    assert post.swag_path.endswith('shorty/shortlink/shortlinks.yml')
+    assert post.swag_type == 'yml'
+
+
+def test_build_spec(app, get):
+    assert openapi.build_spec(app) == get('/apispec_1.json').json
+
+
+def test_prebuilt_spec(spec_app, tmp_path):
+    spec_path = tmp_path / 'openapi.json'
+    spec_path.write_text(json.dumps({'swagger': '2.0'}))
+    spec_app.config['OPENAPI'] = {'mode': 'prebuilt', 'path': str(spec_path)}
+
+    response = spec_app.test_client().get('/apispec_1.json')
+
+    assert 200 == response.status_code
+    assert {'swagger': '2.0'} == response.json
+
+
+def test_lazy_spec(spec_app, mocker):
+    build_spec = mocker.patch.object(openapi, 'build_spec', return_value={'swagger': '2.0'})
+    spec_app.config['OPENAPI'] = {'mode': 'lazy'}
+    client = spec_app.test_client()
+
+    assert {'swagger': '2.0'} == client.get('/apispec_1.json').json
+    assert {'swagger': '2.0'} == client.get('/apispec_1.json').json
+    build_spec.assert_called_once_with(spec_app)
+
+
+def test_init_app_invalid_mode():
+    app = Flask(__name__)
+    app.config['OPENAPI'] = {'mode': 'invalid'}
+
+    with pytest.raises(ValueError):
+        openapi.init_app(app)
@@ -0,0 +1,80 @@
+import logging
+import re
+
+import pytest
+
+from shorty import server_timing
+from shorty.shortlink.shorteners import BitlyShortener, TinyurlShortener, exceptions
+from tests.conftest import ShorteningProviderName
+
+
+@pytest.fixture
+def server_timing_enabled(app, mocker) -> None:
+    mocker.patch.dict(app.config, SERVER_TIMING={'enabled': True, 'log': True})
+
+
+def _header_entries(header: str) -> dict[str, float]:
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r'([\w.]+);dur=([\d.]+)', header)
+    }
+
+
+def test_server_timing_header_value():
+    timing = server_timing.ServerTiming()
+    timing.add('parse', 0.0015)
+    timing.add('provider.bitly', 0.25)
+
+    header = timing.header_value()
+
+    assert header.startswith('parse;dur=1.50, provider.bitly;dur=250.00, total;dur=')
+    assert timing.as_dict()['provider.bitly'] == 250.0
+
+
+def test_server_timing_header_value_repeated_phases():
+    timing = server_timing.ServerTiming()
+    timing.add('provider.bitly', 0.1)
+    timing.add('provider.tinyurl', 0.05)
+    timing.add('provider.bitly', 0.2)
+
+    header = timing.header_value()
+
+    assert header.startswith('provider.bitly;dur=300.00;desc="2 calls", provider.tinyurl;dur=50.00, total;dur=')
+    assert timing.as_dict()['provider.bitly'] == 300.0
+
+
+def test_timed_without_request_timing():
+    timer = server_timing.timed('parse')
+    with timer:
+        pass
+
+    assert timer is server_timing.timed('validate')
+
+
+def test_disabled_by_default(post, mocker, short_url, long_url, mock_allowed_providers):
+    mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+    response = post('/shortlinks', data={'url': long_url, 'provider': ShorteningProviderName.BITLY})
+
+    assert 200 == response.status_code
+    assert server_timing.HEADER not in response.headers
+
+
+def test_phases_reported(post, mocker, caplog, short_url, long_url, mock_allowed_providers, server_timing_enabled):
+    mocker.patch.object(BitlyShortener, attribute='shorten', side_effect=exceptions.ShorteningProviderTimeout)
+    mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+
+    with caplog.at_level(logging.INFO, logger=server_timing.__name__):
+        response = post('/shortlinks', data={'url': f'{long_url}/timing'})
+
+    assert 200 == response.status_code
+    entries = _header_entries(response.headers[server_timing.HEADER])
+    assert {'parse', 'validate', 'provider.bitly', 'provider.tinyurl', 'respond', 'total'} == entries.keys()
+    assert entries['total'] >= entries['provider.tinyurl']
+    assert any('"provider.tinyurl"' in record.getMessage() for record in caplog.records)
+
+
+def test_phases_reported_on_error(post, mock_allowed_providers, server_timing_enabled):
+    response = post('/shortlinks', data={'url': 'htts://invalid'})
+
+    assert 422 == response.status_code
+    assert {'parse', 'validate', 'total'} == _header_entries(response.headers[server_timing.HEADER]).keys()
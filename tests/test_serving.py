@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from shorty import serving
+from shorty.shortlink import views
+
+
+@pytest.fixture
+def options() -> dict:
+    return {
+        'bind': '127.0.0.1:0',
+        'workers': 3,
+        'threads': 4,
+        'max_requests': 100,
+    }
+
+
+def test_load_config():
+    config = serving.load_config()
+
+    assert {
+        'workers', 'threads', 'timeout', 'graceful_timeout', 'keepalive', 'max_requests', 'max_requests_jitter',
+    } == config['SERVING'].keys()
+    assert all(isinstance(value, int) for value in config['SERVING'].values())
+
+
+def test_application_config(options):
+    application = serving.ShortyApplication(options)
+
+    assert 3 == application.cfg.workers
+    assert 4 == application.cfg.threads
+    assert 100 == application.cfg.max_requests
+    assert serving.worker_exit is application.cfg.worker_exit
+    assert serving.child_exit is application.cfg.child_exit
+
+
+def test_application_load(options, mocker):
+    create_app = mocker.patch.object(serving, 'create_app')
+
+    assert create_app.return_value is serving.ShortyApplication(options).load()
+
+
+def test_serve(mocker):
+    application_cls = mocker.patch.object(serving, 'ShortyApplication')
+
+    serving.serve(
+        host='127.0.0.1', port=8080, workers=2, threads=8, timeout=30, graceful_timeout=20, keepalive=5,
+        max_requests=1000, max_requests_jitter=50,
+    )
+
+    options = application_cls.call_args.args[0]
+    assert '127.0.0.1:8080' == options['bind']
+    assert 'gthread' == options['worker_class']
+    assert 20 == options['graceful_timeout']
+    application_cls.return_value.run.assert_called_once_with()
+
+
+@pytest.mark.parametrize(
+    'argv',
+    (
+        ['run.py', '--port', '9000', 'serve'],
+        ['run.py', 'serve', '--port', '9000'],
+    )
+)
+def test_serve_command_port(argv, mocker):
+    import run
+
+    mocker.patch('sys.argv', argv)
+    serve = mocker.patch.object(run, 'serve')
+
+    run.main()
+
+    assert 9000 == serve.call_args.kwargs['port']
+    assert serving.load_config()['DEFAULT_HOST'] == serve.call_args.kwargs['host']
+
+
+def test_worker_exit_drains_executors(mocker):
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(lambda: 'done')
+    mocker.patch.object(views, '_batch_executor', executor)
+    mocker.patch.object(views, '_hedging_executor', None)
+    close_shorteners = mocker.patch.object(serving, 'close_shorteners')
+    stop_pipeline = mocker.patch.object(serving.log, 'stop_pipeline')
+
+    serving.worker_exit(None, None)
+
+    assert 'done' == future.result(timeout=0)
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+    close_shorteners.assert_called_once_with()
+    stop_pipeline.assert_called_once_with()
+
+
+@pytest.mark.parametrize('multiproc_dir, is_marked', (('/tmp/metrics', True), ('', False)))
+def test_child_exit(multiproc_dir, is_marked, mocker, monkeypatch):
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', multiproc_dir)
+    mark_process_dead = mocker.patch('prometheus_client.multiprocess.mark_process_dead')
+
+    serving.child_exit(None, mocker.Mock(pid=42))
+
+    assert is_marked == mark_process_dead.called
+    if is_marked:
+        mark_process_dead.assert_called_once_with(42)
@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+import requests
+from pytest_mock import MockerFixture
+
+from shorty import tracing
+from shorty.shortlink.shorteners import AsyncTinyurlShortener, BitlyShortener, TinyurlShortener, exceptions
+
+TRACE_ID = '0af7651916cd43dd8448eb211c80319c'
+PARENT_ID = 'b7ad6b7169203331'
+
+
+@pytest.fixture
+def traces_path(tmp_path) -> str:
+    return str(tmp_path / 'traces.jsonl')
+
+
+@pytest.fixture
+def tracer(mocker: MockerFixture, traces_path) -> tracing.Tracer:
+    tracer = tracing.Tracer(
+        tracing.JsonlSpanExporter(traces_path, flush_interval=0.01),
+        tracing.TailSampler(sample_rate=1.0, slow_threshold=None),
+    )
+    mocker.patch.object(tracing, attribute='_tracer', new=tracer)
+    yield tracer
+    tracer.close()
+
+
+def _spans(tracer: tracing.Tracer, path: str) -> list[dict]:
+    tracer.close()
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.parametrize('value,expected', (
+    (f'00-{TRACE_ID}-{PARENT_ID}-01', (TRACE_ID, PARENT_ID, True)),
+    (f'00-{TRACE_ID.upper()}-{PARENT_ID}-00', (TRACE_ID, PARENT_ID, False)),
+    (f'ff-{TRACE_ID}-{PARENT_ID}-01', None),
+    (f'00-{"0" * 32}-{PARENT_ID}-01', None),
+    (f'00-{TRACE_ID}-{"0" * 16}-01', None),
+    ('00-invalid', None),
+    (None, None),
+))
+def test_parse_traceparent(value, expected):
+    assert tracing.parse_traceparent(value) == expected
+
+
+def test_span_without_trace():
+    with tracing.span('noop') as span:
+        assert span is None
+
+    assert tracing.traceparent() is None
+
+
+def test_request_spans(post, mocker, tracer, traces_path, short_url, long_url, mock_allowed_providers):
+    mocker.patch.object(BitlyShortener, attribute='shorten', side_effect=exceptions.ShorteningProviderTimeout)
+    mocker.patch.object(TinyurlShortener, attribute='shorten', return_value=short_url)
+    response = post(
+        '/shortlinks', data={'url': f'{long_url}/traced'}, headers={'traceparent': f'00-{TRACE_ID}-{PARENT_ID}-01'},
+    )
+
+    assert 200 == response.status_code
+    spans = {span['name'] + span['attributes'].get('provider', ''): span for span in _spans(tracer, traces_path)}
+    assert spans.keys() == {'request', 'parse_request_json', 'get_short_linkbitly', 'get_short_linktinyurl'}
+    assert {span['trace_id'] for span in spans.values()} == {TRACE_ID}
+
+    root = spans['request']
+    assert root['parent_id'] == PARENT_ID
+    assert root['attributes'] == {
+        'http.method': 'POST', 'http.path': '/shortlinks', 'http.route': '/shortlinks', 'http.status_code': 200,
+    }
+    assert all(span['parent_id'] == root['span_id'] for name, span in spans.items() if name != 'request')
+    assert spans['get_short_linkbitly']['error'] == 'GatewayTimeout'
+    assert spans['get_short_linktinyurl']['error'] is None
+
+
+def test_tail_sampling(post, mocker, tracer, traces_path, short_url, long_url, mock_allowed_providers):
+    mocker.patch.object(BitlyShortener, attribute='shorten', return_value=short_url)
+    data = {'url': f'{long_url}/sampled', 'provider': 'bitly'}
+
+    tracer.sampler.sample_rate = 0.0
+    post('/shortlinks', data=data)
+    post('/shortlinks', data=data, headers={'traceparent': f'00-{TRACE_ID}-{PARENT_ID}-01'})
+    tracer.sampler.slow_threshold = 0.0
+    post('/shortlinks', data=data)
+
+    spans = _spans(tracer, traces_path)
+    assert len({span['trace_id'] for span in spans}) == 2
+    assert TRACE_ID in {span['trace_id'] for span in spans}
+    assert tracer.stats()['started'] == 3
+    assert tracer.stats()['kept'] == 2
+    assert tracer.stats()['kept_slow'] == 1
+
+
+def test_provider_request_propagation(app, tracer, traces_path):
+    shortener = BitlyShortener('https://bit.ly', 'api_key', timeout=1)
+    with app.test_request_context(headers={'traceparent': f'00-{TRACE_ID}-{PARENT_ID}-01'}):
+        app.preprocess_request()
+        with tracing.span('provider_request') as span:
+            request = requests.Request('POST', 'https://bit.ly/shorten').prepare()
+            shortener.session.get_adapter(request.url).add_headers(request)
+
+    assert request.headers['traceparent'] == f'00-{TRACE_ID}-{span.span_id}-01'
+
+
+def test_async_provider_request_propagation(app, mocker: MockerFixture, tracer, traces_path, long_url, short_url):
+    shortener = AsyncTinyurlShortener('https://tinyurl.com', 1)
+    requests_made = []
+
+    async def handle_async_request(_, request: httpx.Request) -> httpx.Response:
+        requests_made.append(request)
+        return httpx.Response(200, text=short_url)
+
+    mocker.patch.object(httpx.AsyncHTTPTransport, attribute='handle_async_request', new=handle_async_request)
+    # Not sampled by the caller, but kept as slow.
+    tracer.sampler.slow_threshold = 0.0
+    with app.test_request_context(headers={'traceparent': f'00-{TRACE_ID}-{PARENT_ID}-00'}):
+        app.preprocess_request()
+        assert asyncio.run(shortener.shorten(long_url)) == short_url
+
+    provider_request, = (span for span in _spans(tracer, traces_path) if span['name'] == 'provider_request')
+    assert provider_request['attributes'] == {'shortener': 'AsyncTinyurlShortener', 'http.status_code': 200}
+    assert requests_made[0].headers['traceparent'] == f'00-{TRACE_ID}-{provider_request["span_id"]}-00'
+
+
+def test_exporter_batches(traces_path):
+    exporter = tracing.JsonlSpanExporter(traces_path, batch_size=2)
+    tracer = tracing.Tracer(exporter, tracing.TailSampler(sample_rate=1.0, slow_threshold=None))
+    for _ in range(3):
+        tracer.finish(tracer.start('request'))
+    tracer.close()
+
+    with open(traces_path) as file:
+        assert len(file.readlines()) == 3
+    assert exporter.stats() == {'queued': 0, 'exported': 3, 'dropped': 0}
@@ -75,6 +75,68 @@ def test_get_env_error(env_name, converter, environ, exception, mocker: MockerFi
         utils.get_env(env_name, converter=converter)
 
 
+@pytest.mark.parametrize(
+    'value,expected',
+    (
+        ('true', True),
+        ('True', True),
+        ('1', True),
+        ('yes', True),
+        (True, True),
+        ('false', False),
+        ('0', False),
+        ('', False),
+        (False, False),
+    )
+)
+def test_str_to_bool(value, expected) -> None:
+    assert utils.str_to_bool(value) is expected
+
+
+def test_str_to_bool_invalid() -> None:
+    with pytest.raises(ValueError):
+        utils.str_to_bool('maybe')
+
+
+@pytest.mark.parametrize(
+    'value,expected',
+    (
+        ('utm_*, fbclid,gclid', ('utm_*', 'fbclid', 'gclid')),
+        ('', ()),
+        (('fbclid',), ('fbclid',)),
+    )
+)
+def test_str_to_tuple(value, expected) -> None:
+    assert utils.str_to_tuple(value) == expected
+
+
+@pytest.mark.parametrize(
+    'number,code',
+    (
+        (0, '0'),
+        (9, '9'),
+        (10, 'a'),
+        (61, 'Z'),
+        (62, '10'),
+        (3843, 'ZZ'),
+    )
+)
+def test_base62(number, code) -> None:
+    assert utils.base62_encode(number) == code
+    assert utils.base62_decode(code) == number
+
+
+@pytest.mark.parametrize('code', ('', 'a-b', 'ab/'))
+def test_base62_decode_invalid(code) -> None:
+    with pytest.raises(ValueError):
+        utils.base62_decode(code)
+
+
+def test_base62_encode_negative() -> None:
+    with pytest.raises(ValueError):
+        utils.base62_encode(-1)
+
+
 def test_dynamically_load_shortener(dummy_class_path) -> None:
     assert utils.dynamically_load(dummy_class_path) == DummyClass
 